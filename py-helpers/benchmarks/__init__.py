@@ -0,0 +1,9 @@
+""" Benchmarks of the tool. Run them from the 'py-helpers' folder, e.g.:
+
+        python -m benchmarks.tracing
+        python -m benchmarks.unparse --check
+        python -m benchmarks.suite --quick
+
+    'suite' runs offline on the pinned corpus ('benchmarks/corpus') and on
+    synthetic files and checks the results against a stored baseline.
+"""
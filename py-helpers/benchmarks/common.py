@@ -0,0 +1,137 @@
+import statistics
+import time
+
+# A block of js-code (as generated by tsc), which is handled by both parsers.
+# '{idx}' is replaced, to create unique names.
+_JS_BLOCK = """
+class Foo{idx} extends Bar {{
+    constructor(a, b = 2) {{
+        this.a = a;
+        this.cb = (x) => {{ return x + 1; }};
+    }}
+    get value() {{
+        return this.a;
+    }}
+    async run(items) {{
+        const _this = this;
+        for (const item of items) {{
+            console.log("item", item);
+        }}
+        items.forEach((item) => {{
+            _this.a += item;
+            someCall(function (y) {{ return y * 2; }});
+        }});
+        if (this.a > 10) {{
+            return true;
+        }} else if (this.a == null) {{
+            return false;
+        }} else {{
+            return undefined;
+        }}
+    }}
+}}
+function helperFunc{idx}(someValue, ...rest) {{
+    let myList = [1, 2, 3];
+    let myDict = {{ a: 1, b: "value" }};
+    try {{
+        JSON.parse(someValue);
+    }} catch (err) {{
+        throw Error("failed");
+    }}
+    switch (someValue) {{
+        case 1:
+            return 2;
+        default:
+            return 3;
+    }}
+}}
+"""
+
+# A block of ts-code, which is handled by the ts-grammar and -transformer.
+_TS_BLOCK = """
+export class Foo{idx} extends Bar {{
+  public value: number = 0;
+  protected _items: Array<string> = [];
+
+  constructor(public name: string, protected options: IOptions = {{}}) {{
+    super();
+  }}
+
+  public get size(): number {{
+    return this._items.length;
+  }}
+
+  public async run(items: string[], factor = 2): Promise<number> {{
+    for (const item of items) {{
+      this._items.push(item);
+    }}
+    const mapped = items.map((item) => {{
+      return item.length * factor;
+    }});
+    if (this.value > 10) {{
+      return this.value;
+    }} else if (this.value === null) {{
+      return -1;
+    }}
+    return mapped.length;
+  }}
+}}
+
+export function helperFunc{idx}(someValue: string, rest: any[]): boolean {{
+  let myList = [1, 2, 3];
+  let myDict = {{ a: 1, b: "value" }};
+  try {{
+    JSON.parse(someValue);
+  }} catch (err) {{
+    throw Error("failed");
+  }}
+  return myList.length == rest.length;
+}}
+"""
+
+
+def synthetic_js(scale: int = 1) -> str:
+    """ Creates a synthetic js-file.
+
+    Args:
+        scale (int, optional): Amount of repeated blocks. Defaults to 1.
+
+    Returns:
+        str: The js-code
+    """
+    return '"use strict";\n' + "".join(_JS_BLOCK.format(idx=idx) for idx in range(scale))
+
+
+def synthetic_ts(scale: int = 1) -> str:
+    """ Creates a synthetic ts-file.
+
+    Args:
+        scale (int, optional): Amount of repeated blocks. Defaults to 1.
+
+    Returns:
+        str: The ts-code
+    """
+    return "".join(_TS_BLOCK.format(idx=idx) for idx in range(scale))
+
+
+def measure(func, repeat: int = 5):
+    """ Measures the runtime of the function.
+
+    Args:
+        func (callable): The function to measure (without arguments).
+        repeat (int, optional): Amount of runs. Defaults to 5.
+
+    Returns:
+        dict: min and median of the runtime in seconds.
+    """
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times)
+    }
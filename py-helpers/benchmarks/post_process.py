@@ -0,0 +1,96 @@
+""" Benchmark of the post-processing. Compares the runtime of
+
+    - "sequential":  one 'str.replace' per rule (the former implementation).
+    - "single-pass": 'prepare_code.post_process' (one scan of the code).
+
+    for an increasing amount of rules. The additional rules are names, which
+    are not used in the code. The runtime of "single-pass" must not depend on
+    the amount of rules.
+
+    Usage:
+        python -m benchmarks.post_process --scale 20
+"""
+
+import argparse
+
+from prepare_code import js, post_processor
+
+from .common import measure, synthetic_js
+
+# The rules of the former implementation.
+_REPLACERS = {
+    "console.log": "print",
+    "console.error": "print",
+    "Error(": "Exception(",
+    "true": "True",
+    "false": "False",
+    "JSON.stringify": "json.dumps",
+    "JSON.parse": "json.loads",
+    "const _this = this;": "",
+    "_this": "self",
+    "this": "self",
+    " Set": " set",
+    " Map": " dict",
+    "toLowerCase": "lower",
+    "toUpperCase": "upper",
+    ".push(": ".append(",
+    ".indexOf(": ".index(",
+    "Array.from": "list",
+    "null": "None",
+    '"null"': "None",
+    '"undefined"': "None",
+    'undefined': "None",
+    'self = self': "",
+    "__definition_of__": "",
+    "@property()": "@property",
+    ".entries()": ".items()",
+    "${": "{",
+}
+
+
+def _sequential(code, replacers):
+    for org, new in replacers.items():
+        code = code.replace(org, new)
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the post-processing.')
+    parser.add_argument('--scale', type=int, default=20, dest='scale',
+                        help='Amount of repeated blocks in the synthetic input.')
+    parser.add_argument('--repeat', type=int, default=5, dest='repeat',
+                        help='Amount of runs per mode.')
+    parser.add_argument('--rules', type=int, nargs='+', default=[0, 100, 1000], dest='rules',
+                        help='Amount of additional rules.')
+
+    args = parser.parse_args()
+
+    program = js.get_transformer(False, False).transform(
+        js.get_parser("lalr").parse(synthetic_js(args.scale))
+    )
+    code = js.to_source(program, False)
+
+    print(f"post-processing of {len(code)} chars (best of {args.repeat}):")
+
+    for amount in args.rules:
+        additional = {f"unusedName{idx}": f"unused_name_{idx}" for idx in range(amount)}
+
+        replacers = dict(_REPLACERS, **additional)
+        sequential = measure(lambda: _sequential(code, replacers), args.repeat)
+
+        names = post_processor.names
+        post_processor.names = dict(names, **additional)
+        post_processor.update_rules()
+        try:
+            single_pass = measure(lambda: post_processor.post_process(code), args.repeat)
+        finally:
+            post_processor.names = names
+            post_processor.update_rules()
+
+        rules = len(replacers)
+        print(f"\t{rules:>5} rules: sequential  min={sequential['min'] * 1000:8.2f} ms  median={sequential['median'] * 1000:8.2f} ms")
+        print(f"\t{rules:>5} rules: single-pass min={single_pass['min'] * 1000:8.2f} ms  median={single_pass['median'] * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+""" Benchmark suite of the transpiler. Runs offline on the pinned corpus in
+    'benchmarks/corpus' (a snapshot of files of 'lib', see 'corpus.json') and on
+    synthetic files (1x / 10x / 100x). Measures
+
+    - "grammar": compiling the grammar (empty cache) and loading it (warm cache).
+    - the files: parse, transform and emit (unparse + post-processing).
+
+    The throughput (KB/s and files/s) is compared with a stored baseline. The
+    process exits with 1, if a case is slower than the baseline by more than
+    the threshold. The baseline depends on the machine -> store it per machine
+    (default: the cache-dir of the tool) or pass '--baseline'.
+
+    Usage:
+        python -m benchmarks.suite --save-baseline
+        python -m benchmarks.suite --threshold 0.2
+        python -m benchmarks.suite --quick --cases "synthetic/js-lalr/*"
+        python -m benchmarks.suite --snapshot ../lib
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lark
+
+from prepare_code import js, ts, post_process
+from prepare_code.build_cache import get_toolchain_hash
+from prepare_code.cache import CACHE_DIR_ENV, get_cache_dir
+
+from .common import synthetic_js, synthetic_ts
+
+func = {
+    "ts": ts,
+    "js": js
+}
+
+CORPUS_DIR = Path(__file__).parent.joinpath("corpus")
+CORPUS_MANIFEST = CORPUS_DIR.joinpath("corpus.json")
+
+# The combinations of type and parser, which are benchmarked.
+MODES = (
+    ("ts", "earley"),
+    ("js", "earley"),
+    ("js", "lalr"),
+)
+
+SCALES = (1, 10, 100)
+
+# Cases are repeated, until they took this time (or '--repeat' is reached).
+_MIN_TIME = 1.0
+
+
+def _hash(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def load_corpus():
+    """ Loads the pinned corpus and checks, that the files are unchanged.
+
+    Returns:
+        list: The paths of the files.
+    """
+    with open(CORPUS_MANIFEST, encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    files = []
+
+    for rel_path, expected in sorted(manifest["files"].items()):
+        path = CORPUS_DIR.joinpath(manifest["root"], rel_path)
+
+        if _hash(path) != expected:
+            raise ValueError(f"The corpus has been modified: '{path}'. Use '--snapshot' to pin a new corpus (and store a new baseline).")
+
+        files.append(path)
+
+    return files
+
+
+def snapshot(source):
+    """ Copies the files of the corpus (see 'corpus.json') from the source
+        (e.g. '../lib') and pins their hashes.
+
+    Args:
+        source (str): The folder to copy the files from.
+    """
+    with open(CORPUS_MANIFEST, encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    for rel_path in sorted(manifest["files"]):
+        target = CORPUS_DIR.joinpath(manifest["root"], rel_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(os.path.join(source, rel_path), target)
+        manifest["files"][rel_path] = _hash(target)
+
+    with open(CORPUS_MANIFEST, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+        file.write("\n")
+
+
+@contextlib.contextmanager
+def _empty_cache():
+    """ Uses an empty (temporary) cache-dir -> the grammar is compiled again.
+    """
+    previous = os.environ.get(CACHE_DIR_ENV, None)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ[CACHE_DIR_ENV] = tmp_dir
+        try:
+            yield
+        finally:
+            if previous is None:
+                os.environ.pop(CACHE_DIR_ENV)
+            else:
+                os.environ[CACHE_DIR_ENV] = previous
+
+
+def _repeat(func, repeat):
+    """ Runs the function at least once and repeats it until '_MIN_TIME' is
+        reached (at most 'repeat' times). Returns the result of the fastest run.
+    """
+    best = None
+    spent = 0.0
+
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        duration = time.perf_counter() - start
+        spent += duration
+
+        if best is None or duration < best[0]:
+            best = (duration, result)
+
+        if spent >= _MIN_TIME:
+            break
+
+    return best[1]
+
+
+def _measure(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _get_parser(type, parser_mode):
+    """ Creates the parser (as 'main.get_worker_parser').
+
+    Returns:
+        (lark.Lark, Transformer | None): The parser and the inline transformer ("lalr").
+    """
+    if parser_mode == "lalr":
+        transformer = func[type].get_transformer(False, False)
+        return func[type].get_parser(parser_mode, transformer), transformer
+    return func[type].get_parser(parser_mode), None
+
+
+def _convert(type, parser, transformer, content):
+    """ Converts the content and measures the phases.
+
+    Returns:
+        dict: The duration of every phase in seconds.
+    """
+    phases = {}
+
+    start = time.perf_counter()
+    if transformer is not None:
+        # The transformer is applied during parsing.
+        transformer.reset()
+        program = parser.parse(content)
+        phases["parse"] = time.perf_counter() - start
+        phases["transform"] = 0.0
+    else:
+        tree = parser.parse(content)
+        phases["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        program = func[type].get_transformer(False, False).transform(tree)
+        phases["transform"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    post_process(func[type].to_source(program, False))
+    phases["emit"] = time.perf_counter() - start
+
+    return phases
+
+
+def run_grammar(type, parser_mode, repeat):
+    """ Measures compiling and loading the grammar.
+
+    Returns:
+        dict: The results of the cases.
+    """
+    def compile_grammar():
+        with _empty_cache():
+            _get_parser(type, parser_mode)
+
+    func[type].prepare_parser(parser_mode)
+
+    return {
+        f"grammar/{type}-{parser_mode}/compile": {"seconds": _repeat(lambda: _measure(compile_grammar), repeat)},
+        f"grammar/{type}-{parser_mode}/load": {"seconds": _repeat(lambda: _measure(lambda: _get_parser(type, parser_mode)), repeat)},
+    }
+
+
+def run_files(type, parser_mode, contents, repeat):
+    """ Measures the conversion of the given contents.
+
+    Args:
+        type (str): the type of the files ("ts" | "js")
+        parser_mode (str): the parser to use ("earley" | "lalr")
+        contents (list): The contents of the files.
+        repeat (int): Maximum amount of runs.
+
+    Returns:
+        dict: The result of the case (phases, seconds, KB/s and files/s).
+    """
+    parser, transformer = _get_parser(type, parser_mode)
+    size = sum(len(content.encode("utf-8")) for content in contents)
+
+    def run():
+        phases = {"parse": 0.0, "transform": 0.0, "emit": 0.0}
+        for content in contents:
+            for phase, duration in _convert(type, parser, transformer, content).items():
+                phases[phase] += duration
+        return phases
+
+    phases = _repeat(run, repeat)
+    seconds = sum(phases.values())
+
+    return {
+        "files": len(contents),
+        "bytes": size,
+        "phases": phases,
+        "seconds": seconds,
+        "kb_per_s": size / 1024 / max(seconds, 1e-9),
+        "files_per_s": len(contents) / max(seconds, 1e-9)
+    }
+
+
+def get_cases(quick):
+    """ Returns the cases of the suite (name -> callable(repeat) -> results).
+    """
+    cases = {}
+
+    for type, parser_mode in MODES:
+        cases[f"grammar/{type}-{parser_mode}"] = lambda repeat, type=type, parser_mode=parser_mode: run_grammar(type, parser_mode, repeat)
+
+    def corpus(repeat):
+        contents = [path.read_text(encoding="utf-8") for path in load_corpus()]
+        return {"corpus/ts-earley": run_files("ts", "earley", contents, repeat)}
+
+    cases["corpus/ts-earley"] = corpus
+
+    synthetic = {
+        "ts": synthetic_ts,
+        "js": synthetic_js
+    }
+
+    for type, parser_mode in MODES:
+        for scale in SCALES:
+            if quick and scale > 10:
+                continue
+
+            name = f"synthetic/{type}-{parser_mode}/{scale}x"
+            cases[name] = lambda repeat, name=name, type=type, parser_mode=parser_mode, scale=scale: {
+                name: run_files(type, parser_mode, [synthetic[type](scale)], repeat)
+            }
+
+    return cases
+
+
+def get_environment():
+    """ The environment of the run. Results of different environments are not comparable.
+    """
+    return {
+        "python": platform.python_version(),
+        "lark": lark.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.system()
+    }
+
+
+def compare(results, baseline):
+    """ Compares the results with the baseline.
+
+    Args:
+        results (dict): The results of the cases.
+        baseline (dict): The results of the baseline.
+
+    Returns:
+        dict: The relative change of the duration of every case, which is part of the baseline (0.1 -> 10 % slower).
+    """
+    changes = {}
+
+    for name, result in results.items():
+        if name in baseline:
+            changes[name] = result["seconds"] / max(baseline[name]["seconds"], 1e-9) - 1
+
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite of the transpiler.')
+    parser.add_argument('--baseline', type=str, default=None, dest='baseline',
+                        help='The file of the baseline. Defaults to the cache-dir of the tool.')
+    parser.add_argument('--save-baseline', dest='save_baseline', action='store_true',
+                        help='Stores the results as new baseline.')
+    parser.add_argument('--threshold', type=float, default=0.2, dest='threshold',
+                        help='The allowed slowdown compared to the baseline (0.2 = 20 %%).')
+    parser.add_argument('--repeat', type=int, default=5, dest='repeat',
+                        help=f'Maximum amount of runs per case. A case is repeated, until it took {_MIN_TIME} s.')
+    parser.add_argument('--cases', type=str, nargs='+', default=["*"], dest='cases',
+                        help='Patterns of the cases to run (e.g. "synthetic/js-lalr/*").')
+    parser.add_argument('--quick', dest='quick', action='store_true',
+                        help='Skips the large synthetic files (100x).')
+    parser.add_argument('--output', type=str, default=None, dest='output',
+                        help='Writes the results (json) to the given path.')
+    parser.add_argument('--snapshot', type=str, default=None, dest='snapshot',
+                        help='Copies the files of the corpus from the given folder (e.g. "../lib") and pins them.')
+
+    args = parser.parse_args()
+
+    if args.snapshot is not None:
+        snapshot(args.snapshot)
+        print(f"Pinned the corpus from '{args.snapshot}'. Store a new baseline ('--save-baseline').")
+        return
+
+    baseline_file = Path(args.baseline) if args.baseline else get_cache_dir("benchmarks").joinpath("baseline.json")
+
+    try:
+        with open(baseline_file, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except (OSError, ValueError):
+        baseline = None
+
+    environment = get_environment()
+
+    if baseline is not None and baseline["environment"] != environment:
+        print(f"warning: the baseline has been created in a different environment: {baseline['environment']}")
+
+    results = {}
+
+    for name, case in get_cases(args.quick).items():
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in args.cases):
+            continue
+
+        for case_name, result in case(args.repeat).items():
+            results[case_name] = result
+
+            line = f"{case_name:<32}{result['seconds'] * 1000:12.2f} ms"
+
+            if "phases" in result:
+                line += "".join(f"{phase:>11}={duration * 1000:9.2f} ms" for phase, duration in result["phases"].items())
+                line += f"{result['kb_per_s']:10.2f} KB/s{result['files_per_s']:10.2f} files/s"
+
+            print(line, flush=True)
+
+    regressions = []
+
+    if baseline is not None:
+        print()
+        print(f"compared with the baseline '{baseline_file}' (created {baseline['created']}, threshold {args.threshold * 100:.0f} %):")
+
+        for name, change in compare(results, baseline["results"]).items():
+            regressed = change > args.threshold
+            print(f"\t{name:<32}{change * 100:+8.1f} %{'  REGRESSION' if regressed else ''}")
+
+            if regressed:
+                regressions.append(name)
+
+    elif not args.save_baseline:
+        print()
+        print(f"No baseline found at '{baseline_file}'. Use '--save-baseline' to store one.")
+
+    output = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment,
+        "toolchain": get_toolchain_hash(),
+        "results": results
+    }
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=2)
+
+    if args.save_baseline:
+        if baseline is not None:
+            # Keep the cases, which have not been run.
+            output["results"] = dict(baseline["results"], **results)
+
+        with open(baseline_file, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=2)
+
+        print(f"Stored the baseline in '{baseline_file}'.")
+
+    elif regressions:
+        print(f"{len(regressions)} cases regressed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+""" Benchmark of the tracing in the js-transformer. Compares the transform time of
+
+    - "off":     tracing present, '--debug' disabled (the default).
+    - "removed": all tracing statements removed from the source of the transformer.
+    - "on":      tracing enabled (output is discarded). Only with '--with-debug'.
+
+    Usage:
+        python -m benchmarks.tracing --scale 20
+"""
+
+import argparse
+import ast
+import contextlib
+import importlib.util
+import logging
+import os
+
+from prepare_code import js
+from prepare_code.js import transformer as js_transformer
+
+from .common import measure, synthetic_js
+
+_TRACE_CALLS = ("_log", "_log_extracted", "debug")
+
+
+class _RemoveTracing(ast.NodeTransformer):
+    """ Removes the calls of '_log', '_log_extracted', '*.debug' and
+        the blocks guarded by 'if self._trace' / 'if trace'.
+    """
+
+    def _is_trace_flag(self, node):
+        return (
+            (isinstance(node, ast.Name) and node.id == "trace") or
+            (isinstance(node, ast.Attribute) and node.attr == "_trace")
+        )
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        if self._is_trace_flag(node.test):
+            return node.orelse or None
+        return node
+
+    def visit_Expr(self, node):
+        call = node.value
+        if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) and call.func.attr in _TRACE_CALLS:
+            return None
+        return node
+
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        # Bodies must not be empty.
+        if isinstance(getattr(node, "body", None), list) and not node.body:
+            node.body.append(ast.Pass())
+        return node
+
+
+def _load_untraced_module():
+    """ Compiles the js-transformer without any tracing statement.
+    """
+    path = js_transformer.__file__
+
+    with open(path, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), path)
+
+    tree = ast.fix_missing_locations(_RemoveTracing().visit(tree))
+
+    spec = importlib.util.spec_from_file_location("prepare_code.js._untraced_transformer", path)
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(tree, path, "exec"), module.__dict__)
+
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the tracing in the js-transformer.')
+    parser.add_argument('--scale', type=int, default=20, dest='scale',
+                        help='Amount of repeated blocks in the synthetic input.')
+    parser.add_argument('--repeat', type=int, default=5, dest='repeat',
+                        help='Amount of runs per mode.')
+    parser.add_argument('--with-debug', dest='with_debug', action='store_true',
+                        help='Measures the enabled tracing as well.')
+
+    args = parser.parse_args()
+
+    tree = js.get_parser("lalr").parse(synthetic_js(args.scale))
+    untraced = _load_untraced_module()
+
+    modes = {
+        "off": lambda: js_transformer.CodeTransformeJs().transform(tree),
+        "removed": lambda: untraced.CodeTransformeJs().transform(tree),
+    }
+
+    results = {}
+
+    for mode, func in modes.items():
+        results[mode] = measure(func, args.repeat)
+
+    if args.with_debug:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            transformer = js_transformer.CodeTransformeJs(level=logging.DEBUG)
+
+            # The handler of the logger has bound 'sys.stdout' on its creation ->
+            # write the records (still formatted) to devnull instead.
+            logger = transformer._logger
+            handlers, propagate = logger.handlers[:], logger.propagate
+            handler = logging.StreamHandler(devnull)
+            handler.setFormatter(handlers[0].formatter if handlers else None)
+            logger.handlers[:] = [handler]
+            logger.propagate = False
+
+            try:
+                results["on"] = measure(lambda: (transformer.reset(), transformer.transform(tree)), args.repeat)
+            finally:
+                logger.handlers[:] = handlers
+                logger.propagate = propagate
+
+    print(f"transform of {args.scale} blocks (best of {args.repeat}):")
+    for mode, result in results.items():
+        ratio = result["min"] / results["removed"]["min"]
+        print(f"\t{mode:<8} min={result['min'] * 1000:8.2f} ms  median={result['median'] * 1000:8.2f} ms  ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
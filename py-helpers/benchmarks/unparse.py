@@ -0,0 +1,143 @@
+""" Benchmark of the unparser backends (see 'prepare_code.unparse'). Every file of
+    the corpus is parsed and transformed once. Afterwards the emit time of every
+    backend is measured on the same program.
+
+    With '--check' the generated code of the backends is compared (golden test):
+    Both outputs are parsed again and their python-ast must be identical. The
+    process exits with 1, if a difference is found.
+
+    Usage:
+        python -m benchmarks.unparse --input ../lib --type ts
+        python -m benchmarks.unparse --input ../dist-nodejs --type js --parser lalr --check
+"""
+
+import argparse
+import ast
+import os
+import sys
+
+from prepare_code import js, ts
+from prepare_code import unparse
+
+from .common import measure
+
+func = {
+    "ts": ts,
+    "js": js
+}
+
+
+def _find_files(input_path, type):
+    ret = []
+
+    for dir_path, _, files in os.walk(input_path):
+        for file_name in files:
+            if file_name.endswith("." + type) and not file_name.endswith(".spec." + type):
+                ret.append(os.path.join(dir_path, file_name))
+
+    return sorted(ret)
+
+
+def _transform(parser, type, content):
+    if type == "js":
+        return js.get_transformer(False, False).transform(parser.parse(content))
+    return ts.transformer.CodeTransformeTs().transform(parser.parse(content))
+
+
+def _dump(code):
+    """ Returns the python-ast of the code (as str) or None, if the code isn't valid python.
+    """
+    try:
+        return ast.dump(ast.parse(code))
+    except SyntaxError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the unparser backends.')
+    parser.add_argument('--input', type=str, default="../lib", dest='input',
+                        help='The folder of the corpus.')
+    parser.add_argument('--type', type=str, default="ts", dest='type',
+                        help='The type of the files. Possible Values are "ts" | "js"')
+    parser.add_argument('--parser', type=str, default="earley", dest='parser',
+                        help='The parser to use. Possible Values are "earley" | "lalr"')
+    parser.add_argument('--repeat', type=int, default=5, dest='repeat',
+                        help='Amount of runs per file and backend.')
+    parser.add_argument('--check', dest='check', action='store_true',
+                        help='Checks, that all backends generate semantically identical code.')
+
+    args = parser.parse_args()
+
+    backends = list(unparse.BACKENDS)
+    lark_parser = func[args.type].get_parser(args.parser)
+
+    totals = {backend: 0.0 for backend in backends}
+    totals["normalize"] = 0.0
+    failed = []
+    different = []
+    skipped = []
+    files = _find_files(args.input, args.type)
+
+    print(f"{'file':<60}{'normalize':>12}" + "".join(f"{backend:>12}" for backend in backends))
+
+    for path_to_file in files:
+        with open(path_to_file, encoding="utf-8") as file:
+            content = file.read()
+
+        try:
+            program = _transform(lark_parser, args.type, content)
+        except Exception as err:
+            failed.append((path_to_file, str(err).split("\n")[0]))
+            continue
+
+        # Normalizing is shared by all backends (and changes the program in place).
+        results = {"normalize": measure(lambda: unparse.normalize(program), 1)["min"]}
+        totals["normalize"] += results["normalize"]
+        codes = {}
+
+        for backend in backends:
+            try:
+                codes[backend] = unparse.BACKENDS[backend](program)
+                results[backend] = measure(lambda: unparse.BACKENDS[backend](program), args.repeat)["min"]
+                totals[backend] += results[backend]
+            except Exception as err:
+                failed.append((f"{path_to_file} ({backend})", str(err).split("\n")[0]))
+
+        name = os.path.relpath(path_to_file, args.input)
+        print(f"{name:<60}{results['normalize'] * 1000:9.2f} ms" + "".join(
+            f"{results[backend] * 1000:9.2f} ms" if backend in results else f"{'failed':>12}"
+            for backend in backends
+        ))
+
+        if args.check and len(codes) == len(backends):
+            dumps = {_dump(code) for code in codes.values()}
+
+            if dumps == {None}:
+                # e.g. reserved words of python used as names.
+                skipped.append(path_to_file)
+            elif len(dumps) > 1:
+                different.append(path_to_file)
+
+    print()
+    print(f"{'total':<60}{totals['normalize'] * 1000:9.2f} ms" + "".join(
+        f"{totals[backend] * 1000:9.2f} ms" for backend in backends
+    ))
+    print(f"default backend: '{unparse.DEFAULT_BACKEND}'")
+
+    for path_to_file, err in failed:
+        print(f"failed: {path_to_file}: {err}")
+
+    if args.check:
+        for path_to_file in skipped:
+            print(f"skipped (no valid python): {path_to_file}")
+        for path_to_file in different:
+            print(f"different: {path_to_file}")
+
+        print(f"{len(different)} of {len(files)} files differ")
+
+        if different:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
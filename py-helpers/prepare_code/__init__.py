@@ -9,4 +9,5 @@ from .post_processor import post_process
 from .helpers import define_dotted_dict, to_snake_case
 from .js import get_parser as get_parser_js, transform as transform_js
 from .ts import get_parser as get_parser_ts, transform as transform_ts
+from .transpiler import Engine, transpile_source, transpile_many
 from .main import main
\ No newline at end of file
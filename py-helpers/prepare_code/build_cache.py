@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import lark
+
+from . import __version__
+from .cache import get_cache_dir, write_atomic
+
+# The sources of the tool. A change of a grammar or transformer invalidates all entries.
+_TOOL_DIR = Path(__file__).parent
+_TOOL_FILES = ("*.py", "*.lark")
+
+
+def get_toolchain_hash() -> str:
+    """ Determines the hash of the tool (grammars, transformers, post-processing),
+        of lark and of python (the code generated by 'ast.unparse' might differ).
+
+    Returns:
+        str: The hex-digest.
+    """
+    key = hashlib.sha256()
+
+    files = sorted(
+        path for pattern in _TOOL_FILES for path in _TOOL_DIR.rglob(pattern)
+    )
+
+    for path in files:
+        key.update(str(path.relative_to(_TOOL_DIR)).encode("utf-8"))
+        key.update(path.read_bytes())
+
+    key.update(__version__.encode("utf-8"))
+    key.update(lark.__version__.encode("utf-8"))
+    key.update(repr(sys.version_info[:2]).encode("utf-8"))
+
+    return key.hexdigest()
+
+
+class BuildCache:
+    """ Persistent, content-addressed cache of the generated code (or the error) and the
+        symbols of the file (see 'imports.get_module_symbols'). An entry is
+        keyed by the hash of the source, the hash of the tool (see 'get_toolchain_hash')
+        and the options (type, parser, '--convert_snake_case', ...).
+
+        Every project (input, output, options and the selection of the files,
+        e.g. the shard) has a manifest with the entries used by its last build.
+        Entries, which are no longer used by any manifest, are evicted (see 'save').
+    """
+
+    def __init__(self, input_path, output_path, options: dict, selection=None):
+        """ Creates the cache.
+
+        Args:
+            input_path (str): path of the folder to readin
+            output_path (str): main path of the output
+            options (dict): The options, which influence the generated code.
+            selection (str, optional): The selection of the files (e.g. the shard "1/4"). The
+                builds of different selections don't evict the entries of each other. Defaults to None.
+        """
+        self._dir = get_cache_dir("builds")
+        # The hash of the tool (e.g. for the stored python-names, see 'symbols.load_names').
+        self.toolchain = get_toolchain_hash()
+        self._base = hashlib.sha256(
+            (self.toolchain + repr(sorted(options.items()))).encode("utf-8")
+        ).hexdigest()
+
+        project = hashlib.sha256(
+            repr((os.path.abspath(input_path), os.path.abspath(output_path), sorted(options.items()), selection)).encode("utf-8")
+        ).hexdigest()
+
+        # Identifies the project (e.g. for the import-graph, see 'ImportGraph').
+        self.project = project
+        self._manifest_file = get_cache_dir("builds/manifests").joinpath(f"{self.project}.json")
+        self._used = {}
+        # The files removed during the build (e.g. '--watch', see 'remove').
+        self._removed = set()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, path_to_file) -> str:
+        """ Determines the key of the given source-file.
+
+        Args:
+            path_to_file (str): path to the source-file
+
+        Returns:
+            str: The key
+        """
+        key = hashlib.sha256(self._base.encode("utf-8"))
+
+        with open(path_to_file, "rb") as file:
+            key.update(file.read())
+
+        return key.hexdigest()
+
+    def _get_entry(self, key) -> Path:
+        return self._dir.joinpath("entries", key[:2], f"{key}.json")
+
+    def get(self, path_to_file, key):
+        """ Returns the cached result of the source-file. The entry is marked as used.
+
+        Args:
+            path_to_file (str): path to the source-file
+            key (str): The key (see 'get_key')
+
+        Returns:
+            (str | False, (str | False, str | False), dict | None) | None: The code, the error
+            (message and pointer, see 'main.worker') and the symbols or None, if not cached.
+        """
+        try:
+            with open(self._get_entry(key), encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.use(path_to_file, key)
+
+        if entry["error"] is None:
+            return entry["code"], (False, False), entry.get("symbols", None)
+
+        err, position = entry["error"]
+
+        # The pointer to the error is stored without the path (the entry might be shared).
+        return False, (err, path_to_file + position), None
+
+    def put(self, path_to_file, key, code, error=(False, False), symbols=None):
+        """ Stores the result of the source-file. The entry is marked as used.
+
+        Args:
+            path_to_file (str): path to the source-file
+            key (str): The key (see 'get_key')
+            code (str | False): The generated code or False in the case of an error.
+            error (tuple, optional): The error and the pointer to the error (see 'main.worker'). Defaults to (False, False).
+            symbols (dict, optional): The symbols of the file (see 'imports.get_module_symbols'). Defaults to None.
+        """
+        err, ptr_to_err = error
+
+        entry = {
+            "code": code or None,
+            "error": None,
+            "symbols": symbols
+        }
+
+        if err:
+            ptr_to_err = ptr_to_err or path_to_file
+            entry["error"] = (err, ptr_to_err[len(path_to_file):] if ptr_to_err.startswith(path_to_file) else "")
+
+        path = self._get_entry(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, json.dumps(entry).encode("utf-8"))
+
+        self.use(path_to_file, key)
+
+    def use(self, path_to_file, key):
+        """ Marks the entry as used by the current build. Required, if the entry
+            has been stored by an other process (e.g. a worker).
+
+        Args:
+            path_to_file (str): path to the source-file
+            key (str): The key (see 'get_key')
+        """
+        self._used[path_to_file] = key
+        self._removed.discard(path_to_file)
+
+    def remove(self, path_to_file):
+        """ Removes the file from the manifest (e.g. deleted during '--watch'). Its
+            entry is evicted by 'save', unless it is used by another file or project.
+
+        Args:
+            path_to_file (str): path to the source-file
+        """
+        self._used.pop(path_to_file, None)
+        self._removed.add(path_to_file)
+
+    def _read_manifest(self, path) -> dict:
+        try:
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, complete=True):
+        """ Stores the manifest of the build and evicts the stale entries
+            (the entries of the previous build, which are not used anymore).
+            Could be called multiple times (e.g. after every rebuild).
+
+        Args:
+            complete (boolean, optional): The build contained all files of the project. Otherwise
+                (e.g. '--files-from') only the entries of the used files are replaced. Defaults to True.
+        """
+        previous = self._read_manifest(self._manifest_file)
+        used = self._used if complete else dict(previous, **self._used)
+
+        for path_to_file in self._removed:
+            used.pop(path_to_file, None)
+
+        write_atomic(self._manifest_file, json.dumps(used, indent=2).encode("utf-8"))
+
+        stale = set(previous.values()) - set(used.values())
+
+        if not stale:
+            return
+
+        # Keep the entries used by other projects.
+        for manifest in self._manifest_file.parent.glob("*.json"):
+            if manifest != self._manifest_file:
+                stale -= set(self._read_manifest(manifest).values())
+
+        for key in stale:
+            try:
+                self._get_entry(key).unlink()
+            except OSError:
+                pass
@@ -0,0 +1,239 @@
+import hashlib
+import os
+import pickle
+import stat
+import sys
+import tempfile
+from pathlib import Path
+
+import lark
+from lark import Lark
+from lark.load_grammar import Grammar, load_grammar
+
+# Environment-Variable, which could be used to relocate the cache.
+CACHE_DIR_ENV = "NOPE_PY_PREPARE_CACHE_DIR"
+
+
+def get_cache_dir(sub_dir: str = None) -> Path:
+    """ Returns the directory, where the persistent caches of the tool are stored.
+        The directory could be adapted by using the environment variable
+        'NOPE_PY_PREPARE_CACHE_DIR'. Otherwise '~/.cache/nope-py-prepare-code' is used.
+
+    Args:
+        sub_dir (str, optional): Sub-Directory inside of the cache. Defaults to None.
+
+    Returns:
+        Path: The (existing) directory.
+    """
+    base = os.environ.get(CACHE_DIR_ENV, None)
+
+    if base is None:
+        base = os.path.join(os.path.expanduser("~"), ".cache", "nope-py-prepare-code")
+
+    path = Path(base)
+
+    if sub_dir is not None:
+        path = path.joinpath(sub_dir)
+
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+
+def hash_file(path) -> str:
+    """ Determines the sha256 of the given file.
+
+    Args:
+        path: path to the file
+
+    Returns:
+        str: The hex-digest.
+    """
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def get_file_mode(path=None) -> int:
+    """ Determines the permissions for a (new) file. Temp-files are only
+        accessible by the owner -> the permissions have to be set explicitly.
+
+    Args:
+        path (optional): An existing file, whose permissions are kept. Defaults to None.
+
+    Returns:
+        int: The permissions of the file or the default permissions (respecting the umask).
+    """
+    if path is not None:
+        try:
+            return stat.S_IMODE(os.stat(path).st_mode)
+        except OSError:
+            pass
+
+    # The umask could only be read by setting it.
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return 0o666 & ~umask
+
+
+def write_atomic(path, content: bytes, mode: int = None):
+    """ Writes the content to a temp-file and replaces the target afterwards. Thereby
+        concurrent readers (other processes) never see a half written file.
+
+    Args:
+        path: The target
+        content (bytes): The content to write.
+        mode (int, optional): The permissions of the file (see 'get_file_mode'). Defaults to None (only the owner).
+    """
+    dir_name = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix=".tmp-")
+
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _CompiledGrammar(Grammar):
+    """ A Grammar, which has already been compiled to BNF. Lark accepts Grammar-Instances
+        and calls 'compile' on them. We simply return the cached result.
+    """
+
+    def __init__(self, terminals, rules, ignore_tokens):
+        self._compiled = (terminals, rules, ignore_tokens)
+
+    def compile(self, start, terminals_to_keep):
+        return self._compiled
+
+
+def hash_grammar(grammar_file_path, **options) -> str:
+    """ Determines the hash of the grammar, the options provided to Lark and the
+        versions of lark and python. Identifies the compiled grammar and the
+        parse-trees created with it.
+
+    Args:
+        grammar_file_path: Path to the '.lark' file.
+        **options: The options, which will be provided to Lark.
+
+    Returns:
+        str: The hex-digest.
+    """
+    key = hashlib.sha256()
+    key.update(hash_file(grammar_file_path).encode("utf-8"))
+    key.update(repr(sorted(options.items())).encode("utf-8"))
+    key.update(lark.__version__.encode("utf-8"))
+    key.update(repr(sys.version_info[:2]).encode("utf-8"))
+    return key.hexdigest()
+
+
+def _get_cache_file(grammar_file_path, options: dict, ending="pickle") -> Path:
+    name = Path(grammar_file_path).name
+    return get_cache_dir("grammars").joinpath(f"{name}.{hash_grammar(grammar_file_path, **options)}.{ending}")
+
+
+def _compile(grammar_file_path, options: dict):
+    """ Compiles the grammar to BNF, using the internals of lark 0.12 (see
+        'requirements.txt'). Returns None, if the internals differ.
+    """
+    with open(grammar_file_path, encoding="utf-8") as file:
+        text = file.read()
+
+    start = options.get("start", "start")
+    start = [start] if isinstance(start, str) else start
+
+    try:
+        grammar, _ = load_grammar(
+            text,
+            str(grammar_file_path),
+            options.get("import_paths", None),
+            options.get("keep_all_tokens", False)
+        )
+
+        return grammar.compile(start, set())
+    except TypeError:
+        # An other version of lark (different signatures).
+        return None
+
+
+def _uses_lark_cache(options: dict) -> bool:
+    # Lark caches the analysis of the "lalr"-tables on its own (option 'cache').
+    return options.get("parser", "earley") == "lalr"
+
+
+def ensure_cached(grammar_file_path, **options) -> Path:
+    """ Compiles the grammar and stores it in the cache, if it is not present yet.
+        Should be called once, before spawning multiple processes.
+
+    Args:
+        grammar_file_path: Path to the '.lark' file.
+        **options: The options, which will be provided to Lark.
+
+    Returns:
+        Path: The path of the cache-file.
+    """
+    if _uses_lark_cache(options):
+        cache_file = _get_cache_file(grammar_file_path, options, "lalr")
+
+        if not cache_file.exists():
+            # Lark stores the analysed grammar.
+            open_parser(grammar_file_path, **options)
+
+        return cache_file
+
+    cache_file = _get_cache_file(grammar_file_path, options)
+
+    if not cache_file.exists():
+        compiled = _compile(grammar_file_path, options)
+
+        if compiled is not None:
+            write_atomic(cache_file, pickle.dumps(compiled, protocol=pickle.HIGHEST_PROTOCOL))
+
+    return cache_file
+
+
+def open_parser(grammar_file_path, transformer=None, **options) -> Lark:
+    """ Creates a Lark-Parser for the given grammar. The compiled grammar is stored
+        in a persistent cache (keyed by the hash of the grammar and the options).
+        Thereby loading and compiling the grammar is only performed once. The
+        "lalr"-parser uses the cache of lark, which contains the parse-tables too.
+
+    Args:
+        grammar_file_path: Path to the '.lark' file.
+        transformer (lark.Transformer, optional): Transformer, which is applied during parsing. Only supported by "lalr". Isn't part of the cache-key. Defaults to None.
+        **options: The options, which will be provided to Lark.
+
+    Returns:
+        Lark: The parser
+    """
+    if _uses_lark_cache(options):
+        cache_file = _get_cache_file(grammar_file_path, options, "lalr")
+        return Lark.open(str(grammar_file_path), transformer=transformer, cache=str(cache_file), **options)
+
+    cache_file = _get_cache_file(grammar_file_path, options)
+    compiled = None
+
+    try:
+        with open(cache_file, "rb") as file:
+            compiled = pickle.load(file)
+    except Exception:
+        # Either not cached or the cache is corrupted.
+        compiled = _compile(grammar_file_path, options)
+
+        if compiled is None:
+            # The internals of lark differ -> the grammar is compiled by lark on every start.
+            return Lark.open(str(grammar_file_path), transformer=transformer, **options)
+
+        try:
+            write_atomic(cache_file, pickle.dumps(compiled, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            pass
+
+    return Lark(_CompiledGrammar(*compiled), source_path=str(grammar_file_path), transformer=transformer, **options)
@@ -0,0 +1,136 @@
+""" Conformance check of the parser-modes. Transpiles the given js-files with the
+    "earley"- and the "lalr"-parser and compares the generated python-code.
+
+    The code is compared by its python-ast -> differences of the layout (e.g.
+    blank lines or redundant parentheses) are ignored.
+
+    Known differences (the check is not a gate, until they are resolved):
+        - The earley-grammar has no operator precedence ('atom' could be any
+          'ret_expr'). Chains of binary operators might be associated
+          differently, e.g. 'x * 2 + 1' -> 'x * (2 + 1)' or 'a > 1 ? b : c'
+          -> 'a > (b if 1 else c)'. The lalr-grammar encodes the precedence
+          of js. These files are reported as differing.
+        - '(return a) + b' of the earley-parser is normalized to 'return a + b'
+          (see 'unparse.normalize') -> not a difference.
+
+    Usage:
+        python -m prepare_code.conformance --input ./dist
+"""
+
+import argparse
+import ast
+import difflib
+import os
+import sys
+
+from . import get_logger, js, post_process
+
+
+def _is_equal(earley, lalr) -> bool:
+    """ Compares the generated code by its python-ast (ignores the layout).
+    """
+    if earley == lalr:
+        return True
+
+    try:
+        return ast.dump(ast.parse(earley)) == ast.dump(ast.parse(lalr))
+    except SyntaxError:
+        return False
+
+
+def check_conformance(files, to_snake_case=False):
+    """ Transpiles the files with both parser-modes and compares the results.
+
+    Args:
+        files (list): paths of the js-files to check.
+        to_snake_case (boolean, optional): Flag to enable converting methods and names to ids. Defaults to False.
+
+    Returns:
+        list: A list of tuples (path, reason) for every file, which differs. reason
+            contains the unified diff (earley -> lalr) or the error.
+    """
+
+    earley = js.get_parser("earley")
+    transformer = js.get_transformer(False, to_snake_case)
+    lalr = js.get_parser("lalr", transformer)
+
+    differences = []
+
+    for path in files:
+        content = open(path, encoding="utf-8").read()
+
+        results = {}
+
+        for mode, parse in (
+            ("earley", lambda: js.transform(earley.parse(content), False, to_snake_case)),
+            ("lalr", lambda: js.to_source(lalr.parse(content), False))
+        ):
+            transformer.reset()
+            try:
+                results[mode] = post_process(parse())
+            except Exception as err:
+                results[mode] = err
+
+        failed = [mode for mode, result in results.items() if isinstance(result, Exception)]
+
+        if len(failed) == 1:
+            differences.append((path, f"only '{failed[0]}' failed: {str(results[failed[0]]).splitlines()[0]}"))
+
+        elif not failed and not _is_equal(results["earley"], results["lalr"]):
+            diff = difflib.unified_diff(
+                results["earley"].splitlines(True),
+                results["lalr"].splitlines(True),
+                fromfile=f"{path} (earley)",
+                tofile=f"{path} (lalr)"
+            )
+            differences.append((path, "".join(diff)))
+
+    return differences
+
+
+def main():
+    """ The main routine. Exits with 1, if the modes differ.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Checks, whether the "earley"- and the "lalr"-parser generate the same python-code.')
+    parser.add_argument('--input', type=str, default="./", dest='inputFolder',
+                        help='Defines the Folder (or File) with the js-files to check.')
+    parser.add_argument('--convert_snake_case', dest='convert_snake_case', action='store_true',
+                        help='Converts the names to snake-case')
+    parser.add_argument('--diff', dest='diff', action='store_true',
+                        help='Shows the differences')
+
+    logger = get_logger("nope-py-prepare")
+
+    args = parser.parse_args()
+
+    input_path = os.path.join(os.getcwd(), args.inputFolder)
+    files = []
+
+    if os.path.isfile(input_path):
+        files.append(input_path)
+    else:
+        for dir_path, directories, file_names in os.walk(input_path):
+            for file_name in file_names:
+                if file_name.endswith(".js") and not file_name.endswith(".spec.js"):
+                    files.append(os.path.join(dir_path, file_name))
+
+    files = sorted(files)
+
+    logger.info(f"Checking {len(files)} files.")
+
+    differences = check_conformance(files, args.convert_snake_case)
+
+    for path, reason in differences:
+        logger.warning(f"Differs: '{path}'")
+        if args.diff:
+            print(reason)
+
+    logger.info(f"{len(files) - len(differences)} of {len(files)} files are equal.")
+
+    sys.exit(1 if differences else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import os
+import re
+import sys
+
+# The files to convert. Patterns are relative to the input and use "/" as separator.
+DEFAULT_INCLUDE = {
+    "ts": ("**/*.ts",),
+    "js": ("**/*.js",),
+}
+
+# The files and directories to skip: tests, the index-files (only re-exports)
+# and the dependencies. The "types" of "js" only contain interfaces.
+DEFAULT_EXCLUDE = {
+    "ts": ("**/*.spec.ts", "**/index.ts", "**/index.*.ts", "**/node_modules"),
+    "js": ("**/*.spec.js", "**/index.js", "**/index.*.js", "**/node_modules", "**/types/**"),
+}
+
+
+def _translate(pattern: str) -> str:
+    """ Translates a glob-pattern to a regex:
+
+        - "**/" matches any amount of directories (incl. none)
+        - "**" matches everything
+        - "*" and "?" match within a name (not "/")
+        - "[...]" matches a char of the set
+
+        A pattern without "/" matches the name in any directory (e.g. "node_modules").
+    """
+    if "/" not in pattern:
+        pattern = "**/" + pattern
+
+    ret = []
+    idx = 0
+
+    while idx < len(pattern):
+        char = pattern[idx]
+
+        if pattern.startswith("**/", idx):
+            ret.append("(?:.*/)?")
+            idx += 3
+            continue
+
+        if pattern.startswith("**", idx):
+            ret.append(".*")
+            idx += 2
+            continue
+
+        if char == "*":
+            ret.append("[^/]*")
+        elif char == "?":
+            ret.append("[^/]")
+        elif char == "[" and "]" in pattern[idx + 1:]:
+            end = pattern.index("]", idx + 1)
+            content = pattern[idx + 1:end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            ret.append("[" + content.replace("\\", "\\\\") + "]")
+            idx = end
+        else:
+            ret.append(re.escape(char))
+
+        idx += 1
+
+    return "".join(ret)
+
+
+def compile_patterns(patterns):
+    """ Compiles the glob-patterns (see '_translate') to one regex.
+
+    Args:
+        patterns (iterable): The glob-patterns
+
+    Returns:
+        re.Pattern | None: The regex (use 'fullmatch') or None, if there is no pattern.
+    """
+    patterns = list(patterns)
+
+    if not patterns:
+        return None
+
+    return re.compile("|".join(f"(?:{_translate(pattern)})" for pattern in patterns))
+
+
+class FileFilter:
+    """ Selects the files using include- and exclude-patterns (see 'compile_patterns').
+        The patterns are compiled once. Excluded directories are not entered.
+    """
+
+    def __init__(self, include, exclude=()):
+        """ Creates the filter.
+
+        Args:
+            include (iterable): The patterns of the files to convert.
+            exclude (iterable, optional): The patterns of the files and directories to skip. Defaults to ().
+        """
+        self._include = compile_patterns(include)
+        self._exclude = compile_patterns(exclude)
+
+    def matches(self, rel_path: str) -> bool:
+        """ Checks, whether the file should be converted.
+
+        Args:
+            rel_path (str): path of the file, relative to the input (separated by "/").
+
+        Returns:
+            bool: True, if included and not excluded.
+        """
+        if self._include is None or not self._include.fullmatch(rel_path):
+            return False
+
+        return self._exclude is None or not self._exclude.fullmatch(rel_path)
+
+    def prunes(self, rel_dir: str) -> bool:
+        """ Checks, whether the directory is excluded (e.g. "**/node_modules"
+            or "**/types/**") -> it isn't entered.
+
+        Args:
+            rel_dir (str): path of the directory, relative to the input (separated by "/").
+
+        Returns:
+            bool: True, if the directory is excluded.
+        """
+        return self._exclude is not None and (
+            self._exclude.fullmatch(rel_dir) is not None or
+            self._exclude.fullmatch(rel_dir + "/") is not None
+        )
+
+
+def create_filter(type, include=None, exclude=None, default_excludes=True) -> FileFilter:
+    """ Creates the filter for the type.
+
+    Args:
+        type (str): the type of the files ("ts" | "js")
+        include (list, optional): The patterns of the files to convert. Defaults to 'DEFAULT_INCLUDE'.
+        exclude (list, optional): Additional patterns of the files to skip. Defaults to None.
+        default_excludes (bool, optional): Adds 'DEFAULT_EXCLUDE'. Defaults to True.
+
+    Returns:
+        FileFilter: The filter.
+    """
+    return FileFilter(
+        include or DEFAULT_INCLUDE[type],
+        (DEFAULT_EXCLUDE[type] if default_excludes else ()) + tuple(exclude or ())
+    )
+
+
+def iter_files(input_path, file_filter: FileFilter, logger):
+    """ Walks the input (using 'os.scandir') and yields the files to convert, as
+        soon as they are found. Excluded directories are pruned. The entries
+        of a directory are sorted -> the order is stable.
+
+    Args:
+        input_path (str): path of the folder (or file) to readin
+        file_filter (FileFilter): Selects the files.
+        logger (logging.logger): The Logger
+
+    Yields:
+        (str, str, str): file_name, path_to_file, dir_path
+    """
+
+    if os.path.isfile(input_path):
+        dir_path, file_name = os.path.split(input_path)
+
+        if file_filter.matches(file_name):
+            yield (file_name, input_path, dir_path)
+        return
+
+    # Directories to visit: (path, path relative to the input)
+    pending = [(input_path, "")]
+
+    while pending:
+        dir_path, rel_dir = pending.pop()
+
+        try:
+            with os.scandir(dir_path) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError as err:
+            logger.warning(f"Failed to read the directory '{dir_path}': {err}")
+            continue
+
+        directories = []
+
+        for entry in entries:
+            rel_path = rel_dir + entry.name
+
+            # Links to directories are not followed (as 'os.walk').
+            if entry.is_dir(follow_symlinks=False):
+                if file_filter.prunes(rel_path):
+                    logger.debug(f"Skipping dir: '{entry.path}'")
+                else:
+                    directories.append((entry.path, rel_path + "/"))
+
+            elif file_filter.matches(rel_path):
+                # Show a log message
+                logger.debug(f"Found file: '{entry.name}' at '{dir_path}'")
+
+                yield (entry.name, entry.path, dir_path)
+
+        # Visit the sub-directories in sorted order.
+        pending.extend(reversed(directories))
+
+
+def iter_files_from(manifest, input_path, file_filter: FileFilter, logger):
+    """ Yields the files listed in the manifest (one path per line, relative to
+        the input or absolute; empty lines and lines starting with '#' are
+        skipped). A file listed multiple times is yielded once. The directory
+        isn't walked. Use "-" to read the paths from stdin.
+
+    Args:
+        manifest (str): path of the manifest or "-".
+        input_path (str): path of the folder to readin
+        file_filter (FileFilter): Selects the files.
+        logger (logging.logger): The Logger
+
+    Yields:
+        (str, str, str): file_name, path_to_file, dir_path
+    """
+    if manifest == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(manifest, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+
+    # The yielded files (relative paths).
+    found = set()
+
+    for line in lines:
+        line = line.strip()
+
+        if not line or line.startswith("#"):
+            continue
+
+        rel_path = os.path.relpath(os.path.join(input_path, line), input_path).replace(os.sep, "/")
+
+        if rel_path.startswith("../"):
+            logger.warning(f"The file '{line}' of '{manifest}' isn't part of the input '{input_path}'")
+            continue
+
+        # Same form as the walked paths (the output is determined relative to the input).
+        path_to_file = os.path.join(input_path, *rel_path.split("/"))
+
+        if not file_filter.matches(rel_path):
+            logger.debug(f"Skipping file: '{path_to_file}' (excluded)")
+            continue
+
+        if not os.path.isfile(path_to_file):
+            logger.warning(f"The file '{path_to_file}' of '{manifest}' doesn't exist")
+            continue
+
+        if rel_path in found:
+            logger.debug(f"Skipping file: '{path_to_file}' (listed multiple times)")
+            continue
+
+        found.add(rel_path)
+
+        dir_path, file_name = os.path.split(path_to_file)
+
+        yield (file_name, path_to_file, dir_path)
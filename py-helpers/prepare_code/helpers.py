@@ -18,13 +18,18 @@ def to_snake_case(str:str)->str:
     if str == str.upper():
         return str
 
+    # The leading underscores are kept (e.g. '_fooBar' -> '_foo_bar').
+    name = str.lstrip('_')
+    prefix = str[:len(str) - len(name)]
+
     ret = ''.join(['_'+i.lower() if i.isupper()
-                    else i for i in str]).lstrip('_')
+                    else i for i in name])
 
-    if ret.startswith("_"):
-        ret[1:]
+    # The underscore of a leading capital (e.g. 'FooBar' -> 'foo_bar').
+    if name[:1].isupper():
+        ret = ret[1:]
 
-    return ret
+    return prefix + ret
 
 def define_dotted_dict(type= "name"):
     """ Returns the Deinfition of the dotdict class
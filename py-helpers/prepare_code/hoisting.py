@@ -0,0 +1,106 @@
+import ast
+
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+class _Hoister:
+    """ Moves the function-expressions of a statement in front of the statement.
+        Every node is visited once.
+    """
+
+    def __init__(self, definitions):
+        self._definitions = definitions
+        # Definitions, which already have been placed.
+        self._placed = set()
+
+    def body(self, statements):
+        ret = []
+
+        for statement in statements:
+
+            if not isinstance(statement, ast.AST):
+                # e.g. skipped statements (None)
+                ret.append(statement)
+                continue
+
+            if isinstance(statement, _FUNCTIONS):
+                if statement in self._placed:
+                    # Already hoisted, because it has been used before.
+                    continue
+                self._placed.add(statement)
+
+            hoisted = []
+            self._statement(statement, hoisted)
+
+            ret += hoisted
+            ret.append(statement)
+
+        return ret
+
+    def _statement(self, node, hoisted):
+        for field, value in ast.iter_fields(node):
+
+            if field in ("body", "orelse", "finalbody") and isinstance(value, list):
+                # A nested block (or the scope of a function).
+                setattr(node, field, self.body(value))
+
+            elif field == "handlers" and isinstance(value, list):
+                for handler in value:
+                    handler.type = self._expression(handler.type, hoisted)
+                    handler.body = self.body(handler.body)
+
+            else:
+                new_value = self._expression(value, hoisted)
+                if new_value is not value:
+                    setattr(node, field, new_value)
+
+    def _expression(self, node, hoisted):
+        if isinstance(node, list):
+            return [self._expression(item, hoisted) for item in node]
+
+        if isinstance(node, ast.Name) and node in self._definitions:
+            # The Placeholder of a function.
+            definition = self._definitions[node]
+            self._hoist(definition, hoisted)
+            return ast.Name(id=definition.name)
+
+        if isinstance(node, _FUNCTIONS):
+            # A function, which hasn't been replaced by a placeholder.
+            self._hoist(node, hoisted)
+            return ast.Name(id=node.name)
+
+        if isinstance(node, ast.AST):
+            for field, value in ast.iter_fields(node):
+                new_value = self._expression(value, hoisted)
+                if new_value is not value:
+                    setattr(node, field, new_value)
+
+        return node
+
+    def _hoist(self, definition, hoisted):
+        if definition in self._placed:
+            return
+
+        self._placed.add(definition)
+
+        # Its defaults are hoisted as well, its body is its own scope.
+        self._statement(definition, hoisted)
+        hoisted.append(definition)
+
+
+def hoist_functions(program, definitions):
+    """ Hoists the nested functions (anonymous callbacks etc.) of the program.
+        Every function used as expression is defined right before the statement
+        using it. The functions are placed inside of the closest block (the body
+        of a function, loop, if-statement, ...). The order follows the source
+        and the program is traversed once.
+
+    Args:
+        program (ast.Module): The transformed program
+        definitions (dict): Maps the placeholders (ast.Name) of the functions to their definition.
+
+    Returns:
+        ast.Module: The adapted program.
+    """
+    program.body = _Hoister(definitions).body(program.body)
+    return program
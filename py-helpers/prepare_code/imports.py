@@ -0,0 +1,309 @@
+""" The import-graph of a project. Every converted file contributes its symbols
+    (see 'get_module_symbols'): the names it exports and the names it imports
+    from the other files of the project. After a file has changed, only the
+    importers referencing a changed (added, renamed or removed) exported name
+    have to be converted again (see 'ImportGraph.update').
+
+    The symbols are determined from the transformed program (the python-ast),
+    thereby the names are the generated ones (e.g. after '--convert_snake_case'):
+        - 'import { a, b as c } from "./x"'   -> the specifiers recorded by the transformer (see 'import_stmt_from')
+        - 'const x_1 = require("./x")'         -> the attributes used of 'x_1'
+        - exported are the names bound at the top-level and 'exports.name = ...'
+"""
+
+import ast
+import json
+import posixpath
+
+from .cache import get_cache_dir, write_atomic
+from .symbols import find_collisions
+
+# The endings tried to resolve a specifier (e.g. "./x" -> "x.ts").
+_ENDINGS = ("", ".ts", ".js", "/index.ts", "/index.js")
+
+# Imports all names (e.g. 'from x import *').
+STAR = "*"
+
+
+def _get_id(value):
+    """ Returns the name. The transformers create a loose ast (see 'unparse'),
+        e.g. the attribute of a member might be a 'Name'.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, ast.Name) and isinstance(value.id, str):
+        return value.id
+    return None
+
+
+def get_module_symbols(program, imports=None) -> dict:
+    """ Determines the exported and the imported names of the program.
+
+    Args:
+        program (ast.Module): The transformed program
+        imports (dict, optional): The specifiers of the imports and the imported names, recorded
+            by the transformer (see 'import_stmt_from'). Defaults to None.
+
+    Returns:
+        dict: {"exports": [names], "imports": {specifier: [names]}}. The
+            specifiers are relative (e.g. "./x"), packages are skipped.
+            STAR imports all names. 'transpiler.convert_source' adds the
+            python-names of the identifiers ("names", see 'symbols').
+    """
+    exports = set()
+    recorded = imports or {}
+    imports = {}
+
+    for specifier, names in recorded.items():
+        if specifier.startswith("."):
+            imports.setdefault(specifier, set()).update(_get_id(name) for name in names if _get_id(name))
+
+    # The names bound by 'require' -> its specifier.
+    required = {}
+    # The targets of 'require' (the transformers don't set the 'ctx').
+    bindings = set()
+
+    for node in getattr(program, "body", []):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if _get_id(node.name):
+                exports.add(_get_id(node.name))
+
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            value = node.value
+
+            for target in targets:
+                if isinstance(target, ast.Name) and _get_id(target):
+                    exports.add(target.id)
+
+                    # e.g. 'x_1 = require("./x")'
+                    if (
+                        isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == "require" and
+                        value.args and isinstance(value.args[0], ast.Constant) and isinstance(value.args[0].value, str) and
+                        value.args[0].value.startswith(".")
+                    ):
+                        required[target.id] = value.args[0].value
+                        bindings.add(id(target))
+
+                # e.g. 'exports.name = name'
+                elif isinstance(target, ast.Attribute) and _get_id(target.value) == "exports" and _get_id(target.attr):
+                    exports.add(_get_id(target.attr))
+
+    if required:
+        # The names, which are bound or the object of an attribute (e.g. 'x_1' of 'x_1.name').
+        members = set(bindings)
+
+        for node in ast.walk(program):
+            if isinstance(node, ast.Attribute) and _get_id(node.value) in required:
+                members.add(id(node.value))
+                if _get_id(node.attr):
+                    imports.setdefault(required[_get_id(node.value)], set()).add(_get_id(node.attr))
+
+        for node in ast.walk(program):
+            if isinstance(node, ast.Name) and _get_id(node) in required and id(node) not in members:
+                # The module is used as a whole (e.g. passed to a function).
+                imports.setdefault(required[node.id], set()).add(STAR)
+
+    return {
+        "exports": sorted(exports),
+        "imports": {specifier: sorted(names) for specifier, names in sorted(imports.items())}
+    }
+
+
+def resolve_import(specifier, rel_path, files):
+    """ Resolves the specifier of an import to a file of the project.
+
+    Args:
+        specifier (str): The relative specifier (e.g. "../x")
+        rel_path (str): path of the importing file, relative to the input (separated by "/").
+        files (set | dict): The files of the project (relative paths).
+
+    Returns:
+        str | None: The relative path of the imported file or None, if not part of the project.
+    """
+    base = posixpath.normpath(posixpath.join(posixpath.dirname(rel_path), specifier))
+
+    for ending in _ENDINGS:
+        if base + ending in files:
+            return base + ending
+
+    return None
+
+
+class ImportGraph:
+    """ The symbols of the files of a project (see 'get_module_symbols'),
+        stored with the build-cache (see 'BuildCache.project').
+    """
+
+    def __init__(self, project):
+        """ Loads the graph of the previous build.
+
+        Args:
+            project (str): The hash of the project (see 'BuildCache.project').
+        """
+        self._file = get_cache_dir("builds/graphs").joinpath(f"{project}.json")
+
+        try:
+            with open(self._file, encoding="utf-8") as file:
+                self._symbols = json.load(file)
+        except (OSError, ValueError):
+            self._symbols = {}
+
+        # The importers of every file (see '_get_importers'). Determined on demand.
+        self._importers = None
+
+    def __contains__(self, rel_path):
+        return rel_path in self._symbols
+
+    def files(self):
+        """ Returns the relative paths of the files in the graph.
+        """
+        return list(self._symbols)
+
+    def get_symbols(self, rel_path):
+        """ Returns the stored symbols of the file (see 'get_module_symbols').
+
+        Args:
+            rel_path (str): path of the file, relative to the input (separated by "/").
+
+        Returns:
+            dict | None: The symbols or None, if the file isn't part of the graph.
+        """
+        return self._symbols.get(rel_path, None)
+
+    def get_imports(self, rel_path) -> dict:
+        """ Returns the resolved imports of the file.
+
+        Args:
+            rel_path (str): path of the file, relative to the input (separated by "/").
+
+        Returns:
+            dict: The imported file -> the imported names
+        """
+        resolved = {}
+
+        for specifier, names in self._symbols.get(rel_path, {}).get("imports", {}).items():
+            target = resolve_import(specifier, rel_path, self._symbols)
+            if target is not None and target != rel_path:
+                resolved.setdefault(target, set()).update(names)
+
+        return resolved
+
+    def _get_importers(self) -> dict:
+        """ Returns the imported file -> {importer: the imported names}
+        """
+        if self._importers is None:
+            self._importers = {}
+
+            for importer in self._symbols:
+                for target, names in self.get_imports(importer).items():
+                    self._importers.setdefault(target, {})[importer] = names
+
+        return self._importers
+
+    def update(self, changes) -> list:
+        """ Stores the symbols of the converted files and determines the importers
+            referencing an exported name, which has been added or removed.
+
+        Args:
+            changes (dict): path of the file (relative to the input, separated by "/") -> the
+                symbols (see 'get_module_symbols') or None, if the file has been removed.
+
+        Returns:
+            list: The relative paths of the importers, which have to be converted again.
+        """
+        # The importers of the previous exports (e.g. of a removed file).
+        before = self._get_importers()
+        changed = {}
+
+        for rel_path, symbols in changes.items():
+            previous = set(self._symbols.get(rel_path, {}).get("exports", []))
+
+            if symbols is None:
+                self._symbols.pop(rel_path, None)
+                changed[rel_path] = previous
+            else:
+                self._symbols[rel_path] = symbols
+                changed[rel_path] = previous.symmetric_difference(symbols["exports"])
+
+        # The importers of the new exports (e.g. of an added file).
+        self._importers = None
+        after = self._get_importers()
+
+        dependents = set()
+
+        for rel_path, names in changed.items():
+            if not names:
+                continue
+
+            for importers in (before.get(rel_path, {}), after.get(rel_path, {})):
+                dependents.update(
+                    importer for importer, imported in importers.items()
+                    if importer in self._symbols and (STAR in imported or not imported.isdisjoint(names))
+                )
+
+        return sorted(dependents)
+
+    def get_missing(self, rel_path) -> list:
+        """ Determines the imported names, which are not exported by the imported file.
+
+        Args:
+            rel_path (str): path of the file, relative to the input (separated by "/").
+
+        Returns:
+            list: (imported file, name)
+        """
+        missing = []
+
+        for target, names in sorted(self.get_imports(rel_path).items()):
+            exports = set(self._symbols[target]["exports"])
+            missing.extend((target, name) for name in sorted(names - exports - {STAR}))
+
+        return missing
+
+    def get_names(self) -> dict:
+        """ Returns the python-names of the identifiers of all files ('--convert_snake_case').
+
+        Returns:
+            dict: The identifier -> its python-name (see 'SymbolTable')
+        """
+        names = {}
+
+        for symbols in self._symbols.values():
+            names.update(symbols.get("names", {}))
+
+        return names
+
+    def get_collisions(self, rel_paths) -> dict:
+        """ Determines the python-names of the given files, which are used for
+            different identifiers in the project (e.g. 'fooBar' and 'foo_bar').
+
+        Args:
+            rel_paths (list): paths of the files, relative to the input (separated by "/").
+
+        Returns:
+            dict: The python-name -> {identifier: the (sorted) files using it}
+        """
+        collisions = find_collisions(self.get_names())
+        used = set()
+
+        for rel_path in rel_paths:
+            used.update(self._symbols.get(rel_path, {}).get("names", {}).values())
+
+        result = {}
+
+        for python_name in sorted(used.intersection(collisions)):
+            result[python_name] = {
+                name: sorted(
+                    rel_path for rel_path, symbols in self._symbols.items()
+                    if name in symbols.get("names", {})
+                )
+                for name in collisions[python_name]
+            }
+
+        return result
+
+    def save(self):
+        """ Stores the graph.
+        """
+        write_atomic(self._file, json.dumps(self._symbols, indent=2, sort_keys=True).encode("utf-8"))
@@ -1,14 +1,78 @@
-from lark import Lark
 from pathlib import Path
 
+from ..cache import open_parser, ensure_cached, hash_grammar
+
 # Define the Grammar File.
 grammar_file_path = Path(__file__).parent.joinpath('grammar.js.lark')
 
+# The Options used for lark.
+parser_options = {
+    "debug": True,
+    "maybe_placeholders": True
+}
+
+# The LALR-Variant of the Grammar (uses the same rule names).
+lalr_grammar_file_path = Path(__file__).parent.joinpath('grammar.js.lalr.lark')
+
+lalr_parser_options = {
+    "parser": "lalr",
+    "maybe_placeholders": True
+}
+
+# The supported parser-modes.
+PARSER_MODES = ("earley", "lalr")
+
+
+def _get_grammar(parser_mode):
+    if parser_mode == "earley":
+        return grammar_file_path, parser_options
+    elif parser_mode == "lalr":
+        return lalr_grammar_file_path, lalr_parser_options
 
-def get_parser():
-    """ Helper, to generate a parser.
+    raise ValueError(f"Unknown parser-mode '{parser_mode}'. Use one of {PARSER_MODES}")
+
+
+def get_parser(parser_mode="earley", transformer=None):
+    """ Helper, to generate a parser. The compiled grammar is
+        loaded from the persistent cache (see 'prepare_code.cache').
+
+    Args:
+        parser_mode (str, optional): The parser to use ("earley" | "lalr"). Defaults to "earley".
+        transformer (lark.Transformer, optional): Transformer, which is applied during parsing.
+            Only supported by "lalr". Then 'parse' directly returns the result of the transformer
+            and no tree is build. Defaults to None.
 
     Returns:
         A lark parser
     """
-    return Lark.open(grammar_file_path,debug = True, maybe_placeholders=True)
\ No newline at end of file
+    path, options = _get_grammar(parser_mode)
+
+    if transformer is not None and parser_mode != "lalr":
+        raise ValueError("An inline transformer is only supported by the 'lalr'-parser")
+
+    return open_parser(path, transformer=transformer, **options)
+
+
+def prepare_parser(parser_mode="earley"):
+    """ Compiles the grammar once and stores it in the cache.
+        Should be called, before starting multiple processes.
+
+    Args:
+        parser_mode (str, optional): The parser to use ("earley" | "lalr"). Defaults to "earley".
+    """
+    path, options = _get_grammar(parser_mode)
+    ensure_cached(path, **options)
+
+
+def get_grammar_hash(parser_mode="earley") -> str:
+    """ Determines the hash of the grammar of the parser (see 'prepare_code.cache').
+        Identifies the parse-trees created by the parser (see 'prepare_code.tree_cache').
+
+    Args:
+        parser_mode (str, optional): The parser to use ("earley" | "lalr"). Defaults to "earley".
+
+    Returns:
+        str: The hex-digest.
+    """
+    path, options = _get_grammar(parser_mode)
+    return hash_grammar(path, **options)
@@ -1,228 +1,251 @@
 import _ast
 import ast
-import astor
 import logging
+from types import MethodType
 
 # from prepare_code import get_logger
 from ..logger import get_logger
-from ..helpers import to_snake_case, define_dotted_dict
+from ..helpers import define_dotted_dict
+from ..hoisting import hoist_functions
+from ..imports import STAR
+from ..symbols import get_symbol_table
+from .. import unparse
 from lark import Transformer
 
-class CodeTransformeJs(Transformer):
+# The rules are generated twice: without and with tracing. The traced version is
+# only used, if the transformer is created with the level 'logging.DEBUG'.
+# Otherwise no log-message is formatted at all.
 
-    def __init__(self, visit_tokens: bool = True, level=logging.INFO, to_snake_case=False, switch_case_to_if_else=True, **kwargs) -> None:
-        super().__init__(visit_tokens)
-        self.to_snake_case = to_snake_case
-        self.switch_case_to_if_else = switch_case_to_if_else
+def _skip_rule(name, trace):
+    def rule(self, items):
+        if trace:
+            self._logger.debug(f"skipping '{name}'")
+            self._log(name, items)
+        return
 
-        self._logger = get_logger("DebugWrapper", level)
-        self._callback_counter = 0
+    return rule
 
-        self._anonymous_func_to_ids = dict()
-        self._ids_to_anonymous_func = dict()
-
-        # The Key is allways a ast.Node (the Parent Node.)
-        # The Value is a Set, containing sub-nodes,
-        self._anonymous_func_tree = dict()
-
-        self._skip = [
-            "terminator",
-            "export",
-            "declare_var_type",
-            "for_iter_type",
-            "skip"
-        ]
-        self._first = [
-            "ret_expr",
-            "ret_expr_with_terminator",
-            "statement",
-            "sum",
-            "bool",
-            "product",
-            "boolean_input",
-            "atom",
-            "list_item",
-            "bracket_accessor",
-            "accessor",
-            "func_statement",
-            "func_arg",
-            "call_arg",
-            "iter_statement",
-            "else_statement",
-            "switch_case_statement",
-            "switch_case_body_end",
-            "class_declarations",
-            "for_iter_var",
-            "descruct_dict_items",
-            "destruct_list_items"
-        ]
-        self._all = [
-            "import_names",
-            "list_items",
-            "dict_items",
-            "func_statements",
-            "call_args",
-            "iter_statements",
-            "else_if_statements",
-            "else_if_statement",
-            "switch_body",
-            "switch_case_statements",
-            "class_body"
-        ]
-        self._contains_body = [
-            "for",
-            "default_for",
-            "ranged_for",
-            "multi_for",
-            "while_statement",
-            "body",
-            "if_statement",
-            "switch",
-            "try_catch",
-            "class_statement",
-            # "constructor",
-            # "method",
-            # "async_method",
-            "start"
-        ]
-        self._original = [
-            "to_snake_case",
-            "switch_case_to_if_else",
-            "_logger",
-            "_callback_counter",
-            "_anonymous_func_to_ids",
-            "_ids_to_anonymous_func",
-            "_anonymous_func_tree",
-            "_get_func_name",
-            "_get_name",
-            "_adapt_items",
-            "_add_to_tree",
-            "_add_to_tree_single",
-            "_adapt_body",
-            "_log",
-            "_log_extracted",
-            "_skip",
-            "_default",
-            "_original",
-            "_contains_body",
-            "transform",
-            "start"
-        ]
 
-    def __getattribute__(self, __name: str):
+def _first_rule(name, trace):
+    def rule(self, items):
 
-        own_attribute = list(__class__.__dict__.keys())
+        if trace:
+            self._log(name, items)
 
-        logger = object.__getattribute__(self, "_logger")
-        _original = object.__getattribute__(self, "_original")
-        _skip = object.__getattribute__(self, "_skip")
-        _first = object.__getattribute__(self, "_first")
-        _all = object.__getattribute__(self, "_all")
+            try:
+                self._logger.debug(
+                    f"calling '{name}' resulted in result={ast.dump(items[0])}")
+                self._logger.debug(
+                    f"calling '{name}' created node-id={items[0]}")
+            except:
+                self._logger.debug(
+                    f"calling '{name}' resulted in result={items[0]}")
 
-        if __name in _original:
-            return object.__getattribute__(self, __name)
+        return items[0]
 
-        elif __name in _skip:
+    return rule
 
-            logger.debug(f"getting skipping function for '{__name}'")
 
-            def ret(items):
-                self._logger.debug(f"skipping '{__name}'")
-                self._log(__name, items)
-                return
+def _all_rule(name, trace):
+    def rule(self, items):
+        if trace:
+            self._log(name, items)
+            self._logger.debug(f"all for '{name}'")
+        return items
 
-            return ret
+    return rule
 
-        elif __name in _first:
 
-            logger.debug(f"getting first function for '{__name}'")
+def _custom_rule(name, func, contains_body, trace):
+    def rule(self, *args, **kwargs):
+        """ A Custom Function, which replaces the functions
+            in the items by their placeholders.
+        """
+        try:
+            items = args[0]
 
-            def ret(items):
+            if not contains_body:
+                items = self._adapt_items(args[0])
+            
+            if trace:
+                self._log(name, items)
 
-                self._log(__name, items)
+            # Call the original Function
+            result = func(self, items, **kwargs)
 
+            if trace:
                 try:
                     self._logger.debug(
-                        f"calling '{__name}' resulted in result={ast.dump(items[0])}")
-                    self._logger.debug(
-                        f"calling '{__name}' created node-id={items[0]}")
+                        f"calling '{name}' resulted in result={ast.dump(result)}")
                 except:
                     self._logger.debug(
-                        f"calling '{__name}' resulted in result={items[0]}")
+                        f"calling '{name}' resulted in result={result}")
 
-                return items[0]
+            return result
 
-            return ret
+        except Exception as err:
+            if trace:
+                self._logger.debug(
+                    f"failed calling: '{name}'. reason: {err}")
+            result = func(self, *args, **kwargs)
 
-        elif __name in _all:
+            return result
 
-            logger.debug(f"getting all function for '{__name}'")
+    rule.__name__ = func.__name__
+    rule.__doc__ = func.__doc__
 
-            def ret(items):
-                self._log(__name, items)
-                self._logger.debug(f"all for '{__name}'")
-                return items
+    return rule
 
-            return ret
 
-        elif __name not in own_attribute:
+def _create_dispatch_table(cls):
+    """ Class-Decorator, which resolves the rule categories ('_skip', '_first',
+        '_all' and the custom methods) once, by replacing the methods of the class.
+        Thereby the lookup of a rule is a plain attribute access. The traced
+        rules are stored in '_traced_rules' and bound to debugging instances.
+    """
 
-            # logger.debug(f"a unkown function named '{__name}' has been requested. Using Super element")
-            return object.__getattribute__(self, __name)
+    rules = dict()
+    traced_rules = dict()
 
-        else:
-            attr = object.__getattribute__(self, __name)
+    for name, attr in list(cls.__dict__.items()):
+        if name.startswith("__") or name in cls._original or not callable(attr):
+            continue
+
+        contains_body = name in cls._contains_body
 
-            logger.debug(f"using custom function for '{__name}'")
+        rules[name] = _custom_rule(name, attr, contains_body, False)
+        traced_rules[name] = _custom_rule(name, attr, contains_body, True)
 
-            if callable(attr):
+    # The order matters: '_skip' before '_first' before '_all'
+    for names, create in ((cls._all, _all_rule), (cls._first, _first_rule), (cls._skip, _skip_rule)):
+        for name in names:
+            if name not in cls._original:
+                rules[name] = create(name, False)
+                traced_rules[name] = create(name, True)
 
-                _contains_body = object.__getattribute__(
-                    self, "_contains_body")
+    for name, rule in rules.items():
+        setattr(cls, name, rule)
 
-                def ret(*args, **kwargs):
-                    """ A Custom Function, which is used to 
-                        register the function if possible.
-                    """
-                    try:
-                        items = args[0]
+    cls._traced_rules = traced_rules
 
-                        if __name not in _contains_body:
-                            items = self._adapt_items(args[0])
-                        
-                        self._log(__name, items)
+    return cls
 
-                        # Call the original Function
-                        result = attr(items, **kwargs)
 
-                        try:
-                            self._logger.debug(
-                                f"calling '{__name}' resulted in result={ast.dump(result)}")
-                        except:
-                            self._logger.debug(
-                                f"calling '{__name}' resulted in result={result}")
+@_create_dispatch_table
+class CodeTransformeJs(Transformer):
+
+    # Rules, which are skipped.
+    _skip = (
+        "terminator",
+        "export",
+        "declare_var_type",
+        "for_iter_type",
+        "skip"
+    )
+    # Rules, which return their first item.
+    _first = (
+        "ret_expr",
+        "ret_expr_with_terminator",
+        "statement",
+        "sum",
+        "bool",
+        "product",
+        "boolean_input",
+        "atom",
+        "list_item",
+        "bracket_accessor",
+        "accessor",
+        "func_statement",
+        "func_arg",
+        "call_arg",
+        "iter_statement",
+        "else_statement",
+        "switch_case_statement",
+        "switch_case_body_end",
+        "class_declarations",
+        "for_iter_var",
+        "descruct_dict_items",
+        "destruct_list_items"
+    )
+    # Rules, which return all items.
+    _all = (
+        "import_names",
+        "list_items",
+        "dict_items",
+        "func_statements",
+        "call_args",
+        "iter_statements",
+        "else_if_statements",
+        "else_if_statement",
+        "switch_body",
+        "switch_case_statements",
+        "class_body"
+    )
+    # Rules, which contain a body. Their items won't be adapted.
+    _contains_body = (
+        "for",
+        "default_for",
+        "ranged_for",
+        "multi_for",
+        "while_statement",
+        "body",
+        "if_statement",
+        "switch",
+        "try_catch",
+        "class_statement",
+        # "constructor",
+        # "method",
+        # "async_method",
+        "start"
+    )
+    # Methods, which are used as they are.
+    _original = (
+        "_get_func_name",
+        "_get_name",
+        "_adapt_items",
+        "_log",
+        "_log_extracted",
+        "transform",
+        "reset",
+        "start"
+    )
+
+    def __init__(self, visit_tokens: bool = True, level=logging.INFO, to_snake_case=False, switch_case_to_if_else=True, symbols=None, **kwargs) -> None:
+        super().__init__(visit_tokens)
+        self.to_snake_case = to_snake_case
+        # The table of the python-names. Defaults to the table of the process (see 'symbols').
+        self._symbols = symbols
+        self.switch_case_to_if_else = switch_case_to_if_else
+
+        self._logger = get_logger("DebugWrapper", level)
 
-                        try: 
-                            # Test if the Elment does not contain a body.
-                            if __name not in _contains_body and type(result) not in (list, tuple, dict):
-                                # Now register some callbacks:
-                                self._add_to_tree(result, items)
+        # Flag, which enables the tracing. If disabled, no message is created.
+        self._trace = self._logger.isEnabledFor(logging.DEBUG)
 
-                        except:
-                            pass
+        if self._trace:
+            for name, rule in self._traced_rules.items():
+                setattr(self, name, MethodType(rule, self))
 
-                        return result
+        self.reset()
 
-                    except Exception as err:
-                        logger.debug(
-                            f"failed calling: '{__name}'. reason: {err}")
-                        result = attr(*args, **kwargs)
+    def reset(self):
+        """ Resets the state of the transformer. Must be called before transforming
+            another file with the same instance (e.g. if the transformer is applied
+            inline by the lalr-parser).
+        """
+        self._callback_counter = 0
 
-                        return result
+        # Maps the functions to their placeholders (ast.Name) and vice versa.
+        # The placeholders are replaced by 'hoist_functions'.
+        self._anonymous_func_to_ids = dict()
+        self._ids_to_anonymous_func = dict()
 
-                return ret
+        # The identifiers of the file and their python-names (see 'symbols.find_collisions').
+        self._table = self._symbols if self._symbols is not None else get_symbol_table()
+        self.names = dict()
 
-            return attr
+        # The specifiers of the imports (e.g. "./x") and the imported names (see 'imports.get_module_symbols').
+        self.imports = dict()
 
     def _get_func_name(self):
         name = f"callback_{self._callback_counter}"
@@ -231,7 +254,9 @@ class CodeTransformeJs(Transformer):
 
     def _get_name(self, str):
         if self.to_snake_case:
-            return to_snake_case(str)
+            name = self._table.get_name(str)
+            self.names[str] = name
+            return name
         else:
             return str
     
@@ -254,85 +279,10 @@ class CodeTransformeJs(Transformer):
         else:
             return items
 
-    def _add_to_tree(self, ret, items):
-        """ Create the required Tree.
-            ret = Node
-            Childs = 
-        """
-        to_check = []
-
-        if type(items) is list:
-            for item in items:
-                if type(item) is list:
-                    to_check += item
-                elif item is not None:
-                    to_check.append(item)
-        elif items is not None:
-            to_check.append(items)
-
-        self._logger.debug(f"'_add_to_tree' -> '{ret}' checks {to_check}")
-
-        for item in to_check:
-            try:
-                self._add_to_tree_single(ret, item)
-            except:
-                pass
-
-    def _add_to_tree_single(self, parent, item):
-        id = item
-
-        if id in self._ids_to_anonymous_func:
-            if parent not in self._anonymous_func_tree:
-                self._anonymous_func_tree[parent] = set()
-
-            self._anonymous_func_tree[parent].add(
-                self._ids_to_anonymous_func[id]
-            )
-
-            self._logger.debug(f"\t\t'{parent}' added defintions (function_defintion) for  {self._anonymous_func_tree[parent]}")
-
-        elif id in self._anonymous_func_to_ids:
-            if parent not in self._anonymous_func_tree:
-                self._anonymous_func_tree[parent] = set()
-
-            self._anonymous_func_tree[parent].add(
-                id
-            )
-
-            self._logger.debug(f"\t\t'{parent}' added defintions (a function) for  {self._anonymous_func_tree[parent]}")
-
-        elif item in self._anonymous_func_tree:
-            if parent not in self._anonymous_func_tree:
-                self._anonymous_func_tree[parent] = set()
-
-            s = self._anonymous_func_tree[parent]
-            # Store the contained Ids.
-            self._anonymous_func_tree[parent] = s.union(
-                self._anonymous_func_tree[item])
-
-            self._logger.debug(f"\t\t'{parent}' added defintions (a containing node) for  {self._anonymous_func_tree[parent]}")
-
-        else:
-            self._logger.debug(f"\t\tfailed to find function for '{id}'")
-            self._logger.debug(f"\t\t_anonymous_func_to_ids: '{self._anonymous_func_to_ids}'")
-            self._logger.debug(f"\t\t_ids_to_anonymous_func: '{self._ids_to_anonymous_func}'")
-
-    def _adapt_body(self, body):
-        defintions_to_add = set()
-
-        for item in body:
-            if item in self._anonymous_func_tree:
-                self._logger.debug(f"Found callback items for {item}")
-                defintions_to_add = defintions_to_add.union(
-                    self._anonymous_func_tree[item])
-                self._anonymous_func_tree.pop(item)
-
-        if len(defintions_to_add):
-            return self._adapt_body(list(defintions_to_add) + body)
-
-        return body
-
     def _log(self, name, items):
+        if not self._trace:
+            return
+
         try:
             self._logger.debug(
                 f"calling -> '{name}' -> type(items) = {type(items)}; len(items) = {len(items)}")
@@ -358,6 +308,9 @@ class CodeTransformeJs(Transformer):
                 f"calling -> '{name}' -> type(items) = {type(items)}")
 
     def _log_extracted(self, name, **args):
+        if not self._trace:
+            return
+
         try:
             self._logger.debug(f"calling -> '{name}' -> args = {dict(**args)}")
         except:
@@ -369,7 +322,7 @@ class CodeTransformeJs(Transformer):
         body = self.body(items)
         # We dont want to add our custom class.
         # body.insert(0, define_dotted_dict("ast"))
-        return _ast.Module(body=body)
+        return hoist_functions(_ast.Module(body=body), self._ids_to_anonymous_func)
 
     def return_statement(self, items):
         i = items[0]
@@ -398,6 +351,8 @@ class CodeTransformeJs(Transformer):
             names = [_ast.alias(name=module.value, asname=None)]
         else:
             names = [_ast.alias(name=module.value, asname=identifier)]
+        # The namespace might be used as a whole.
+        self.imports.setdefault(module.value, []).append(STAR)
         self._log_extracted("import_stmt_as",
                             identifier=identifier, module=module)
         return _ast.Import(names=names)
@@ -408,6 +363,9 @@ class CodeTransformeJs(Transformer):
         (import_names, _, __) = items
         self._log_extracted("import_stmt_from", import_names=import_names)
 
+        # The module-path below loses the specifier (e.g. "../x" -> "...x").
+        self.imports.setdefault(_.value, []).extend(alias.name for alias in import_names)
+
         # TODO: determine the level properly
         return _ast.ImportFrom(module=_.value.replace('/', '.'), names=import_names, level=0)
 
@@ -881,11 +839,12 @@ class CodeTransformeJs(Transformer):
         (_, __, id, value) = items
 
         self._log("declare_var", items)
-        try:
-            self._logger.debug(
-                f"declare_var: id={ast.dump(id)}; value={ast.dump(value)}")
-        except:
-            pass
+        if self._trace:
+            try:
+                self._logger.debug(
+                    f"declare_var: id={ast.dump(id)}; value={ast.dump(value)}")
+            except:
+                pass
 
         _value = self._adapt_items(value)
 
@@ -898,7 +857,7 @@ class CodeTransformeJs(Transformer):
 
     def declare_var_not_initialized(self, items):
         return _ast.Assign(
-            targets=[items[0]],
+            targets=[items[2]],
             value=_ast.Constant(value=None)
         )
 
@@ -1011,14 +970,13 @@ class CodeTransformeJs(Transformer):
         func_args = func_args if func_args is not None else _ast.arguments(
             args=[], defaults=[])
 
-        self._logger.debug(
-            f"_function: name={name}, func_args={func_args}, body={body}")
-
-        _body = self._adapt_body(body)
+        if self._trace:
+            self._logger.debug(
+                f"_function: name={name}, func_args={func_args}, body={body}")
 
         kwargs = {
             "name": name.id,
-            "body": _body,
+            "body": body,
             "args": func_args,
             "decorator_list": []
         }
@@ -1084,8 +1042,6 @@ class CodeTransformeJs(Transformer):
 
         args = _ast.arguments(**ret)
 
-        self._add_to_tree(args, ret["args"] + ret["defaults"])
-
         return args
 
     def default_func_arg(self, items):
@@ -1136,10 +1092,6 @@ class CodeTransformeJs(Transformer):
                     ret += item
                 else:
                     ret.append(item)
-        try:
-            ret = self._adapt_body(ret)
-        except:
-            pass
 
         return ret
 
@@ -1166,8 +1118,6 @@ class CodeTransformeJs(Transformer):
             keywords=[]
         )
 
-        # self._add_to_tree(ret, args)
-
         return ret
 
     def rest_call_arg(self, items):
@@ -1255,9 +1205,7 @@ class CodeTransformeJs(Transformer):
         self._logger.debug(items[1])
         return _ast.While(
             test=items[0],
-            body=self._adapt_body(
-                items[1] if type(items) == list else [items[1]]
-            ),
+            body=items[1] if type(items) == list else [items[1]],
             orelse=[]
         )
 
@@ -1272,7 +1220,7 @@ class CodeTransformeJs(Transformer):
         test = items[0]
         body = items[1]
         elifs = items[2]
-        else_body = self._adapt_body(items[3]) if items[3] is not None else []
+        else_body = items[3] if items[3] is not None else []
 
         inclused_elif = elifs is not None
 
@@ -1282,7 +1230,7 @@ class CodeTransformeJs(Transformer):
                 if idx < len(elifs) - 1:
                     return _ast.If(
                         test=_test,
-                        body=self._adapt_body(_body),
+                        body=_body,
                         orelse=[
                             _rec(idx+1)
                         ]
@@ -1292,13 +1240,13 @@ class CodeTransformeJs(Transformer):
                 # the last item
                 return _ast.If(
                     test=_test,
-                    body=self._adapt_body(_body),
+                    body=_body,
                     orelse=else_body
                 )
 
             return _ast.If(
                 test=test,
-                body=self._adapt_body(body),
+                body=body,
                 orelse=[
                     _rec(0)
                 ]
@@ -1306,7 +1254,7 @@ class CodeTransformeJs(Transformer):
 
         return _ast.If(
             test=test,
-            body=self._adapt_body(body),
+            body=body,
             orelse=else_body
         )
 
@@ -1367,9 +1315,7 @@ class CodeTransformeJs(Transformer):
 
     def switch_case(self, items):
 
-        body = self._adapt_body(
-            items[1]
-        )
+        body = items[1]
 
         if self.switch_case_to_if_else:
             return {
@@ -1387,9 +1333,7 @@ class CodeTransformeJs(Transformer):
 
     def switch_default(self, items):
 
-        body = self._adapt_body(
-            items[0]
-        )
+        body = items[0]
 
         if self.switch_case_to_if_else:
             return {
@@ -1406,10 +1350,9 @@ class CodeTransformeJs(Transformer):
 
         try_body, err_id, catch_body, finally_body = items
 
-        _try_body = self._adapt_body(try_body)
-        _catch_body = self._adapt_body(catch_body)
-        _finally_body = self._adapt_body(
-            finally_body if finally_body is not None else [])
+        _try_body = try_body
+        _catch_body = catch_body
+        _finally_body = finally_body if finally_body is not None else []
 
         ret = _ast.Try(
             body=_try_body,
@@ -1461,7 +1404,7 @@ class CodeTransformeJs(Transformer):
             args=[], defaults=[])
         args.args.insert(0, _ast.arg(arg='self', annotation=None))
 
-        return _ast.FunctionDef(name='__init__', args=args, body= self._adapt_body(body), decorator_list=[])
+        return _ast.FunctionDef(name='__init__', args=args, body=body, decorator_list=[])
 
     def getter(self, items):
         # Rule = id "(" [func_args] ")" func_body
@@ -1517,15 +1460,44 @@ class CodeTransformeJs(Transformer):
         return ret
 
 
-def transform(tree, debug, to_snake_case):
-    transformer = CodeTransformeJs(
+def get_transformer(debug, to_snake_case):
+    """ Creates the transformer. Could be provided to the lalr-parser, to
+        transform the tree during parsing.
+
+    Args:
+        debug (boolean): Flag to enable debugging
+        to_snake_case (boolean): Flag to enable converting methods and names to ids.
+
+    Returns:
+        CodeTransformeJs: The transformer.
+    """
+    return CodeTransformeJs(
         level = logging.DEBUG if debug else logging.INFO,
         to_snake_case = to_snake_case
     )
 
+
+def transform(tree, debug, to_snake_case, unparser=None):
+    transformer = get_transformer(debug, to_snake_case)
+
     program = transformer.transform(tree)
 
-    code = astor.to_source(program)
+    return to_source(program, debug, unparser)
+
+
+def to_source(program, debug, unparser=None):
+    """ Converts the transformed program (python-ast) to code.
+
+    Args:
+        program (ast.Module): The transformed program
+        debug (boolean): Flag to enable debugging
+        unparser (str, optional): The backend to generate the code (see 'unparse.BACKENDS'). Defaults to the fastest available.
+
+    Returns:
+        str: The python-code
+    """
+
+    code = unparse.to_source(program, unparser)
 
     if debug:
         print(ast.dump(program, indent=2))
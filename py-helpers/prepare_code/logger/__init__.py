@@ -1 +1 @@
-from .get_logger import get_logger
\ No newline at end of file
+from .get_logger import get_logger, start_log_listener, use_log_queue
\ No newline at end of file
@@ -1,9 +1,54 @@
 import logging
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# The Format of every log message.
+_FORMAT = '%(levelname)s - %(message)s'
+
+# The Handler used by all loggers of the process. Created once
+# (see '_get_handler'). Is replaced by a 'QueueHandler' in workers.
+_handler = None
+
+
+def _create_stream_handler():
+    # Create Console Output
+    handler = logging.StreamHandler(sys.stdout)
+    # Add the Format to the Handler
+    handler.setFormatter(logging.Formatter(_FORMAT))
+    return handler
+
+
+def _get_handler():
+    global _handler
+
+    if _handler is None:
+        _handler = _create_stream_handler()
+
+    return _handler
+
+
+def _set_handler(handler):
+    """ Replaces the handler of the process in all loggers using it.
+    """
+    global _handler
+
+    old = _handler
+    _handler = handler
+
+    if old is None:
+        return
+
+    for logger in logging.Logger.manager.loggerDict.values():
+        if isinstance(logger, logging.Logger) and old in logger.handlers:
+            logger.removeHandler(old)
+            logger.addHandler(handler)
 
 
 def get_logger(name: str, level=logging.INFO):
-    """ Creates a Logger for the Tool.
+    """ Creates a Logger for the Tool. The handler is configured once per
+        process. Calling this function multiple times (e.g. once per file),
+        only adapts the level of the logger.
 
     Args:
         name (str): Name of the logger
@@ -13,19 +58,81 @@ def get_logger(name: str, level=logging.INFO):
         a. logger
     """
     _logger = logging.getLogger(name)
-    # Define  a Logging Format
-    _format = _format = logging.Formatter(
-        '%(levelname)s - %(message)s')
-    # Create Console Output
-    _handler = logging.StreamHandler(sys.stdout)
-    # Add the Format to the Handler
-    _handler.setFormatter(_format)
-    # Set Loglevel to the Desired One.
-    _handler.setLevel(level)
+    _handler = _get_handler()
 
-    # Finally add the Handler to the Logger:
-    _logger.addHandler(_handler)
+    # Add the Handler only once to the Logger:
+    if _handler not in _logger.handlers:
+        _logger.addHandler(_handler)
 
     # Set the Log Level of the Logger.
     _logger.setLevel(level)
-    return _logger
\ No newline at end of file
+    return _logger
+
+
+# Marks the end of the records to flush (see 'LogListener.flush').
+_FLUSH = "flush"
+
+
+class _QueueHandler(QueueHandler):
+    def enqueue(self, record):
+        # A 'multiprocessing.SimpleQueue' writes the record before returning
+        # (no feeder-thread) -> the record is shipped before the result of the task.
+        self.queue.put(record)
+
+
+class LogListener(QueueListener):
+    """ Listener, which writes the records received from the workers. The
+        records are written by a thread -> use 'flush' before printing
+        something, which must follow the records of the workers.
+    """
+
+    def __init__(self, queue, *handlers):
+        super().__init__(queue, *handlers)
+        self._flushed = threading.Event()
+
+    def dequeue(self, block):
+        return self.queue.get()
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        if record == _FLUSH:
+            self._flushed.set()
+        else:
+            super().handle(record)
+
+    def flush(self):
+        """ Waits until the records, which have been shipped so far (e.g. by
+            the workers of finished tasks), are written.
+        """
+        self._flushed.clear()
+        self.queue.put(_FLUSH)
+        self._flushed.wait()
+
+
+def start_log_listener(queue) -> LogListener:
+    """ Starts a listener in the main process, which writes the records
+        received from the workers (see 'use_log_queue') to the console.
+        Must be stopped after the workers are finished.
+
+    Args:
+        queue (multiprocessing.SimpleQueue): The queue shared with the workers.
+
+    Returns:
+        LogListener: The started listener.
+    """
+    listener = LogListener(queue, _get_handler())
+    listener.start()
+    return listener
+
+
+def use_log_queue(queue):
+    """ Configures the logging of a worker. Every record is shipped to the
+        main process (see 'start_log_listener'). Should be called once in
+        the initializer of the worker.
+
+    Args:
+        queue (multiprocessing.SimpleQueue): The queue shared with the main process.
+    """
+    _set_handler(_QueueHandler(queue))
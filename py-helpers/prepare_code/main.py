@@ -1,135 +1,353 @@
 import argparse
+import logging
 import os
-import re
+import shutil
+import signal
+import sys
+import tempfile
+import time
 import multiprocessing as mp
 
-from . import get_logger, ts, js, post_process, to_snake_case
+from . import get_logger, server, to_snake_case, unparse
+from .build_cache import BuildCache
+from .cache import get_file_mode, hash_file, write_atomic
+from .discovery import create_filter, iter_files, iter_files_from
+from .imports import ImportGraph
+from .logger import start_log_listener, use_log_queue
+from .profiling import PROFILE_MODES, WorkerProfiler, merge_cpu_profiles, write_memory_profile
+from .report import PHASES, create_record, get_peak_rss, merge_reports, write_report
+from .scheduler import CostModel, get_available_cores, parse_shard, schedule, select_shard, simulate_makespan
+from .supervisor import Supervisor, memory_budget_supported
+from .symbols import SymbolTable, load_names, save_names, set_symbol_table
+from .transpiler import LANGUAGES, Conversion, ConvertOptions, Engine, convert_source
+from .tree_cache import prune_tree_cache
+
+# The main process mostly waits for the workers -> every available core is used.
+MAX_CPU = get_available_cores()
+
+func = LANGUAGES
+
+# Maximum amount of files send to a worker at once. Parsing with "earley" is expensive
+# -> every file is a task (balances the load). "lalr" is fast, so the
+# overhead of the ipc gets relevant for small files (see 'scheduler.schedule').
+DEFAULT_CHUNKSIZE = {
+    "earley": 1,
+    "lalr": 4
+}
 
-MAX_CPU = mp.cpu_count()
+# State of a worker-process. Will be filled by 'init_worker'
+_worker_state = {}
 
-if MAX_CPU <= 4:
-    MAX_CPU = 1
+def init_worker(type, parser_mode, input_path, output_path, debug, convert_snake_case, log_queue, unparser=None, build_cache=None, events=None, profile=None, tree_cache=False, symbols=None):
+    """ Initializer of the worker-process. Creates the parser and stores the
+        settings once per process, instead of once per file.
 
-else:
-    MAX_CPU = MAX_CPU - 2
+    Args:
+        type (str): the type of the files ("ts" | "js")
+        parser_mode (str): the parser to use ("earley" | "lalr"). The
+            "lalr"-parser transforms the tree during parsing.
+        input_path (str): path of the folder to readin
+        output_path (str): main path of the output
+        debug (boolean): Flag to enable debugging
+        convert_snake_case (boolean): Flag to enable converting methods and names to ids.
+        log_queue (multiprocessing.SimpleQueue): Queue, used to ship the log-records to the main process.
+        unparser (str, optional): The backend to generate the code ("ast" | "astor"). Defaults to the fastest available.
+        build_cache (BuildCache, optional): The build-cache, to store the results in. Defaults to None.
+        events (multiprocessing.Queue, optional): Queue, used to report the start and the result of every file (see 'Supervisor'). Defaults to None.
+        profile ((str, str), optional): The mode of the profiler and the directory for its results (see 'WorkerProfiler'). Defaults to None.
+        tree_cache (boolean, optional): Reuses the persistent parse-trees (see 'tree_cache'). Defaults to False.
+        symbols (dict, optional): The python-names of the previous builds, used to seed the symbol-table (see 'symbols.load_names'). Defaults to None.
+    """
 
-func = {
-    "ts": ts,
-    "js": js
-}
+    # Ctrl+C is handled by the main process (e.g. to stop '--watch').
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
 
-def worker(opt):
-    """ Helper function, which will be called during a multiprocess. Converts the input.
+    # Forward all records to the main process.
+    use_log_queue(log_queue)
 
-    Args:
-        opt: packed options
-    """
+    logger = get_logger("nope-py-prepare", logging.DEBUG if debug else logging.INFO)
 
-    type = opt[0]
+    _worker_state.update(
+        options = ConvertOptions(type, debug, convert_snake_case, unparser),
+        engine = Engine(debug, tree_cache),
+        logger = logger,
+        input_path = input_path,
+        output_path = output_path,
+        build_cache = build_cache,
+        events = events,
+        profiler = WorkerProfiler(*profile) if profile is not None else None
+    )
 
-    return parse(func[type].get_parser(), *opt)
+    if symbols:
+        # The identifiers of the project are converted once.
+        set_symbol_table(SymbolTable(symbols))
 
-def parse(parser, type, logger, input_path, output_path, name, path_to_file, dir_path, debug, convert_snake_case):
-    """ Function to generate the python-code
+    # Create the parser once.
+    get_worker_parser(parser_mode)
+
+def get_worker_parser(parser_mode):
+    """ Returns the parser of the worker for the given mode. Created on the first usage.
 
     Args:
-        parser: The Parser to use (js/ts)
-        logger (logging.logger): The Logger
-        input_path (str): path of the folder to readin
-        output_path (str): main path of the output
-        name (str): name of the file
-        path_to_file (str): path to the file
-        dir_path (str): directory of the file
-        debug (boolean): Flag to enable debugging
-        convert_snake_case (boolean): Flag to enable converting methods and names to ids.
+        parser_mode (str): the parser to use ("earley" | "lalr")
+
+    Returns:
+        (lark.Lark, Transformer | None): The parser and its inline transformer ("lalr").
+    """
+    options = _worker_state["options"]
+    return _worker_state["engine"].get_parser(options.type, parser_mode, options.convert_snake_case)
+
+def worker(task):
+    """ Helper function, which will be called during a multiprocess. Converts the input
+        and writes the PY-File (and the entry of the build-cache). Only the status
+        is returned, not the code. Requires the process to be initialized with 'init_worker'.
+        The start and the result are reported using the events (see 'Supervisor').
+
+    Args:
+        task (str, str | None, str): path to the file to convert, its key in the build-cache (None, if disabled) and the parser-mode.
 
     Returns:
         (
+            str,                # path to the file
+            str | None,         # key in the build-cache
+            str | False,        # path of the PY-File or False in the case of an error
             (
-                str | False,        # Directory of the PY-File, where it should be stored. False in the case of an error
-                str | False,        # Filename of the PY-File or False in the case of an error 
-                str | False         # Python-Code or False in the case of an error
-            ), (
-                err | False,        # The Error or False, if everything was fine
-                str | False         # Filepointer to the error if parsing using lark failed (clickable pointer for the editor)
-            )
+                err | False,    # The Error or False, if everything was fine
+                str | False     # Filepointer to the error
+            ),
+            dict                # metrics of the conversion
         )
-
     """
 
+    path_to_file, key, parser_mode = task
+    events = _worker_state["events"]
+
+    if events is not None:
+        events.put(("start", os.getpid(), path_to_file))
+
+    start = time.perf_counter()
+
     try:
+        done = convert_file(path_to_file, key, parser_mode, start)
+    except Exception as err:
+        # e.g. the file has been removed or the PY-File can't be written. The
+        # supervisor waits for the result -> always report it. Not cached (key = None).
+        _worker_state["logger"].error(f"Failed to convert {path_to_file}: {err}")
 
-        python_name = name.replace(".ts", ".py").replace(".js", ".py")
+        done = (path_to_file, None, False, (str(err), path_to_file), {
+            "duration": time.perf_counter() - start,
+            "parser": parser_mode,
+            "output_bytes": 0
+        })
 
-        rel_path = dir_path[len(input_path) + 1:]
+    if events is not None:
+        events.put(("done", os.getpid(), done))
 
-        if convert_snake_case:
-            python_name = to_snake_case(python_name)
-            rel_path = to_snake_case(rel_path)
+    return done
 
-        logger.debug(f"determined the following rel-path = {rel_path}")
-        
-        pytho_path_to_file = os.path.join(output_path,rel_path,python_name)
+def convert_file(path_to_file, key, parser_mode, start):
+    """ Converts the file and writes the PY-File (and the entry of the build-cache).
+        Raises, if e.g. the file has been removed or the PY-File can't be written (see 'worker').
 
-        try:
-            code = func[type].transform(
-                parser.parse(open(path_to_file, encoding="utf-8").read()),
-                debug,
-                convert_snake_case
-            )
+    Args:
+        path_to_file (str): path to the file to convert
+        key (str | None): its key in the build-cache (None, if disabled)
+        parser_mode (str): the parser to use ("earley" | "lalr")
+        start (float): The start of the task (see 'time.perf_counter')
 
-            logger.debug(f"converted {path_to_file}")
+    Returns:
+        tuple: The result (see 'worker')
+    """
+    dir_path, name = os.path.split(path_to_file)
+
+    parser, transformer = get_worker_parser(parser_mode)
+    options = _worker_state["options"]
+
+    profiler = _worker_state["profiler"]
+    if profiler is not None:
+        profiler.start()
+
+    result = parse(
+        parser,
+        path_to_file,
+        options,
+        _worker_state["logger"],
+        transformer,
+        _worker_state["engine"].get_tree_cache(options.type, parser_mode)
+    )
+
+    code = result.code
+    python_path_to_file = False
+    output = None
+    if code:
+        python_dir, python_path_to_file = get_output_path(_worker_state["input_path"], _worker_state["output_path"], name, dir_path, options.convert_snake_case)
+        _worker_state["logger"].debug(f"determined the following path = {python_path_to_file}")
+
+        write_start = time.perf_counter()
+        output = write_file(python_dir, python_path_to_file, code)
+        result.timings["write"] = time.perf_counter() - write_start
+
+    profile = None
+    if profiler is not None:
+        profile = profiler.stop(result.snapshot)
+
+    error = (False, False)
+    symbols = result.symbols
+    if result.error is not None:
+        # The symbols of a failed file are unknown.
+        error = (str(result.error), result.location)
+        symbols = None
+
+    if key is not None and _worker_state["build_cache"] is not None:
+        _worker_state["build_cache"].put(path_to_file, key, code, error, symbols)
+
+    metrics = {
+        "duration": time.perf_counter() - start,
+        "parser": parser_mode,
+        "phases": {phase: result.timings[phase] for phase in PHASES if phase in result.timings},
+        "input_bytes": os.path.getsize(path_to_file),
+        "output_bytes": len(code.encode("utf-8")) if code else 0,
+        # "new" | "updated" | "unchanged" (see 'write_file')
+        "output": output,
+        "tree_nodes": result.tree_nodes,
+        # The exported and imported names (see 'imports.get_module_symbols').
+        "symbols": symbols,
+        # The parse-tree was taken from the cache (see 'tree_cache').
+        "tree_cached": result.tree_cached,
+        "ast_nodes": result.ast_nodes,
+        # The peak of the worker (up to now).
+        "peak_rss": get_peak_rss()
+    }
 
-            code = post_process(code)
+    if profile is not None:
+        metrics["memory"] = profile
 
-            logger.info(f"processed-file: '{path_to_file}'")
+    return (path_to_file, key, python_path_to_file, error, metrics)
 
-            return (
-                (os.path.join(output_path,rel_path), pytho_path_to_file , code),
-                (False ,False)
-            )
+def worker_chunk(tasks):
+    """ Converts a chunk of files (see 'worker'). The results are reported using the events.
+
+    Args:
+        tasks (list): The tasks (see 'worker').
+
+    Returns:
+        int: The amount of converted files.
+    """
+    for task in tasks:
+        worker(task)
 
-        except Exception as err:
+    return len(tasks)
 
-            ptr_to_err = path_to_file
+def write_file(python_dir, python_path_to_file, code):
+    """ Writes the PY-File, if its content has changed. Thereby the mtime of
+        unchanged files is kept (e.g. the '.pyc'-files stay valid). The file
+        is replaced atomically.
 
-            try:
+    Args:
+        python_dir (str): The directory of the PY-File
+        python_path_to_file (str): The path of the PY-File
+        code (str): The python-code
 
-                m = re.search('(?<=line )\d+', str(err))            
-                line = int(m.group(0))
+    Returns:
+        str: "new" | "updated" | "unchanged"
+    """
+    # Same content as writing in text-mode.
+    content = code.replace("\n", os.linesep).encode("utf-8")
 
-                m = re.search('(?<=col )\d+', str(err))            
-                col = int(m.group(0))
+    try:
+        with open(python_path_to_file, "rb") as file:
+            if file.read() == content:
+                return "unchanged"
+        status = "updated"
+    except OSError:
+        os.makedirs(python_dir, exist_ok=True)
+        status = "new"
 
-                ptr_to_err = path_to_file+":"+str(line)+":"+str(col)
+    write_atomic(python_path_to_file, content, get_file_mode(python_path_to_file if status == "updated" else None))
 
-            except:
-                pass
+    return status
 
-            logger.error(f"Failed to convert {ptr_to_err}")
+def get_output_path(input_path, output_path, name, dir_path, convert_snake_case):
+    """ Determines the path of the PY-File.
 
-            if debug:
-                logger.error(err)
-            else:
-                logger.error(str(err).split("\n")[0])
+    Args:
+        input_path (str): path of the folder to readin
+        output_path (str): main path of the output
+        name (str): name of the file
+        dir_path (str): directory of the file
+        convert_snake_case (boolean): Flag to enable converting methods and names to ids.
 
-            return (
-                (False, False, False), 
-                (str(err), ptr_to_err)
-            )
+    Returns:
+        (str, str): The directory of the PY-File and the path of the PY-File.
+    """
+    python_name = name.replace(".ts", ".py").replace(".js", ".py")
+
+    rel_path = dir_path[len(input_path) + 1:]
+
+    if convert_snake_case:
+        python_name = to_snake_case(python_name)
+        rel_path = to_snake_case(rel_path)
+
+    return os.path.join(output_path, rel_path), os.path.join(output_path, rel_path, python_name)
+
+def parse(parser, path_to_file, options, logger, transformer = None, tree_cache = None) -> Conversion:
+    """ Function to generate the python-code
+
+    Args:
+        parser: The Parser to use (js/ts)
+        path_to_file (str): path to the file
+        options (ConvertOptions): The options of the conversion (type, debug, naming and unparser).
+        logger (logging.logger): The Logger
+        transformer (optional): The transformer, which is used by the parser inline ("lalr"). Defaults to None.
+        tree_cache (TreeCache, optional): The cache of the parse-trees (see 'tree_cache'). Defaults to None.
+
+    Returns:
+        Conversion: The result (see 'transpiler.Conversion'). Contains the duration of
+        reading the file too. In the case of an error, the location is a clickable
+        pointer for the editor.
+    """
+
+    try:
+        start = time.perf_counter()
+        with open(path_to_file, encoding="utf-8") as file:
+            content = file.read()
+        duration = time.perf_counter() - start
 
     except Exception as err:
         # An unknown Error has been found
         logger.error(err)
-        return (
-            (False, False,False), 
-            (str(err), False)
-        )
+
+        result = Conversion()
+        result.error = err
+        result.location = path_to_file
+        return result
+
+    result = convert_source(parser, content, options, transformer, tree_cache, path_to_file)
+    result.timings["read"] = duration
+
+    if result.error is None:
+        logger.debug(f"converted {path_to_file}")
+        logger.info(f"processed-file: '{path_to_file}'")
+    else:
+        logger.error(f"Failed to convert {result.location}")
+
+        if options.debug:
+            logger.error(result.error)
+        else:
+            logger.error(str(result.error).split("\n")[0])
+
+    return result
 
 def main():
     """ The main routine.
     """
 
+    if sys.argv[1:2] == ["merge-reports"]:
+        return merge_reports_main(sys.argv[2:])
+
+    if sys.argv[1:2] == ["serve"]:
+        return server.main(sys.argv[2:])
+
 
     parser = argparse.ArgumentParser(
         description='Tython. A tool to convert the typescript file to the given python files.')
@@ -141,128 +359,682 @@ def main():
                         help='Defines the Folder where the converted files should be stored.')
     parser.add_argument('--debug', dest='debug', action='store_true',
                         help='Shows debug related output')
-    parser.add_argument('--cores', type=int, default=MAX_CPU, dest='cores',
-                        help='The Amount of cores, which must be use')
+    parser.add_argument('--cores', type=int, default=None, dest='cores',
+                        help=f'The Amount of cores, which must be use. Defaults to the available cores ({MAX_CPU})')
     parser.add_argument('--convert_snake_case', dest='convert_snake_case', action='store_true',
                         help='Converts the names to snake-case')
+    parser.add_argument('--parser', type=str, default="earley", dest='parser',
+                        help='The parser to use. Possible Values are "earley" | "lalr". "lalr" is only supported for "js"')
+    parser.add_argument('--unparser', type=str, default=unparse.DEFAULT_BACKEND, dest='unparser',
+                        help=f'The backend to generate the python-code. Possible Values are "ast" | "astor". Defaults to "{unparse.DEFAULT_BACKEND}"')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='Disables the build-cache and the cache of the parse-trees. Every file is parsed and converted again.')
+    parser.add_argument('--chunksize', type=int, default=None, dest='chunksize',
+                        help='Maximum amount of files send to a worker at once. Defaults to 1 for "earley" and 4 for "lalr"')
+    parser.add_argument('--timeout', type=float, default=None, dest='timeout',
+                        help='The time budget per file in seconds. A worker exceeding it is killed and the file is reported as failed.')
+    parser.add_argument('--memory-limit', type=int, default=None, dest='memory_limit',
+                        help='The memory budget of a worker in MB. A worker exceeding it is killed and the file is reported as failed.')
+    parser.add_argument('--retry-parser', type=str, default=None, dest='retry_parser',
+                        help='Retries a file, which exceeded a budget, with this parser. Possible Values are "earley" | "lalr"')
+    parser.add_argument('--report', type=str, default=None, dest='report',
+                        help='Writes the durations of the phases, the sizes and the amount of nodes per file to the given path. ".csv" or json.')
+    parser.add_argument('--profile', type=str, default=None, dest='profile',
+                        help='Profiles the workers. Possible Values are "cpu" (cProfile, merged pstats-file) | "mem" (tracemalloc, peak and top allocation sites per file). Use "--no-cache" to profile all files.')
+    parser.add_argument('--profile-output', type=str, default=None, dest='profile_output',
+                        help='The path of the profile. Defaults to "profile.pstats" ("cpu") or "profile.json" ("mem").')
+    parser.add_argument('--include', type=str, nargs='+', default=None, dest='include',
+                        help='Glob-patterns (relative to the input) of the files to convert, e.g. "helpers/**/*.ts". Defaults to all files of the type.')
+    parser.add_argument('--exclude', type=str, nargs='+', default=None, dest='exclude',
+                        help='Glob-patterns of files and directories to skip. Excluded directories are not entered. Extends the defaults (tests, index-files, node_modules).')
+    parser.add_argument('--no-default-excludes', dest='no_default_excludes', action='store_true',
+                        help='Disables the default exclude-patterns.')
+    parser.add_argument('--files-from', type=str, default=None, dest='files_from',
+                        help='Converts the files listed in the manifest (one path per line, relative to the input), instead of walking the input. Use "-" for stdin.')
+    parser.add_argument('--shard', type=str, default=None, dest='shard',
+                        help='Converts only a slice of the files, e.g. "2/4" (the second of four). The partition is deterministic and balanced by size -> multiple hosts could convert the shards in parallel. Combine the reports using "merge-reports".')
+    parser.add_argument('--watch', dest='watch', action='store_true',
+                        help='Keeps running and converts the changed files (polling).')
+    parser.add_argument('--interval', type=float, default=0.5, dest='interval',
+                        help='The polling interval of "--watch" in seconds.')
 
     # Create a Logger:
     logger = get_logger("nope-py-prepare")
 
     args = parser.parse_args()
 
-    files_to_ignore ={
-        "js": lambda name: name.endswith(".js") and not (name.endswith(".spec.js") or "index" in name or "\\types\\" in name or "/types/" in name),
-        "ts": lambda name: name.endswith(".ts") and not (name.endswith(".spec.ts") or "index" in name),
-    }
-
     if not args.type in ("ts","js"):
         logger.error("Please use the correct type")
         logger.error(f"Determined type: '{args.type}'")
         return
     
+    if not args.parser in func[args.type].PARSER_MODES:
+        logger.error(f"The parser '{args.parser}' isn't supported for '{args.type}'")
+        logger.error(f"Use one of {func[args.type].PARSER_MODES}")
+        return
+
+    if args.retry_parser is not None and not args.retry_parser in func[args.type].PARSER_MODES:
+        logger.error(f"The parser '{args.retry_parser}' isn't supported for '{args.type}'")
+        logger.error(f"Use one of {func[args.type].PARSER_MODES}")
+        return
+
+    if args.profile is not None and not args.profile in PROFILE_MODES:
+        logger.error(f"The profile-mode '{args.profile}' isn't supported")
+        logger.error(f"Use one of {PROFILE_MODES}")
+        return
+
+    shard = None
+    if args.shard is not None:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as err:
+            logger.error(str(err))
+            return
+
+        if args.watch:
+            logger.error("'--shard' isn't supported with '--watch'")
+            return
+
+    if args.watch and args.files_from == "-":
+        logger.error("'--watch' requires a manifest-file ('--files-from -' reads stdin only once)")
+        return
+
+    if not args.unparser in unparse.BACKENDS:
+        logger.error(f"The unparser '{args.unparser}' isn't supported")
+        logger.error(f"Use one of {tuple(unparse.BACKENDS)}")
+        return
+
     logger.warn(f"Working wiht '{args.type}' file-ending.")
 
     # Define the Input Path
     input_path = os.path.join(os.getcwd(), args.inputFolder)
-    typescript_files = []
 
     logger.info(f"Checking dir: '{input_path}'")
 
+    if not os.path.exists(input_path):
+        raise Exception("Failed to load the file")
+
+    # Define the Destination
+    output_path = os.path.join(os.getcwd(), args.outputFolder)
 
-    if os.path.isdir(input_path):
+    cores_to_use = max(1, args.cores or MAX_CPU)
 
-        # Get all relevant Files.
-        for dir_path, directories, files in os.walk(input_path):
-            for file_name in files:
-                # Generate the Path of files.
-                path_to_file = os.path.join(dir_path, file_name)
+    if cores_to_use > MAX_CPU:
+        logger.warning(f"Using {cores_to_use} cores, but only {MAX_CPU} are available.")
 
-                if files_to_ignore[args.type](path_to_file):
-                    
-                    # Show a log message
-                    logger.debug(f"Found file: '{file_name}' at '{dir_path}'")
+    # The patterns are compiled once (and reused by '--watch').
+    file_filter = create_filter(args.type, args.include, args.exclude, not args.no_default_excludes)
 
-                    # Add the file-name, path to the file and the dir path
-                    typescript_files.append((file_name, path_to_file, dir_path))
+    def find_files():
+        if args.files_from is not None:
+            files = iter_files_from(args.files_from, input_path, file_filter, logger)
+        else:
+            files = iter_files(input_path, file_filter, logger)
+
+        if shard is not None:
+            # The partition requires all files.
+            files = list(files)
+            selected = select_shard(files, input_path, *shard)
+            logger.info(f"Shard {args.shard}: converting {len(selected)} of {len(files)} files.")
+            return selected
+
+        return files
+
+    build_cache = None
+    import_graph = None
+    if not args.no_cache:
+        # All options, which influence the generated code.
+        build_cache = BuildCache(input_path, output_path, {
+            "type": args.type,
+            "parser": args.parser,
+            "convert_snake_case": args.convert_snake_case,
+            "unparser": args.unparser
+        }, args.shard)
+        # Converts the importers of changed exports again.
+        import_graph = ImportGraph(build_cache.project)
+
+    memory_limit = None
+    if args.memory_limit is not None:
+        if memory_budget_supported():
+            memory_limit = args.memory_limit * 2 ** 20
+        else:
+            logger.warning("The memory budget isn't supported on this system. Ignoring '--memory-limit'")
+
+    # The workers report the start and the result of every file. The supervisor
+    # enforces the budgets.
+    events = mp.Queue()
+    supervisor = Supervisor(events, args.timeout, memory_limit, args.retry_parser, logger)
+
+    profile = None
+    profile_output = args.profile_output
+    if args.profile is not None:
+        # The workers store their cpu-profiles in this directory.
+        profile = (args.profile, tempfile.mkdtemp(prefix="nope-py-profile-"))
+        if profile_output is None:
+            profile_output = "profile.pstats" if args.profile == "cpu" else "profile.json"
+
+    pool = None
+    listener = None
+
+    def get_pool():
+        # The pool is created on demand (not required, if every file is cached)
+        # and kept alive afterwards -> the parsers of the workers stay warm.
+        nonlocal pool, listener
+
+        if pool is None:
+            # Compile the grammar only once (if not cached yet), the workers will
+            # afterwards load the compiled grammar.
+            func[args.type].prepare_parser(args.parser)
+            if args.retry_parser is not None:
+                func[args.type].prepare_parser(args.retry_parser)
+
+            # The workers ship their log-records to the main process.
+            log_queue = mp.SimpleQueue()
+            listener = start_log_listener(log_queue)
+
+            # Create Pool. Every process creates its parser once.
+            pool = mp.Pool(
+                cores_to_use,
+                initializer=init_worker,
+                initargs=(
+                    args.type,
+                    args.parser,
+                    input_path,     # The Input Folder
+                    output_path,    # The Output Path
+                    args.debug,
+                    args.convert_snake_case,
+                    log_queue,
+                    args.unparser,
+                    build_cache,    # The workers store their results.
+                    events,
+                    profile,
+                    not args.no_cache,  # Reuse the parse-trees (independent of the options).
+                    # The python-names of the previous builds (with the same tool).
+                    load_names(build_cache.toolchain) if build_cache is not None and args.convert_snake_case else None
+                )
+            )
 
-    elif os.path.isfile(input_path):
-        # Generate the Path of files.
-        path_to_file = input_path
+        return pool
 
-        if files_to_ignore[args.type](path_to_file):
+    chunksize = args.chunksize or DEFAULT_CHUNKSIZE[args.parser]
 
-            dir_path = os.path.dirname(path_to_file)
-            file_name = path_to_file[len(dir_path) + 1 :]
-            
-            # Show a log message
-            logger.debug(f"Found file: '{file_name}' at '{dir_path}'")
+    # Uses the durations of the previous runs, to convert the expensive files first.
+    cost_model = CostModel(input_path, {
+        "type": args.type,
+        "parser": args.parser
+    })
 
-            # Add the file-name, path to the file and the dir path
-            typescript_files.append((file_name, path_to_file, dir_path))
+    def convert(typescript_files, complete=True, removed=()):
+        success, failed, metrics = convert_files(typescript_files, args.parser, input_path, output_path, args.convert_snake_case, build_cache, cost_model, get_pool, supervisor, cores_to_use, chunksize, logger, import_graph, complete, removed)
 
-    else:
-        raise Exception("Failed to load the file")
+        if listener is not None:
+            # The records of the workers are written by a thread -> write them
+            # before the summary (and before 'Watching ...').
+            listener.flush()
 
-    typescript_files = sorted(typescript_files,key=lambda item: item[1])
+        if not args.no_cache:
+            # The parse-trees are shared by all projects -> limit the size.
+            prune_tree_cache()
 
-    # Define the Destination
-    output_path = os.path.join(os.getcwd(), args.outputFolder)
+            if args.convert_snake_case:
+                # Seeds the workers of the next builds.
+                save_names(build_cache.toolchain, import_graph.get_names())
 
-    cores_to_use = max(1, min(MAX_CPU, args.cores))
+        if args.report is not None:
+            # Contains the files of the last run (in '--watch' the changed ones).
+            write_report(args.report, metrics["records"], metrics, args.shard)
+            logger.info(f"Stored the report in '{args.report}'")
 
-    logger.info(f"Founf {len(typescript_files)} files. Starting multiprocess with {cores_to_use} cores.")
+        if args.profile == "cpu":
+            merge_cpu_profiles(profile[1], profile_output, logger)
+        elif args.profile == "mem":
+            write_memory_profile(metrics["profiles"], profile_output, logger)
 
-    # Create Pool.
-    pool = mp.Pool(cores_to_use)
-    results = pool.map(worker, [
-        (
-            args.type,
-            logger,         # The Logger
-            input_path,     # The Input Folder
-            output_path,    # The Output Path
-            file_name,      # Name of the File
-            path_to_file,   # Path to the File
-            dir_path,        # Path of the Directory.
-            args.debug,
-            args.convert_snake_case
-        ) for file_name, path_to_file, dir_path in typescript_files
-    ])
-    # Close the Pool
-    pool.close()
-    # Wait to finish all.
-    pool.join()
+        return success, failed, metrics
+
+    try:
+        logger.info(f"Converting the files using {cores_to_use} cores.")
+
+        # A shard or a list of files isn't the whole project -> no file has been removed.
+        print_summary(*convert(find_files(), args.shard is None and args.files_from is None), logger)
 
+        if args.watch:
+            watch(find_files, args.interval, input_path, convert, get_pool, logger)
+
+    finally:
+        if pool is not None:
+            if supervisor.killed_workers:
+                # The tasks of the killed workers never finish.
+                pool.terminate()
+            else:
+                # Close the Pool
+                pool.close()
+            # Wait to finish all.
+            pool.join()
+            # All records has been received.
+            listener.stop()
+
+        if profile is not None:
+            shutil.rmtree(profile[1], ignore_errors=True)
+
+
+def convert_files(typescript_files, parser_mode, input_path, output_path, convert_snake_case, build_cache, cost_model, get_pool, supervisor, cores, chunksize, logger, import_graph=None, complete=True, removed=()):
+    """ Converts the files. The workers write the PY-Files on their own, thereby
+        no code is kept in the main process. The results of unchanged files are
+        taken from the build-cache (one at a time), unless they import an exported
+        name, which has been changed (see 'ImportGraph'). The remaining files are
+        converted longest-first (see 'scheduler.schedule').
+
+    Args:
+        typescript_files (iterable): The files to convert (see 'discovery.iter_files')
+        parser_mode (str): the parser to use ("earley" | "lalr")
+        input_path (str): path of the folder to readin
+        output_path (str): main path of the output
+        convert_snake_case (boolean): Flag to enable converting methods and names to ids.
+        build_cache (BuildCache | None): The build-cache. None, if disabled.
+        cost_model (CostModel): Estimates the duration of the files.
+        get_pool (callable): Returns the (initialized) pool of workers.
+        supervisor (Supervisor): Runs the files and enforces the budgets.
+        cores (int): The amount of workers.
+        chunksize (int): Maximum amount of files send to a worker at once.
+        logger (logging.logger): The Logger
+        import_graph (ImportGraph, optional): The import-graph of the previous build. Requires the build-cache. Defaults to None.
+        complete (boolean, optional): The files are all files of the project -> files missing in the import-graph have been removed and the unused entries of the build-cache are evicted. Defaults to True.
+        removed (iterable, optional): paths to the files, which have been removed (e.g. '--watch'). Their PY-Files are
+            deleted, they are removed from the build-cache and the import-graph (their importers are converted again). Defaults to ().
+
+    Returns:
+        (list, list, dict): The created PY-Files, the failed files (file and error) and the metrics
+        (incl. a record per file, see 'report.create_record').
+    """
     success = []
     failed = []
-    for (path, py_file_name,content),(err, org_file_name) in results:
-        if py_file_name and content:
-            success.append(py_file_name)
+    records = []
+    metrics = {
+        "files": 0,
+        "cached": 0,
+        # Files, whose parse-tree was reused (see 'tree_cache').
+        "tree_cached": 0,
+        # Unchanged files, which import a changed name (see 'ImportGraph').
+        "dependents": 0,
+        # Files without code (no PY-File is written).
+        "empty": 0,
+        "duration": 0.0,
+        "records": records,
+        # The written PY-Files (see 'write_file').
+        "outputs": {"new": 0, "updated": 0, "unchanged": 0},
+        # The memory-profiles of the files ('--profile mem').
+        "profiles": {}
+    }
 
-            
-            os.makedirs(path, exist_ok=True)
-            with open(py_file_name, "w") as file:
-                file.write(content)
+    wall_start = time.perf_counter()
 
+    def get_rel_path(path_to_file):
+        return os.path.relpath(path_to_file, input_path).replace(os.sep, "/")
+
+    def get_size(path_to_file):
+        # The file might be removed in the meantime (e.g. '--watch').
+        try:
+            return os.path.getsize(path_to_file)
+        except OSError:
+            return 0
+
+    def use_cached(path_to_file, file_name, dir_path, cached):
+        # Unchanged -> reuse the previous result.
+        metrics["cached"] += 1
+        code, (err, ptr_to_err), _ = cached
+
+        output = None
+        if code:
+            python_dir, python_path_to_file = get_output_path(input_path, output_path, file_name, dir_path, convert_snake_case)
+            output = write_file(python_dir, python_path_to_file, code)
+            metrics["outputs"][output] += 1
+            success.append(python_path_to_file)
+        elif err:
+            failed.append((ptr_to_err, err))
         else:
-            failed.append((org_file_name, err))
+            metrics["empty"] += 1
+
+        records.append(create_record(path_to_file, "cached", {
+            "input_bytes": get_size(path_to_file),
+            "output_bytes": len(code.encode("utf-8")) if code else 0,
+            "output": output
+        }, err, ptr_to_err))
+
+    tasks = []
+    # The unchanged files, which import other files: path_to_file -> (file_name, dir_path, key).
+    # Written after the conversion (their code is read again from the build-cache), unless
+    # they import a changed name (see 'ImportGraph'). The other unchanged files are written at once.
+    pending = {}
+    found = set()
+    # The symbols of the converted files and of the cached files, which differ
+    # from the import-graph (e.g. converted by another shard, see 'ImportGraph.update').
+    changes = {}
+
+    for file_name, path_to_file, dir_path in typescript_files:
+        rel_path = get_rel_path(path_to_file)
+
+        if rel_path in found:
+            # e.g. listed twice -> the tasks are identified by the path (see 'Supervisor').
+            continue
+
+        metrics["files"] += 1
+        key = None
+        found.add(rel_path)
+
+        if build_cache is not None:
+            key = build_cache.get_key(path_to_file)
+            cached = build_cache.get(path_to_file, key)
+
+            if cached is not None:
+                # The symbols of a failed file are unknown -> the cached error is reused.
+                symbols = cached[2]
+
+                if import_graph is not None and symbols is not None:
+                    if import_graph.get_symbols(rel_path) != symbols:
+                        changes[rel_path] = symbols
+
+                    if symbols["imports"]:
+                        pending[path_to_file] = (file_name, dir_path, key)
+                        continue
+
+                use_cached(path_to_file, file_name, dir_path, cached)
+                continue
+
+        tasks.append((path_to_file, key, parser_mode))
+
+    for path_to_file in removed:
+        dir_path, file_name = os.path.split(path_to_file)
+        python_dir, python_path_to_file = get_output_path(input_path, output_path, file_name, dir_path, convert_snake_case)
+
+        try:
+            os.remove(python_path_to_file)
+            logger.info(f"Removed the PY-File '{python_path_to_file}'")
+        except OSError:
+            # The file failed or contained no code.
+            pass
+
+        if build_cache is not None:
+            build_cache.remove(path_to_file)
+
+        if import_graph is not None:
+            changes[get_rel_path(path_to_file)] = None
+
+    if import_graph is not None and complete:
+        # The files of the previous build, which have been removed (or excluded).
+        for rel_path in import_graph.files():
+            if rel_path not in found:
+                changes[rel_path] = None
+
+    durations = {}
+    makespan = {"path_order": 0.0, "scheduled": 0.0}
+
+    def add_dependents():
+        # The importers of the changed exported names.
+        queued = {task[0] for task in tasks}
+
+        for rel_path in import_graph.update(changes):
+            path_to_file = os.path.join(input_path, *rel_path.split("/"))
+
+            if path_to_file in durations or path_to_file in queued or not os.path.isfile(path_to_file):
+                continue
+
+            hit = pending.pop(path_to_file, None)
+
+            if hit is not None:
+                key = hit[2]
+            else:
+                # Not part of this run (e.g. '--watch').
+                metrics["files"] += 1
+                key = build_cache.get_key(path_to_file)
+
+            tasks.append((path_to_file, key, parser_mode))
+            metrics["dependents"] += 1
+
+        changes.clear()
+
+    if import_graph is not None and changes:
+        add_dependents()
+
+    # The changed files are converted first, afterwards their importers (if required).
+    while tasks:
+        sizes = {path_to_file: get_size(path_to_file) for path_to_file, key, _ in tasks}
+        chunks = schedule(
+            tasks,
+            [cost_model.estimate(path_to_file, sizes[path_to_file]) for path_to_file, key, _ in tasks],
+            cores,
+            chunksize
+        )
+
+        round_durations = {}
+
+        # The pool is only required, if a file has to be converted.
+        for path_to_file, key, python_path_to_file, (err, ptr_to_err), file_metrics in supervisor.run(get_pool(), worker_chunk, chunks):
+            round_durations[path_to_file] = file_metrics["duration"]
+            cost_model.record(path_to_file, sizes[path_to_file], file_metrics["duration"])
+
+            # The key is None, if the file exceeded a budget (see 'Supervisor').
+            if build_cache is not None and key is not None:
+                build_cache.use(path_to_file, key)
+
+            if file_metrics.get("tree_cached", False):
+                metrics["tree_cached"] += 1
+
+            # The symbols of a failed file are unknown -> the previous ones are kept.
+            if import_graph is not None and file_metrics.get("symbols", None) is not None:
+                changes[get_rel_path(path_to_file)] = file_metrics["symbols"]
+
+            if python_path_to_file:
+                metrics["outputs"][file_metrics["output"]] += 1
+                success.append(python_path_to_file)
+            elif err:
+                failed.append((ptr_to_err, err))
+            else:
+                # The file contains no code (e.g. only comments) -> no PY-File.
+                metrics["empty"] += 1
+
+            status = "converted" if python_path_to_file else ("failed" if err else "empty")
+            records.append(create_record(path_to_file, status, file_metrics, err, ptr_to_err))
+
+            if "memory" in file_metrics:
+                metrics["profiles"][path_to_file] = file_metrics["memory"]
+
+        durations.update(round_durations)
+
+        # Compare the schedule with the former order (sorted by path).
+        makespan["path_order"] += simulate_makespan([round_durations[path_to_file] for path_to_file in sorted(round_durations)], cores)
+        makespan["scheduled"] += simulate_makespan([round_durations[path_to_file] for chunk in chunks for path_to_file, key, _ in chunk], cores)
+
+        tasks = []
+
+        if import_graph is not None and changes:
+            add_dependents()
+
+    if import_graph is not None:
+        converted = sorted(get_rel_path(path_to_file) for path_to_file in durations)
+
+        for rel_path in converted:
+            for target, name in import_graph.get_missing(rel_path):
+                logger.warning(f"'{rel_path}' imports '{name}' of '{target}', which isn't exported (anymore).")
+
+        # Different identifiers with the same python-name ('--convert_snake_case').
+        for python_name, identifiers in import_graph.get_collisions(converted).items():
+            used = ", ".join(f"'{name}' ({', '.join(files)})" for name, files in identifiers.items())
+            logger.warning(f"The python-name '{python_name}' is used for multiple identifiers: {used}")
+
+        import_graph.save()
+
+    for path_to_file, (file_name, dir_path, key) in pending.items():
+        cached = build_cache.get(path_to_file, key)
+
+        if cached is None:
+            # Evicted in the meantime (e.g. by a concurrent build) -> converted by the next build.
+            failed.append((path_to_file, "The cached result has been removed during the build."))
+            continue
+
+        use_cached(path_to_file, file_name, dir_path, cached)
+
+    if durations:
+        cost_model.save()
+
+        metrics["duration"] = sum(durations.values())
+        metrics["makespan"] = makespan
+
+    if build_cache is not None:
+        logger.info(f"Reused the results of {metrics['cached']} unchanged files of the build-cache.")
+        if metrics["dependents"]:
+            logger.info(f"Converted {metrics['dependents']} importers of changed exports again.")
+        if metrics["tree_cached"]:
+            logger.info(f"Reused the parse-trees of {metrics['tree_cached']} files (unchanged sources).")
+        # Evicts the stale entries.
+        build_cache.save(complete)
+
+    metrics["wall_time"] = time.perf_counter() - wall_start
+
+    return success, failed, metrics
+
+
+def print_summary(success, failed, metrics, logger):
+    """ Prints a summary of the conversion.
+
+    Args:
+        success (list): The created PY-Files
+        failed (list): The failed files and their errors
+        metrics (dict): The metrics (see 'convert_files')
+        logger (logging.logger): The Logger
+    """
 
     if len(success):
         print("\n"*2)
         print(f"Created the following files ({len(success)}):")
-        for file_name in success:
+        for file_name in sorted(success):
             print("\t- ", file_name)
-    
+
     if len(failed):
         logger.warn(f"The following files failed ({len(failed)}):")
-        for (idx, (file_name, err)) in enumerate(failed):
+        for (idx, (file_name, err)) in enumerate(sorted(failed, key=lambda item: str(item[0]))):
             print("\t", idx+1, ".\t", file_name)
             print("\t\t\t->",str(err).split("\n")[0])
 
-   
-
     print("\n"*2)
-    logger.info(f"Parsed {len(success)} of {len(typescript_files)} files ({(len(success)/len(typescript_files))*100:.2f} %).")
+    outputs = metrics["outputs"]
+    logger.info(f"Output: {outputs['new']} new, {outputs['updated']} updated, {outputs['unchanged']} unchanged files.")
+    logger.info(f"Parsed {len(success)} of {metrics['files']} files ({(len(success)/max(1, metrics['files']))*100:.2f} %). Converting took {metrics['duration']:.2f} s (sum of the workers).")
+
+    if metrics["empty"]:
+        logger.info(f"{metrics['empty']} files contain no code. No PY-Files have been written for them.")
+
+    if "makespan" in metrics:
+        makespan = metrics["makespan"]
+        logger.info(
+            f"Makespan (simulated with the measured durations): {makespan['scheduled']:.2f} s longest-first "
+            f"vs. {makespan['path_order']:.2f} s in path-order "
+            f"({(1 - makespan['scheduled'] / max(makespan['path_order'], 1e-9)) * 100:.1f} % less)."
+        )
+
+
+def merge_reports_main(argv):
+    """ The sub-command 'merge-reports'. Combines the reports of multiple runs
+        (e.g. the shards of a build) into one summary and failure-list.
+
+    Args:
+        argv (list): The command-line arguments (without "merge-reports").
+    """
+    parser = argparse.ArgumentParser(
+        prog='nope-py-prepare-code merge-reports',
+        description='Merges the json-reports ("--report") of multiple runs, e.g. of the shards ("--shard").')
+    parser.add_argument('reports', type=str, nargs='+',
+                        help='The json-reports to merge.')
+    parser.add_argument('--output', type=str, default=None, dest='output',
+                        help='Writes the merged report to the given path. ".csv" or json.')
+
+    args = parser.parse_args(argv)
+
+    logger = get_logger("nope-py-prepare")
+
+    try:
+        merge_reports(args.reports, args.output, logger)
+    except (OSError, ValueError, KeyError) as err:
+        logger.error(f"Failed to merge the reports: {err}")
+        sys.exit(1)
+
+    if args.output is not None:
+        logger.info(f"Stored the merged report in '{args.output}'")
+
+
+def watch(find_files, interval, input_path, convert, get_pool, logger):
+    """ Watches the input and converts the changed files (until interrupted). The
+        files are polled (mtime and size, the content is hashed only if
+        those have changed) -> no os-specific watcher is required. The pool
+        of workers is reused, thereby only the changed files are parsed. The
+        PY-Files of removed files are deleted (see 'convert_files').
+
+    Args:
+        find_files (callable): Returns the files to convert (see 'discovery.iter_files').
+        interval (float): The polling interval in seconds.
+        input_path (str): path of the folder to readin
+        convert (callable): Converts the given files (see 'convert_files').
+        get_pool (callable): Returns the (initialized) pool of workers.
+        logger (logging.logger): The Logger
+    """
+
+    def get_state(path_to_file):
+        stat = os.stat(path_to_file)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    states = {}
+    hashes = {}
+
+    for file_name, path_to_file, dir_path in find_files():
+        states[path_to_file] = get_state(path_to_file)
+        hashes[path_to_file] = hash_file(path_to_file)
+
+    # Warm up the workers -> the first change only requires parsing.
+    get_pool()
+
+    logger.info(f"Watching '{input_path}' for changes (every {interval} s). Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            time.sleep(interval)
+
+            changed = []
+            found = set()
+
+            for file_name, path_to_file, dir_path in find_files():
+                found.add(path_to_file)
+
+                try:
+                    state = get_state(path_to_file)
+                    if states.get(path_to_file) == state:
+                        continue
+
+                    content_hash = hash_file(path_to_file)
+                except OSError:
+                    # Removed in the meantime.
+                    continue
+
+                states[path_to_file] = state
+
+                if hashes.get(path_to_file) != content_hash:
+                    hashes[path_to_file] = content_hash
+                    changed.append((file_name, path_to_file, dir_path))
+
+            removed = sorted(set(states) - found)
+
+            for path_to_file in removed:
+                logger.info(f"Removed file: '{path_to_file}'")
+                states.pop(path_to_file)
+                hashes.pop(path_to_file)
+
+            if changed or removed:
+                logger.info(f"Detected {len(changed)} changed and {len(removed)} removed files.")
+
+                # Only the changed files (not the whole project) and the removed ones.
+                print_summary(*convert(changed, False, removed), logger)
+
+    except KeyboardInterrupt:
+        logger.info("Stopped watching.")
 
 
 if __name__ == "__main__":
@@ -1,37 +1,186 @@
+import re
 
-
-replacers = {
+# Names (variables, functions, classes, ...), which are replaced. Dotted
+# names are replaced, if the name starts with them (e.g. 'console.log').
+names = {
     "console.log": "print",
     "console.error": "print",
-    "Error(": "Exception(",
-    "true": "True",
-    "false": "False",
     "JSON.stringify": "json.dumps",
     "JSON.parse": "json.loads",
-    "const _this = this;": "",
+    "Array.from": "list",
+    "Error": "Exception",
+    "true": "True",
+    "false": "False",
+    "null": "None",
+    "undefined": "None",
     "_this": "self",
     "this": "self",
-    " Set": " set",
-    " Map": " dict",
+    "Set": "set",
+    "Map": "dict",
+}
+
+# Methods, which are replaced, if they are called (e.g. 'a.push(b)').
+methods = {
     "toLowerCase": "lower",
     "toUpperCase": "upper",
-    ".push(": ".append(",
-    ".indexOf(": ".index(",
-    "Array.from": "list",
+    "push": "append",
+    "indexOf": "index",
+    "entries": "items",
+}
+
+# String-literals, which are replaced completely (e.g. 'typeof a == "undefined"').
+literals = {
     "null": "None",
-    '"null"': "None",
-    '"undefined"': "None",
-    'undefined': "None",
-    'self = self': "",
-    "__definition_of__": "",
-    "@property()": "@property",  
-    ".entries()": ".items()",     
-    "${": "{",    
+    "undefined": "None",
+}
+
+# Decorators, which are replaced.
+decorators = {
+    "@property()": "@property",
 }
 
+# Prefix of the placeholders of functions.
+_DEFINITION_PREFIX = "__definition_of__"
+
+# Names, which are used for the instance. Assignments between them are removed
+# (e.g. 'const _this = this;').
+_SELF = "(?:_this|this|self)"
+
+# The prefixes of strings (e.g. r'\d').
+_STRING_PREFIXES = "rRbBuUfF"
+
+# Placeholders of template-strings (e.g. '${this.a}').
+_PLACEHOLDER = re.compile(r"\$\{([^{}]*)\}")
+
+
+def _get_trie_pattern(words) -> str:
+    """ Creates a regex, which matches the words. The words are stored as a
+        trie (e.g. 'th(?:is|en)') -> at every position at most one branch per
+        char is tried, independent of the amount of words. Longer words are
+        preferred.
+    """
+    trie = {}
+
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+
+        if not branches:
+            return ""
+
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+        if "" in node:
+            # The word might end here.
+            pattern = "(?:" + pattern + ")?"
+
+        return pattern
+
+    # No word -> never matches.
+    return build(trie) if trie else "(?!)"
+
+
+def _compile_tokens():
+    """ Compiles the tokens, which are relevant for the rewriting. The regex starts
+        with a lookahead of the first chars of all tokens -> every other position
+        (e.g. inside of a name without a rule) is rejected by a single test, the
+        alternatives are not tried and python isn't called.
+    """
+    # Strings, comments, decorators and methods start with a special char.
+    special = "|".join((
+        # Strings -> only the template-placeholders are adapted. The prefix (e.g. 'r') is skipped as name.
+        r"""(?P<string>\'\'\'[\s\S]*?\'\'\'|\"\"\"[\s\S]*?\"\"\"|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")""",
+        # Comments are kept
+        r"(?P<comment>#[^\n]*)",
+        # e.g. '@property()'
+        "(?P<decorator>" + "|".join(re.escape(decorator) for decorator in decorators) + ")",
+        # Called methods (e.g. '.push(')
+        r"(?P<method>\." + _get_trie_pattern(methods) + r")(?=\()",
+        # e.g. 'self = self' -> the newline of the previous line is part of the token (see 'post_process').
+        rf"(?P<assign_self>\n[ \t]*{_SELF}[ \t]*=[ \t]*{_SELF}[ \t]*$)",
+    ))
+
+    # Names start with a char of a rule, but not inside of another name or an attribute (e.g. 'a.this').
+    words = "|".join((
+        # Names and dotted names (e.g. 'console.log')
+        r"(?P<name>" + _get_trie_pattern(names) + r""")(?![\w'"])""",
+        # e.g. '__definition_of__callback_0'
+        r"(?P<definition>" + re.escape(_DEFINITION_PREFIX) + r")(?=\w)",
+    ))
+
+    special_chars = "'\"#.\n" + "".join(decorator[0] for decorator in decorators)
+    first_chars = "".join(name[0] for name in names) + _DEFINITION_PREFIX[0]
+
+    return re.compile(
+        "(?=[" + re.escape("".join(sorted(set(special_chars + first_chars)))) + "])"
+        "(?:(?=[" + re.escape(special_chars) + "])(?:" + special + r")|(?<![\w.])(?:" + words + "))",
+        re.MULTILINE
+    )
+
+
+_TOKENS = _compile_tokens()
+
+
+def update_rules():
+    """ Compiles the rules again. Required, after 'names', 'methods' or
+        'decorators' have been changed.
+    """
+    global _TOKENS
+    _TOKENS = _compile_tokens()
+
+
+def _replace_placeholder(match):
+    # The placeholder contains code (e.g. '${this.a}' -> '{self.a}').
+    return "{" + _TOKENS.sub(_replace, match.group(1)) + "}"
+
+
+def _replace_string(match):
+    literal = match.group()
+
+    # The prefix (e.g. 'r') precedes the token.
+    if literal[1:-1] in literals and not (match.start() and match.string[match.start() - 1] in _STRING_PREFIXES):
+        return literals[literal[1:-1]]
+
+    if "${" not in literal:
+        return literal
+
+    # Template-strings
+    return _PLACEHOLDER.sub(_replace_placeholder, literal).replace("${", "{")
+
+
+def _replace_assign_self(match):
+    token = match.group()
+    # Keep the newline and the indentation only.
+    return token[:len(token) - len(token.lstrip())]
+
+
+# The replacement of every kind of token (see '_compile_tokens').
+_REPLACERS = {
+    "name": lambda match: names[match.group()],
+    "method": lambda match: "." + methods[match.group()[1:]],
+    "definition": lambda match: "",
+    "string": _replace_string,
+    "comment": lambda match: match.group(),
+    "decorator": lambda match: decorators[match.group()],
+    "assign_self": _replace_assign_self,
+}
+
+
+def _replace(match):
+    return _REPLACERS[match.lastgroup](match)
+
+
 def post_process(code: str) -> str:
-    """ Post processes the code. This results in adapting the code by replacing default 
-        elements like console.log
+    """ Post processes the code. This results in adapting the code by replacing default
+        elements like console.log. The code is scanned once. Only the names with
+        a rule are matched (see '_get_trie_pattern') -> the cost doesn't depend
+        on the amount of rules. Strings and comments are kept, except the
+        placeholders of template-strings.
 
     Args:
         code (str): The code that have to be adapted
@@ -40,7 +189,5 @@ def post_process(code: str) -> str:
         str: The adapted code
     """
 
-    for org, new in replacers.items():
-        code = code.replace(org, new)
-
-    return code
\ No newline at end of file
+    # The first line is preceded by a newline, as every other line (see 'assign_self').
+    return _TOKENS.sub(_replace, "\n" + code)[1:]
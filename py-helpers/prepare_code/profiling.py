@@ -0,0 +1,183 @@
+import cProfile
+import glob
+import io
+import json
+import linecache
+import os
+import pstats
+import tracemalloc
+
+from .cache import get_file_mode, write_atomic
+
+# The supported modes of '--profile'.
+PROFILE_MODES = ("cpu", "mem")
+
+# Amount of allocation sites stored per file (and printed in the summary).
+TOP_SITES = 10
+
+# Allocations of these files are not part of the profile.
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    linecache.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+)
+
+
+def take_snapshot():
+    """ Takes a snapshot of the traced memory, if tracing is enabled (see
+        'WorkerProfiler'). Should be called, when the memory is at its peak
+        (e.g. the parse-tree and the python-ast are alive).
+
+    Returns:
+        tracemalloc.Snapshot | None: The snapshot or None, if not tracing.
+    """
+    if not tracemalloc.is_tracing():
+        return None
+
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, file_name) for file_name in _IGNORED_FILES
+    ])
+
+
+def get_top_sites(snapshot, limit=TOP_SITES):
+    """ Determines the allocation sites with the most memory.
+
+    Args:
+        snapshot (tracemalloc.Snapshot): The snapshot
+        limit (int, optional): The amount of sites. Defaults to 'TOP_SITES'.
+
+    Returns:
+        list: The sites ({"site": "file:line", "size": bytes, "count": blocks})
+    """
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size": stat.size,
+            "count": stat.count
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+class WorkerProfiler:
+    """ Profiles the files converted by a worker (see 'main.worker').
+
+        - "cpu": Every worker runs cProfile (accumulated over its files) and
+          dumps the stats to '<directory>/<pid>.pstats' after every file. The
+          main process merges them (see 'merge_cpu_profiles').
+        - "mem": tracemalloc is enabled. The peak and the top allocation sites
+          are determined per file and returned with the metrics of the file.
+    """
+
+    def __init__(self, mode, directory):
+        """ Creates the profiler. Should be called once per worker.
+
+        Args:
+            mode (str): "cpu" | "mem"
+            directory (str): The directory, to store the profiles of the workers in ("cpu").
+        """
+        self.mode = mode
+
+        if mode == "cpu":
+            self._profile = cProfile.Profile()
+            self._file = os.path.join(directory, f"{os.getpid()}.pstats")
+        else:
+            tracemalloc.start()
+
+    def start(self):
+        """ Starts profiling a file.
+        """
+        if self.mode == "cpu":
+            self._profile.enable()
+        else:
+            # Only the allocations of this file.
+            tracemalloc.clear_traces()
+            tracemalloc.reset_peak()
+
+    def stop(self, snapshot=None):
+        """ Stops profiling a file.
+
+        Args:
+            snapshot (tracemalloc.Snapshot, optional): The snapshot at the peak (see 'take_snapshot'). Defaults to None.
+
+        Returns:
+            dict | None: The peak and the top allocation sites ("mem"), otherwise None.
+        """
+        if self.mode == "cpu":
+            self._profile.disable()
+            # The worker might be killed (see 'Supervisor') -> store the profile every time.
+            self._profile.dump_stats(self._file)
+            return None
+
+        _, peak = tracemalloc.get_traced_memory()
+
+        return {
+            "peak": peak,
+            "top": get_top_sites(snapshot) if snapshot is not None else []
+        }
+
+
+def merge_cpu_profiles(directory, output_path, logger, limit=20):
+    """ Merges the profiles of the workers into one pstats-file and
+        prints the functions with the highest internal time.
+
+    Args:
+        directory (str): The directory with the profiles of the workers.
+        output_path (str): The path of the merged profile.
+        logger (logging.logger): The Logger
+        limit (int, optional): Amount of printed functions. Defaults to 20.
+    """
+    files = sorted(glob.glob(os.path.join(directory, "*.pstats")))
+
+    if not files:
+        logger.warning("No file has been profiled (files taken from the build-cache are not profiled, use '--no-cache').")
+        return
+
+    stream = io.StringIO()
+    stats = pstats.Stats(*files, stream=stream)
+    stats.dump_stats(output_path)
+    stats.sort_stats("tottime").print_stats(limit)
+
+    print(stream.getvalue())
+    logger.info(f"Stored the merged cpu-profile of {len(files)} workers in '{output_path}'. Inspect it using 'python -m pstats {output_path}'.")
+
+
+def write_memory_profile(profiles, output_path, logger, limit=TOP_SITES):
+    """ Writes the memory-profiles of the files (json) and prints the files
+        with the highest peak and the top allocation sites (of all files).
+
+    Args:
+        profiles (dict): The profile of every file (see 'WorkerProfiler.stop').
+        output_path (str): The path of the profile.
+        logger (logging.logger): The Logger
+        limit (int, optional): Amount of printed files and sites. Defaults to 'TOP_SITES'.
+    """
+    if not profiles:
+        logger.warning("No file has been profiled (files taken from the build-cache are not profiled, use '--no-cache').")
+        return
+
+    # The sites over all files (the sum of the sizes at the peak of every file).
+    sites = {}
+    for profile in profiles.values():
+        for site in profile["top"]:
+            total = sites.setdefault(site["site"], {"site": site["site"], "size": 0, "count": 0})
+            total["size"] += site["size"]
+            total["count"] += site["count"]
+
+    top_sites = sorted(sites.values(), key=lambda site: site["size"], reverse=True)
+
+    write_atomic(output_path, json.dumps({
+        "top": top_sites,
+        "files": dict(sorted(profiles.items()))
+    }, indent=2).encode("utf-8"), get_file_mode(output_path))
+
+    print("Files with the highest peak (traced memory):")
+    for path_to_file, profile in sorted(profiles.items(), key=lambda item: item[1]["peak"], reverse=True)[:limit]:
+        print(f"\t{profile['peak'] / 2 ** 20:10.2f} MB\t{path_to_file}")
+
+    print("Top allocation sites (summed over the files):")
+    for site in top_sites[:limit]:
+        print(f"\t{site['size'] / 2 ** 20:10.2f} MB\t{site['count']:>10} blocks\t{site['site']}")
+
+    logger.info(f"Stored the memory-profile of {len(profiles)} files in '{output_path}'.")
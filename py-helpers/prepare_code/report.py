@@ -0,0 +1,234 @@
+import csv
+import io
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on windows.
+    resource = None
+
+from .cache import get_file_mode, write_atomic
+
+# The phases of a conversion (see 'main.parse' and 'main.worker').
+PHASES = ("read", "parse", "transform", "unparse", "post_process", "write")
+
+# The columns of the csv-report.
+FIELDS = (
+    "path",
+    "status",
+    "parser",
+    *PHASES,
+    "duration",
+    "input_bytes",
+    "output_bytes",
+    "tree_nodes",
+    "ast_nodes",
+    "peak_rss",
+    "output",
+    "error",
+    "location"
+)
+
+
+def get_peak_rss():
+    """ Determines the peak resident memory of the current process (the
+        maximum since the start of the process, not per file).
+
+    Returns:
+        int | None: The memory in bytes or None, if not available.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Bytes on macOS, kilobytes otherwise.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def create_record(path_to_file, status, metrics=None, error=None, location=None) -> dict:
+    """ Creates the entry of a file in the report.
+
+    Args:
+        path_to_file (str): path to the source-file
+        status (str): "converted" | "failed" | "cached" | "empty" (converted, but no code was generated)
+        metrics (dict, optional): The metrics of the worker (see 'main.worker'). Defaults to None.
+        error (str, optional): The error, if the file failed. Defaults to None.
+        location (str, optional): The pointer to the error (see 'main.parse'). Defaults to None.
+
+    Returns:
+        dict: The record (see 'FIELDS')
+    """
+    metrics = metrics or {}
+    phases = metrics.get("phases", {})
+
+    record = {
+        "path": path_to_file,
+        "status": status,
+        "parser": metrics.get("parser", None)
+    }
+
+    for phase in PHASES:
+        record[phase] = phases.get(phase, None)
+
+    for field in ("duration", "input_bytes", "output_bytes", "tree_nodes", "ast_nodes", "peak_rss", "output"):
+        record[field] = metrics.get(field, None)
+
+    record["error"] = str(error).split("\n")[0] if error else None
+    record["location"] = (location or path_to_file) if error else None
+
+    return record
+
+
+def summarize(records) -> dict:
+    """ Determines the totals of the records.
+
+    Args:
+        records (list): The records (see 'create_record')
+
+    Returns:
+        dict: The totals (amount of files per status, time per phase, bytes, ...)
+    """
+    totals = {
+        "files": len(records),
+        "converted": 0,
+        "failed": 0,
+        "cached": 0,
+        "empty": 0
+    }
+
+    for record in records:
+        totals[record["status"]] += 1
+
+    for output in ("new", "updated", "unchanged"):
+        totals[output] = sum(1 for record in records if record["output"] == output)
+
+    for field in (*PHASES, "duration", "input_bytes", "output_bytes", "tree_nodes", "ast_nodes"):
+        totals[field] = sum(record[field] or 0 for record in records)
+
+    totals["peak_rss"] = max((record["peak_rss"] or 0 for record in records), default=0)
+
+    return totals
+
+
+def write_report(path, records, metrics: dict, shard=None):
+    """ Writes the report of a run. The format is selected by the file-ending:
+        '.csv' contains one row per file and a row with the totals, otherwise
+        json is written (could be merged, see 'merge_reports').
+
+    Args:
+        path (str): path of the report
+        records (list): The records of the files (see 'create_record')
+        metrics (dict): The metrics of the run (see 'main.convert_files')
+        shard (str, optional): The shard of the run (e.g. "1/4"). Defaults to None.
+    """
+    _write(path, records, {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "shard": shard,
+        "wall_time": metrics.get("wall_time", None),
+        "makespan": metrics.get("makespan", None)
+    })
+
+
+def _write(path, records, header: dict):
+    records = sorted(records, key=lambda record: record["path"])
+    totals = summarize(records)
+
+    if str(path).lower().endswith(".csv"):
+        stream = io.StringIO()
+        writer = csv.DictWriter(stream, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+        writer.writerow(dict(totals, path="TOTAL", status=None))
+        content = stream.getvalue()
+    else:
+        content = json.dumps(dict(
+            header,
+            totals = totals,
+            files = records
+        ), indent=2)
+
+    write_atomic(path, content.encode("utf-8"), get_file_mode(path))
+
+
+def merge_reports(paths, output_path=None, logger=None) -> dict:
+    """ Merges the (json-)reports of multiple runs, e.g. of the shards of
+        a build (see '--shard'), and prints a combined summary.
+
+    Args:
+        paths (list): The paths of the reports.
+        output_path (str, optional): The path of the merged report ('.csv' or json). Defaults to None.
+        logger (logging.logger, optional): The Logger. Defaults to None.
+
+    Returns:
+        dict: The totals of the merged report (see 'summarize').
+    """
+    records = {}
+    shards = []
+
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            try:
+                report = json.load(file)
+            except ValueError:
+                raise ValueError(f"'{path}' isn't a json-report. Only json-reports could be merged")
+
+        shards.append({
+            "report": str(path),
+            "shard": report.get("shard", None),
+            "files": len(report["files"]),
+            "wall_time": report.get("wall_time", None)
+        })
+
+        for record in report["files"]:
+            if record["path"] in records and logger is not None:
+                logger.warning(f"The file '{record['path']}' is part of multiple reports. Using '{path}'")
+            records[record["path"]] = record
+
+    # Check, that all shards are present.
+    counts = {int(shard["shard"].split("/")[1]) for shard in shards if shard["shard"]}
+    indices = {int(shard["shard"].split("/")[0]) for shard in shards if shard["shard"]}
+
+    if logger is not None:
+        if len(counts) > 1:
+            logger.warning(f"The reports use different amounts of shards: {sorted(counts)}")
+        elif counts:
+            missing = set(range(1, counts.pop() + 1)) - indices
+            if missing:
+                logger.warning(f"The reports of the shards {sorted(missing)} are missing")
+
+    records = list(records.values())
+    wall_times = [shard["wall_time"] for shard in shards if shard["wall_time"] is not None]
+
+    if output_path is not None:
+        _write(output_path, records, {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "shard": None,
+            # The shards run in parallel.
+            "wall_time": max(wall_times, default=None),
+            "shards": shards
+        })
+
+    totals = summarize(records)
+
+    for shard in shards:
+        print(f"\t{shard['shard'] or '-':>8}\t{shard['files']:>6} files\t{shard['wall_time'] or 0:10.2f} s\t{shard['report']}")
+
+    failed = sorted((record for record in records if record["error"]), key=lambda record: record["location"])
+
+    if failed:
+        print(f"The following files failed ({len(failed)}):")
+        for idx, record in enumerate(failed):
+            print("\t", idx+1, ".\t", record["location"])
+            print("\t\t\t->", record["error"])
+
+    print(
+        f"Parsed {totals['files'] - len(failed)} of {totals['files']} files "
+        f"in {len(shards)} reports. Converting took {totals['duration']:.2f} s (sum of the workers), "
+        f"{max(wall_times, default=0):.2f} s (slowest report)."
+    )
+
+    return totals
@@ -0,0 +1,235 @@
+import hashlib
+import heapq
+import json
+import math
+import os
+
+from .cache import get_cache_dir, write_atomic
+
+# Seconds per byte, used if no timing has been recorded yet. Only relevant
+# for the order of files without any timing (-> their size is used).
+_DEFAULT_RATE = 1e-5
+
+# A chunk should take at most this fraction of the expected runtime of a worker.
+# Thereby the last chunks are small and the workers finish at the same time.
+_CHUNK_FRACTION = 0.25
+
+
+class CostModel:
+    """ Estimates the time to convert a file. Uses the durations of previous runs
+        (stored in the cache-dir per project) and the size of the file.
+    """
+
+    def __init__(self, input_path, options: dict):
+        """ Creates the model and loads the timings of the previous runs.
+
+        Args:
+            input_path (str): path of the folder to readin
+            options (dict): The options, which influence the duration (type, parser).
+        """
+        project = hashlib.sha256(
+            repr((os.path.abspath(input_path), sorted(options.items()))).encode("utf-8")
+        ).hexdigest()
+
+        self._file = get_cache_dir("timings").joinpath(f"{project}.json")
+
+        try:
+            with open(self._file, encoding="utf-8") as file:
+                self._timings = json.load(file)
+        except (OSError, ValueError):
+            self._timings = {}
+
+        size = sum(timing["size"] for timing in self._timings.values())
+        duration = sum(timing["duration"] for timing in self._timings.values())
+
+        self._rate = duration / size if size and duration else _DEFAULT_RATE
+
+    def estimate(self, path_to_file, size: int) -> float:
+        """ Estimates the duration to convert the file.
+
+        Args:
+            path_to_file (str): path to the file
+            size (int): The size of the file in bytes
+
+        Returns:
+            float: The expected duration in seconds.
+        """
+        timing = self._timings.get(path_to_file, None)
+
+        if timing is None:
+            return size * self._rate
+
+        if timing["size"] == size or not timing["size"]:
+            return timing["duration"]
+
+        # The file has changed -> scale the previous duration.
+        return timing["duration"] * size / timing["size"]
+
+    def record(self, path_to_file, size: int, duration: float):
+        """ Records the measured duration of a file (see 'save').
+
+        Args:
+            path_to_file (str): path to the file
+            size (int): The size of the file in bytes
+            duration (float): The duration in seconds.
+        """
+        self._timings[path_to_file] = {
+            "size": size,
+            "duration": duration
+        }
+
+    def save(self):
+        """ Stores the recorded timings for the next run.
+        """
+        write_atomic(self._file, json.dumps(self._timings, indent=2).encode("utf-8"))
+
+
+def schedule(tasks, costs, workers: int, max_chunksize: int):
+    """ Orders the tasks longest-first and groups them into chunks. Expensive
+        tasks are send alone, cheap ones are grouped (up to 'max_chunksize'),
+        as long as a chunk is small compared to the work per worker. The chunks
+        are handed out dynamically (to the next idle worker).
+
+    Args:
+        tasks (list): The tasks
+        costs (list): The estimated cost of every task.
+        workers (int): The amount of workers.
+        max_chunksize (int): The maximum amount of tasks in a chunk.
+
+    Returns:
+        list: The chunks (lists of tasks) in the order to process.
+    """
+    ordered = sorted(zip(costs, range(len(tasks))), reverse=True)
+    limit = sum(costs) / max(1, workers) * _CHUNK_FRACTION
+
+    chunks = []
+    chunk = []
+    chunk_cost = 0.0
+
+    for cost, idx in ordered:
+        if chunk and (len(chunk) >= max_chunksize or chunk_cost + cost > limit):
+            chunks.append(chunk)
+            chunk = []
+            chunk_cost = 0.0
+
+        chunk.append(tasks[idx])
+        chunk_cost += cost
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def simulate_makespan(durations, workers: int) -> float:
+    """ Determines the makespan (the time until all tasks are done), if the
+        tasks are handed out in the given order to the next idle worker.
+
+    Args:
+        durations (list): The durations of the tasks in the order of processing.
+        workers (int): The amount of workers.
+
+    Returns:
+        float: The makespan in seconds.
+    """
+    finished = [0.0] * max(1, workers)
+
+    for duration in durations:
+        heapq.heappush(finished, heapq.heappop(finished) + duration)
+
+    return max(finished)
+
+
+def get_available_cores() -> int:
+    """ Determines the amount of cores, which could be used by this process.
+        Respects the cpu-affinity (e.g. 'taskset') and the cpu-quota of
+        the cgroup (e.g. 'docker --cpus'), which are common in ci-runners.
+
+    Returns:
+        int: The amount of cores (at least 1).
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on windows and macOS.
+        cores = os.cpu_count() or 1
+
+    quota = None
+
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            value, period = file.read().split()
+            if value != "max":
+                quota = int(value) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1: the quota is -1, if not limited.
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as file:
+                value = int(file.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as file:
+                period = int(file.read())
+            if value > 0 and period > 0:
+                quota = value / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cores = min(cores, math.ceil(quota))
+
+    return max(1, cores)
+
+
+def parse_shard(value: str):
+    """ Parses the shard (e.g. "2/4" -> the second of four shards).
+
+    Args:
+        value (str): "<index>/<count>", the index starts with 1.
+
+    Returns:
+        (int, int): The index and the amount of shards.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}'. Use '<index>/<count>', e.g. '1/4'")
+
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}'. The index must be between 1 and {count}")
+
+    return index, count
+
+
+def select_shard(files, input_path, index: int, count: int):
+    """ Selects the files of the shard. All files are partitioned by their size
+        (largest first, to the shard with the least bytes). The partition only
+        depends on the paths relative to the input and the sizes -> every host
+        determines the same partition, without any coordination.
+
+    Args:
+        files (list): The files (see 'discovery.iter_files')
+        input_path (str): path of the folder to readin
+        index (int): The index of the shard (starts with 1).
+        count (int): The amount of shards.
+
+    Returns:
+        list: The files of the shard (in the given order).
+    """
+    keys = {}
+    for file_name, path_to_file, dir_path in files:
+        rel_path = os.path.relpath(path_to_file, input_path).replace(os.sep, "/")
+        keys[path_to_file] = (-os.path.getsize(path_to_file), rel_path)
+
+    # (bytes, index of the shard)
+    shards = [(0, idx) for idx in range(count)]
+    selected = set()
+
+    for path_to_file in sorted(keys, key=keys.get):
+        size, idx = heapq.heappop(shards)
+
+        if idx == index - 1:
+            selected.add(path_to_file)
+
+        heapq.heappush(shards, (size - keys[path_to_file][0], idx))
+
+    return [item for item in files if item[1] in selected]
@@ -0,0 +1,384 @@
+""" A persistent transpile-server. Keeps the parsers of the workers warm, thereby
+    the tools (e.g. the editor) don't pay the startup, the imports and loading
+    the grammar for every file.
+
+    The requests are read from stdin, one JSON-RPC 2.0 message per line. The
+    responses are written to stdout (one per line), as soon as they are
+    finished -> not necessarily in the order of the requests (use the "id").
+    The log is written to stderr.
+
+    Methods:
+        - "transpile": Converts the source-code. Params:
+            - "source" (str) or "path" (str): The code or the path of the file to convert.
+            - "type" (str, optional): "ts" | "js". Defaults to the ending of the path or '--type'.
+            - "options" (dict, optional): "parser", "convert_snake_case" and "unparser". Defaults to the options of 'serve'.
+          Result: {"code": str | None, "error": str | None, "location": str | None, "duration": float}
+        - "ping": Result: "pong"
+        - "shutdown": Finishes the pending requests and stops the server. Answered
+          after the pending requests.
+
+    Usage:
+        nope-py-prepare-code serve --type ts --parser earley
+
+        > {"jsonrpc": "2.0", "id": 1, "method": "transpile", "params": {"source": "let a = 1;"}}
+        < {"jsonrpc": "2.0", "id": 1, "result": {"code": "a = 1\\n", "error": null, "location": null, "duration": 0.002}}
+"""
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+import time
+import multiprocessing as mp
+
+from . import get_logger, unparse
+from .logger import start_log_listener, use_log_queue
+from .scheduler import get_available_cores
+from .transpiler import LANGUAGES, Engine, get_options
+
+# The error-codes of JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# State of a worker-process. Will be filled by 'init_server_worker'
+_worker_state = {}
+
+
+def init_server_worker(type, options, debug, log_queue):
+    """ Initializer of the worker-process. Creates the parser of the default
+        options -> the first request is already fast.
+
+    Args:
+        type (str): the default type of the code ("ts" | "js")
+        options (dict): the default options (see 'transpiler.get_options')
+        debug (boolean): Flag to enable debugging
+        log_queue (multiprocessing.SimpleQueue): Queue, used to ship the log-records to the main process.
+    """
+
+    # Ctrl+C is handled by the main process.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # stdout is reserved for the responses (the transformers print in debug-mode).
+    sys.stdout = sys.stderr
+
+    use_log_queue(log_queue)
+
+    _worker_state.update(
+        engine = Engine(debug),
+        logger = get_logger("nope-py-prepare", logging.DEBUG if debug else logging.INFO)
+    )
+
+    _worker_state["engine"].get_parser(type, options["parser"], options["convert_snake_case"])
+
+
+def transpile_worker(request):
+    """ Converts the code of a request. Called in the worker-process.
+
+    Args:
+        request (dict): The validated params (see 'get_request'): "source", "path", "type" and "options"
+
+    Returns:
+        dict: The result (see 'transpiler.Engine.transpile')
+    """
+    name = request["path"] or "<source>"
+    source = request["source"]
+
+    if source is None:
+        start = time.perf_counter()
+        try:
+            with open(request["path"], encoding="utf-8") as file:
+                source = file.read()
+        except (OSError, ValueError) as err:
+            return {
+                "code": None,
+                "error": str(err),
+                "location": name,
+                "duration": time.perf_counter() - start
+            }
+
+    result = _worker_state["engine"].transpile(source, request["type"], request["options"], name)
+
+    if result["error"] is not None:
+        _worker_state["logger"].debug(f"Failed to convert {result['location']}")
+
+    return result
+
+
+class RequestError(Exception):
+    """ An invalid request. Answered with the JSON-RPC error.
+    """
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def get_request(params, defaults):
+    """ Validates the params of "transpile" and adds the defaults.
+
+    Args:
+        params (dict): The params of the request.
+        defaults (dict): The defaults ("type" and "options").
+
+    Returns:
+        dict: The request for the worker (see 'transpile_worker').
+    """
+    if not isinstance(params, dict):
+        raise RequestError(INVALID_PARAMS, "The params must be an object")
+
+    source = params.get("source", None)
+    path_to_file = params.get("path", None)
+
+    if source is None and path_to_file is None:
+        raise RequestError(INVALID_PARAMS, "Either 'source' or 'path' is required")
+
+    if any(value is not None and not isinstance(value, str) for value in (source, path_to_file)):
+        raise RequestError(INVALID_PARAMS, "'source' and 'path' must be strings")
+
+    type = params.get("type", None)
+    if type is None:
+        type = path_to_file.rsplit(".", 1)[-1] if path_to_file and path_to_file.endswith((".ts", ".js")) else defaults["type"]
+
+    if not isinstance(type, str):
+        raise RequestError(INVALID_PARAMS, "'type' must be a string")
+
+    options = params.get("options", None) or {}
+    if not isinstance(options, dict):
+        raise RequestError(INVALID_PARAMS, "The options must be an object")
+
+    try:
+        options = get_options(type, dict(defaults["options"], **options))
+    except ValueError as err:
+        raise RequestError(INVALID_PARAMS, str(err))
+
+    return {
+        "source": source,
+        "path": path_to_file,
+        "type": type,
+        "options": options
+    }
+
+
+class Server:
+    """ Reads the requests (see the module) and answers them. The requests are
+        converted concurrently by a pool of workers.
+    """
+
+    def __init__(self, pool, defaults, output, logger):
+        """ Creates the server.
+
+        Args:
+            pool (multiprocessing.Pool): The (initialized) pool of workers (see 'init_server_worker').
+            defaults (dict): The defaults of the requests (see 'get_request').
+            output (io.TextIOBase): The stream to write the responses to.
+            logger (logging.logger): The Logger
+        """
+        self._pool = pool
+        self._defaults = defaults
+        self._output = output
+        self._logger = logger
+
+        # The responses are written by the threads of the pool -> one line at a time.
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._finished = threading.Condition(self._lock)
+        self._shutdown_id = None
+
+    def _respond(self, id, result=None, error=None):
+        response = {"jsonrpc": "2.0", "id": id}
+
+        if error is not None:
+            response["error"] = error
+        else:
+            response["result"] = result
+
+        line = json.dumps(response) + "\n"
+
+        with self._lock:
+            self._output.write(line)
+            self._output.flush()
+
+    def _done(self, id, result=None, error=None):
+        if id is not None:
+            self._respond(id, result, error)
+
+        with self._lock:
+            self._pending -= 1
+            self._finished.notify_all()
+
+    def handle(self, line):
+        """ Handles a line of the input. An unexpected error is answered with
+            INTERNAL_ERROR, the server keeps running.
+
+        Args:
+            line (str): The request (JSON-RPC 2.0)
+
+        Returns:
+            bool: False, if the server should stop ("shutdown").
+        """
+        try:
+            message = json.loads(line)
+        except ValueError as err:
+            self._respond(None, error={"code": PARSE_ERROR, "message": f"Parse error: {err}"})
+            return True
+
+        if not isinstance(message, dict) or not isinstance(message.get("method", None), str):
+            self._respond(None, error={"code": INVALID_REQUEST, "message": "Invalid Request"})
+            return True
+
+        # Notifications (without id) are not answered.
+        id = message.get("id", None)
+
+        try:
+            return self._dispatch(id, message)
+        except Exception as err:
+            self._logger.error(f"Failed to handle the request {id!r}: {err!r}")
+            if id is not None:
+                self._respond(id, error={"code": INTERNAL_ERROR, "message": str(err)})
+            return True
+
+    def _dispatch(self, id, message):
+        method = message["method"]
+
+        if method == "ping":
+            if id is not None:
+                self._respond(id, "pong")
+            return True
+
+        if method == "shutdown":
+            # Answered after the pending requests (see 'serve').
+            self._shutdown_id = id
+            return False
+
+        if method != "transpile":
+            if id is not None:
+                self._respond(id, error={"code": METHOD_NOT_FOUND, "message": f"Method not found: '{method}'"})
+            return True
+
+        try:
+            request = get_request(message.get("params", None), self._defaults)
+        except RequestError as err:
+            if id is not None:
+                self._respond(id, error={"code": err.code, "message": err.message})
+            return True
+
+        with self._lock:
+            self._pending += 1
+
+        try:
+            self._pool.apply_async(
+                transpile_worker,
+                (request,),
+                callback=lambda result: self._done(id, result),
+                error_callback=lambda err: self._done(id, error={"code": INTERNAL_ERROR, "message": str(err)})
+            )
+        except Exception as err:
+            self._logger.error(f"Failed to submit the request {id!r}: {err!r}")
+            self._done(id, error={"code": INTERNAL_ERROR, "message": str(err)})
+
+        return True
+
+    def serve(self, input):
+        """ Handles the requests until the input is closed or "shutdown" is received.
+            Waits for the pending requests.
+
+        Args:
+            input (io.TextIOBase): The stream to read the requests from.
+        """
+        for line in input:
+            if not line.strip():
+                continue
+
+            if not self.handle(line):
+                break
+
+        with self._lock:
+            while self._pending:
+                self._finished.wait()
+
+        if self._shutdown_id is not None:
+            self._respond(self._shutdown_id, None)
+
+
+def main(argv=None):
+    """ The sub-command 'serve'.
+
+    Args:
+        argv (list, optional): The command-line arguments (without "serve"). Defaults to 'sys.argv'.
+    """
+    parser = argparse.ArgumentParser(
+        prog='nope-py-prepare-code serve',
+        description='Converts the code of the requests (JSON-RPC 2.0, one per line) received on stdin. The responses are written to stdout.')
+    parser.add_argument('--type', type=str, default="ts", dest='type',
+                        help='The default type of the requests. Possible Values are "ts" | "js"')
+    parser.add_argument('--parser', type=str, default="earley", dest='parser',
+                        help='The default parser. Possible Values are "earley" | "lalr". "lalr" is only supported for "js"')
+    parser.add_argument('--unparser', type=str, default=unparse.DEFAULT_BACKEND, dest='unparser',
+                        help=f'The default backend to generate the python-code. Possible Values are "ast" | "astor". Defaults to "{unparse.DEFAULT_BACKEND}"')
+    parser.add_argument('--convert_snake_case', dest='convert_snake_case', action='store_true',
+                        help='Converts the names to snake-case by default')
+    parser.add_argument('--cores', type=int, default=None, dest='cores',
+                        help='The Amount of workers. Defaults to the available cores')
+    parser.add_argument('--debug', dest='debug', action='store_true',
+                        help='Shows debug related output')
+
+    args = parser.parse_args(argv)
+
+    # stdout is reserved for the responses -> the log is written to stderr.
+    output = sys.stdout
+    sys.stdout = sys.stderr
+
+    logger = get_logger("nope-py-prepare", logging.DEBUG if args.debug else logging.INFO)
+
+    try:
+        options = get_options(args.type, {
+            "parser": args.parser,
+            "convert_snake_case": args.convert_snake_case,
+            "unparser": args.unparser
+        })
+    except ValueError as err:
+        logger.error(str(err))
+        return
+
+    defaults = {
+        "type": args.type,
+        "options": options
+    }
+
+    cores = max(1, args.cores or get_available_cores())
+
+    # Compile the grammar only once (if not cached yet).
+    LANGUAGES[args.type].prepare_parser(args.parser)
+
+    log_queue = mp.SimpleQueue()
+    listener = start_log_listener(log_queue)
+
+    pool = mp.Pool(
+        cores,
+        initializer=init_server_worker,
+        initargs=(args.type, options, args.debug, log_queue)
+    )
+
+    server = Server(pool, defaults, output, logger)
+
+    logger.info(f"Serving on stdin/stdout using {cores} workers.")
+
+    try:
+        server.serve(sys.stdin)
+    except KeyboardInterrupt:
+        pool.terminate()
+    except BaseException:
+        # Joining a running pool raises -> would hide the error.
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+        listener.stop()
@@ -0,0 +1,219 @@
+import os
+import queue
+import signal
+import time
+
+# Interval to check the budgets of the running files.
+_POLL_INTERVAL = 0.1
+
+
+def get_rss(pid):
+    """ Determines the resident memory of the process. Only supported on
+        systems providing '/proc' (e.g. linux).
+
+    Args:
+        pid (int): The process id
+
+    Returns:
+        int | None: The memory in bytes or None, if not available.
+    """
+    try:
+        with open(f"/proc/{pid}/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def memory_budget_supported() -> bool:
+    """ Checks, whether the memory of the workers could be determined (see 'get_rss').
+    """
+    return get_rss(os.getpid()) is not None
+
+
+def _is_alive(pid) -> bool:
+    if os.name != "posix":
+        # 'os.kill' would terminate the process.
+        return True
+
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _kill(pid):
+    try:
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+    except OSError:
+        # Already finished.
+        pass
+
+
+class Supervisor:
+    """ Runs the chunks of files on the pool and enforces a time and memory budget
+        per file. The workers report the start and the result of every file
+        (see 'main.worker'). A worker exceeding a budget is killed, the pool
+        replaces it by a new worker. The file is reported as failed (or retried
+        with an alternate parser) and the remaining files of its chunk are
+        submitted again. These results are not stored in the build-cache
+        (their key is None). If a chunk raises in the pool, its pending
+        files are reported as failed.
+    """
+
+    def __init__(self, events, timeout=None, memory_limit=None, alternate_mode=None, logger=None):
+        """ Creates the supervisor.
+
+        Args:
+            events (multiprocessing.Queue): The queue, the workers report to.
+            timeout (float, optional): The time budget per file in seconds. Defaults to None (no limit).
+            memory_limit (int, optional): The memory budget of a worker in bytes. Defaults to None (no limit).
+            alternate_mode (str, optional): The parser-mode used to retry a file, which exceeded a budget. Defaults to None (no retry).
+            logger (logging.logger, optional): The Logger. Defaults to None.
+        """
+        self._events = events
+        self._timeout = timeout
+        self._memory_limit = memory_limit
+        self._alternate_mode = alternate_mode
+        self._logger = logger
+
+        # Amount of killed workers. If a worker has been killed, the pool contains
+        # a task, which never finishes -> the pool must be terminated instead of joined.
+        self.killed_workers = 0
+
+    def _check(self, pid, started):
+        """ Returns the reason, if the file exceeds a budget. Otherwise None.
+        """
+        if not _is_alive(pid):
+            return "Crash: the worker died"
+
+        if self._timeout is not None and time.monotonic() - started > self._timeout:
+            return f"Timeout: exceeded the time budget of {self._timeout} s"
+
+        if self._memory_limit is not None:
+            rss = get_rss(pid)
+            if rss is not None and rss > self._memory_limit:
+                return f"Memory: exceeded the memory budget of {self._memory_limit / 2 ** 20:.0f} MB ({rss / 2 ** 20:.0f} MB)"
+
+        return None
+
+    def run(self, pool, worker_chunk, chunks):
+        """ Converts the chunks.
+
+        Args:
+            pool (multiprocessing.Pool): The pool of workers.
+            worker_chunk (callable): The function to convert a chunk (see 'main.worker_chunk').
+            chunks (list): The chunks of tasks (path_to_file, key, parser_mode).
+
+        Yields:
+            The results of the files (see 'main.worker').
+        """
+        # Tasks, which have not been finished yet.
+        pending = {}
+        # The chunk of every task -> to resubmit the remaining tasks.
+        chunk_of = {}
+        # Files currently processed: pid -> (task, start)
+        running = {}
+        # The submissions, which raised in the pool: (chunks, error)
+        errors = queue.SimpleQueue()
+
+        def submit(new_chunks):
+            for chunk in new_chunks:
+                for task in chunk:
+                    pending[task[0]] = task
+                    chunk_of[task[0]] = chunk
+            # The results are received using the events.
+            pool.map_async(
+                worker_chunk, new_chunks, chunksize=1,
+                error_callback=lambda err: errors.put((new_chunks, err))
+            )
+
+        submit(chunks)
+        last_check = time.monotonic()
+
+        while pending:
+            try:
+                kind, pid, payload = self._events.get(timeout=_POLL_INTERVAL)
+
+                if kind == "start":
+                    # The task might have been failed already (see 'errors').
+                    if payload in pending:
+                        running[pid] = (pending[payload], time.monotonic())
+
+                # -> "done"
+                else:
+                    running.pop(pid, None)
+                    if pending.pop(payload[0], None) is not None:
+                        yield payload
+
+            except queue.Empty:
+                pass
+
+            while not errors.empty():
+                # A worker raised -> the pending tasks of the submission never report their result.
+                failed_chunks, err = errors.get()
+                failed_files = {task[0] for chunk in failed_chunks for task in chunk}
+
+                for pid, (task, started) in list(running.items()):
+                    if task[0] in failed_files:
+                        running.pop(pid)
+
+                for chunk in failed_chunks:
+                    for path_to_file, key, parser_mode in chunk:
+                        if pending.pop(path_to_file, None) is None:
+                            continue
+
+                        if self._logger is not None:
+                            self._logger.error(f"Error: the worker raised {err!r} (parser '{parser_mode}'): {path_to_file}")
+
+                        yield (path_to_file, None, False, (f"Error: the worker raised {err!r} (parser '{parser_mode}')", path_to_file), {
+                            "duration": 0.0,
+                            "parser": parser_mode,
+                            "output_bytes": 0
+                        })
+
+            if time.monotonic() - last_check < _POLL_INTERVAL:
+                continue
+
+            last_check = time.monotonic()
+
+            for pid, (task, started) in list(running.items()):
+                reason = self._check(pid, started)
+
+                if reason is None:
+                    continue
+
+                path_to_file, key, parser_mode = task
+
+                _kill(pid)
+                self.killed_workers += 1
+                running.pop(pid)
+                pending.pop(path_to_file)
+
+                if self._logger is not None:
+                    self._logger.error(f"{reason} (parser '{parser_mode}'): {path_to_file}. Killed the worker.")
+
+                # The remaining files of the chunk haven't been started.
+                chunk = chunk_of[path_to_file]
+                remaining = [
+                    other for other in chunk[chunk.index(task) + 1:]
+                    if other[0] in pending
+                ]
+
+                # The result depends on the budgets, which are not part of the
+                # key -> it isn't stored in the build-cache (key = None).
+                retry = []
+                if self._alternate_mode is not None and parser_mode != self._alternate_mode:
+                    retry.append((path_to_file, None, self._alternate_mode))
+
+                    if self._logger is not None:
+                        self._logger.warning(f"Retrying '{path_to_file}' with the parser '{self._alternate_mode}'")
+                else:
+                    yield (path_to_file, None, False, (f"{reason} (parser '{parser_mode}')", path_to_file), {
+                        "duration": time.monotonic() - started,
+                        "parser": parser_mode,
+                        "output_bytes": 0
+                    })
+
+                if remaining or retry:
+                    submit([chunk for chunk in (remaining, retry) if chunk])
@@ -0,0 +1,179 @@
+""" The project-wide symbol table of the python-names ('--convert_snake_case').
+    Every identifier is converted once (see 'helpers.to_snake_case') and the
+    result is memoized. The table is bounded, the least recently used names
+    are evicted.
+
+    The main process seeds the table of the workers with the names of the
+    previous builds (see 'load_names'), thereby the identifiers are converted
+    once, not once per file and worker. The stored names are keyed by the hash
+    of the tool (see 'build_cache.get_toolchain_hash') -> a changed conversion
+    doesn't reuse stale names. The names used by a file are part of its
+    symbols (see 'imports.get_module_symbols'), which allows to detect
+    collisions (e.g. 'fooBar' and 'foo_bar') across the whole project (see
+    'find_collisions').
+"""
+
+import json
+from collections import OrderedDict
+
+from .cache import get_cache_dir, write_atomic
+from .helpers import to_snake_case
+
+# Maximum amount of memoized names.
+MAX_SYMBOLS = 2 ** 16
+
+
+class SymbolTable:
+    """ The memoized python-names of the identifiers (see the module).
+    """
+
+    def __init__(self, names=None, max_size=MAX_SYMBOLS):
+        """ Creates the table.
+
+        Args:
+            names (dict, optional): The identifiers and their python-names (see 'dump'). Defaults to None.
+            max_size (int, optional): The maximum amount of names. Defaults to 'MAX_SYMBOLS'.
+        """
+        self._max_size = max(1, max_size)
+        self._names = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.add(names or {})
+
+    def __len__(self):
+        return len(self._names)
+
+    def _store(self, name, python_name):
+        self._names[name] = python_name
+
+        if len(self._names) > self._max_size:
+            self._names.popitem(last=False)
+
+    def add(self, names: dict):
+        """ Stores the given names as the most recently used ones.
+
+        Args:
+            names (dict): The identifiers and their python-names.
+        """
+        for name, python_name in names.items():
+            self._names.pop(name, None)
+            self._store(name, python_name)
+
+    def get_name(self, name: str) -> str:
+        """ Returns the python-name of the identifier (see 'helpers.to_snake_case').
+
+        Args:
+            name (str): The identifier
+
+        Returns:
+            str: The python-name
+        """
+        python_name = self._names.get(name, None)
+
+        if python_name is None:
+            self.misses += 1
+            python_name = to_snake_case(name)
+            self._store(name, python_name)
+        else:
+            self.hits += 1
+            self._names.move_to_end(name)
+
+        return python_name
+
+    def dump(self) -> dict:
+        """ Returns the names, e.g. to seed the table of the workers. The
+            most recently used names are the last ones.
+
+        Returns:
+            dict: The identifiers and their python-names.
+        """
+        return dict(self._names)
+
+
+# The table of the transformers of the process.
+_table = None
+
+
+def get_symbol_table() -> SymbolTable:
+    """ Returns the shared table of the process.
+    """
+    global _table
+
+    if _table is None:
+        _table = SymbolTable()
+
+    return _table
+
+
+def set_symbol_table(table: SymbolTable):
+    """ Replaces the shared table of the process (e.g. by the seeded table of a worker).
+
+    Args:
+        table (SymbolTable): The table
+    """
+    global _table
+    _table = table
+
+
+def _get_names_file(toolchain):
+    return get_cache_dir("builds/symbols").joinpath(f"{toolchain}.json")
+
+
+def load_names(toolchain: str) -> dict:
+    """ Loads the names stored by the previous builds with the same tool.
+
+    Args:
+        toolchain (str): The hash of the tool (see 'build_cache.get_toolchain_hash').
+
+    Returns:
+        dict: The identifiers and their python-names. Empty, if not stored yet.
+    """
+    try:
+        with open(_get_names_file(toolchain), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_names(toolchain: str, names: dict):
+    """ Adds the given names to the stored ones (bounded, see 'SymbolTable').
+        The names stored by other versions of the tool are removed.
+
+    Args:
+        toolchain (str): The hash of the tool (see 'build_cache.get_toolchain_hash').
+        names (dict): The identifiers and their python-names (e.g. see 'ImportGraph.get_names').
+    """
+    table = SymbolTable(load_names(toolchain))
+    table.add(names)
+
+    path = _get_names_file(toolchain)
+    write_atomic(path, json.dumps(table.dump()).encode("utf-8"))
+
+    for stale in path.parent.glob("*.json"):
+        if stale != path:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def find_collisions(names: dict) -> dict:
+    """ Determines the python-names, which are used for different identifiers.
+
+    Args:
+        names (dict): The identifier -> its python-name
+
+    Returns:
+        dict: The python-name -> the (sorted) identifiers. Only the collisions.
+    """
+    identifiers = {}
+
+    for name, python_name in names.items():
+        identifiers.setdefault(python_name, set()).add(name)
+
+    return {
+        python_name: sorted(names)
+        for python_name, names in sorted(identifiers.items()) if len(names) > 1
+    }
@@ -0,0 +1,385 @@
+""" The in-process API of the transpiler. Converts source-code without the
+    command-line and without the filesystem, e.g. to embed it in a build-system.
+
+    Usage:
+        from prepare_code import Engine, transpile_source, transpile_many
+
+        result = transpile_source("let a = 1;", "ts")
+        if result["error"] is None:
+            print(result["code"])
+
+        # The engine keeps its parsers -> reuse it for multiple calls.
+        engine = Engine()
+        for name, result in transpile_many(sources, "js", {"parser": "lalr"}, engine=engine):
+            ...
+
+    The results are dicts: {"code": str | None, "error": str | None, "location": str | None, "duration": float}
+"""
+
+import ast
+import re
+import time
+import multiprocessing as mp
+
+from . import js, post_process, ts, unparse
+from .imports import get_module_symbols
+from .profiling import take_snapshot
+from .tree_cache import TreeCache
+
+# The supported types of files ("--type").
+LANGUAGES = {
+    "ts": ts,
+    "js": js
+}
+
+# The options of a conversion.
+DEFAULT_OPTIONS = {
+    "parser": "earley",
+    "convert_snake_case": False,
+    "unparser": unparse.DEFAULT_BACKEND
+}
+
+
+class ConvertOptions:
+    """ The options of a conversion (see 'convert_source').
+    """
+
+    def __init__(self, type, debug=False, convert_snake_case=False, unparser=None):
+        """ Creates the options.
+
+        Args:
+            type (str): the type of the code ("ts" | "js")
+            debug (boolean, optional): Flag to enable debugging. Defaults to False.
+            convert_snake_case (boolean, optional): Flag to enable converting methods and names to ids. Defaults to False.
+            unparser (str, optional): The backend to generate the code ("ast" | "astor"). Defaults to the fastest available.
+        """
+        self.type = type
+        self.debug = debug
+        self.convert_snake_case = convert_snake_case
+        self.unparser = unparser
+
+
+class Conversion:
+    """ The result of a conversion (see 'convert_source').
+    """
+
+    def __init__(self):
+        # The python-code. None, if the conversion failed.
+        self.code = None
+        # The error of the parser or transformer and the pointer to it (see 'get_error_location').
+        self.error = None
+        self.location = None
+        # The duration of the phases (see 'report.PHASES').
+        self.timings = {}
+        self.tree_nodes = None
+        self.ast_nodes = None
+        # The parse-tree was taken from the cache (see 'tree_cache').
+        self.tree_cached = False
+        # The exported and imported names (see 'imports.get_module_symbols').
+        self.symbols = None
+        # The memory at the peak of the conversion (see 'profiling.take_snapshot').
+        self.snapshot = None
+
+
+def convert_source(parser, content, options, transformer=None, tree_cache=None, name="<source>") -> Conversion:
+    """ Converts the source-code to python-code. An error of the parser or
+        transformer is part of the result.
+
+    Args:
+        parser: The Parser to use (js/ts)
+        content (str): The source-code
+        options (ConvertOptions): The options of the conversion.
+        transformer (optional): The transformer, which is used by the parser inline ("lalr"). Defaults to None.
+        tree_cache (TreeCache, optional): The cache of the parse-trees of the parser (see 'tree_cache'). Not used with an inline transformer. Defaults to None.
+        name (str, optional): The name of the source (e.g. its path), used in the location of an error. Defaults to "<source>".
+
+    Returns:
+        Conversion: The result
+    """
+    result = Conversion()
+    timings = result.timings
+    language = LANGUAGES[options.type]
+
+    try:
+        if transformer is not None:
+            # The parser applies the transformer -> the transform is part of parsing.
+            start = time.perf_counter()
+            transformer.reset()
+            program = parser.parse(content)
+            timings["parse"] = time.perf_counter() - start
+            timings["transform"] = 0.0
+        else:
+            start = time.perf_counter()
+            tree = tree_cache.get(content) if tree_cache is not None else None
+            result.tree_cached = tree is not None
+
+            if tree is None:
+                tree = parser.parse(content)
+                if tree_cache is not None:
+                    tree_cache.put(content, tree)
+
+            timings["parse"] = time.perf_counter() - start
+            result.tree_nodes = sum(1 for _ in tree.iter_subtrees())
+
+            start = time.perf_counter()
+            transformer = language.get_transformer(options.debug, options.convert_snake_case)
+            program = transformer.transform(tree)
+            timings["transform"] = time.perf_counter() - start
+
+        result.ast_nodes = sum(1 for _ in ast.walk(program))
+
+        # The parse-tree and the program are alive -> the memory is at its peak.
+        result.snapshot = take_snapshot()
+
+        start = time.perf_counter()
+        code = language.to_source(program, options.debug, options.unparser)
+        timings["unparse"] = time.perf_counter() - start
+
+        # Generating the code normalized the program in place (see 'unparse.normalize').
+        result.symbols = get_module_symbols(program, getattr(transformer, "imports", None))
+
+        if options.convert_snake_case:
+            # The python-names of the identifiers (see 'symbols.find_collisions').
+            result.symbols["names"] = dict(getattr(transformer, "names", {}))
+
+        start = time.perf_counter()
+        result.code = post_process(code)
+        timings["post_process"] = time.perf_counter() - start
+
+    except Exception as err:
+        result.error = err
+        result.location = get_error_location(err, name)
+
+    return result
+
+
+def get_error_location(err, path_to_file) -> str:
+    """ Determines the pointer to the error (clickable in the editor), if
+        the error contains the position (e.g. the errors of lark).
+
+    Args:
+        err (Exception): The error
+        path_to_file (str): path to the file
+
+    Returns:
+        str: "path:line:col" or the path, if the position is unknown.
+    """
+    # earley: "at line 1 col 9", lalr: "at line 1, column 9."
+    line = re.search(r'\bline (\d+)', str(err))
+    col = re.search(r'\bcol(?:umn)? (\d+)', str(err))
+
+    if line is None or col is None:
+        return path_to_file
+
+    return path_to_file + ":" + line.group(1) + ":" + col.group(1)
+
+
+def get_options(type, options=None) -> dict:
+    """ Validates the options and adds the defaults (see 'DEFAULT_OPTIONS').
+        Raises a ValueError, if the type or an option isn't supported.
+
+    Args:
+        type (str): the type of the code ("ts" | "js")
+        options (dict, optional): The options ("parser", "convert_snake_case", "unparser"). Defaults to None.
+
+    Returns:
+        dict: The options
+    """
+    if not isinstance(type, str) or type not in LANGUAGES:
+        raise ValueError(f"The type '{type}' isn't supported. Use one of {tuple(LANGUAGES)}")
+
+    options = options or {}
+
+    unknown = set(options) - set(DEFAULT_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown options {sorted(unknown)}. Use {tuple(DEFAULT_OPTIONS)}")
+
+    options = dict(DEFAULT_OPTIONS, **options)
+    options["convert_snake_case"] = bool(options["convert_snake_case"])
+
+    # e.g. the options of a request (see 'server') might contain lists.
+    for name in ("parser", "unparser"):
+        if not isinstance(options[name], str):
+            raise ValueError(f"The option '{name}' must be a string")
+
+    if options["parser"] not in LANGUAGES[type].PARSER_MODES:
+        raise ValueError(f"The parser '{options['parser']}' isn't supported for '{type}'. Use one of {LANGUAGES[type].PARSER_MODES}")
+
+    if options["unparser"] not in unparse.BACKENDS:
+        raise ValueError(f"The unparser '{options['unparser']}' isn't supported. Use one of {tuple(unparse.BACKENDS)}")
+
+    return options
+
+
+class Engine:
+    """ Converts source-code. The parsers are created on the first usage and
+        kept -> reuse the engine to convert multiple sources.
+    """
+
+    def __init__(self, debug=False, tree_cache=False):
+        """ Creates the engine.
+
+        Args:
+            debug (boolean, optional): Flag to enable debugging. Defaults to False.
+            tree_cache (boolean, optional): Reuses the persistent parse-trees (see 'tree_cache'). Defaults to False.
+        """
+        self.debug = debug
+        self._parsers = {}
+        self._use_tree_cache = tree_cache
+        self._tree_caches = {}
+
+    def get_parser(self, type, parser_mode, convert_snake_case=False):
+        """ Returns the parser for the options. Created on the first usage.
+
+        Args:
+            type (str): the type of the code ("ts" | "js")
+            parser_mode (str): the parser to use ("earley" | "lalr")
+            convert_snake_case (boolean, optional): Flag to enable converting methods and names to ids. Defaults to False.
+
+        Returns:
+            (lark.Lark, Transformer | None): The parser and its inline transformer ("lalr").
+        """
+        # The inline transformer depends on the naming.
+        key = (type, parser_mode, convert_snake_case if parser_mode == "lalr" else None)
+
+        if key not in self._parsers:
+            transformer = None
+
+            if parser_mode == "lalr":
+                # Transform inline -> the parse-tree is never build.
+                transformer = LANGUAGES[type].get_transformer(self.debug, convert_snake_case)
+
+            self._parsers[key] = (LANGUAGES[type].get_parser(parser_mode, transformer), transformer)
+
+        return self._parsers[key]
+
+    def get_tree_cache(self, type, parser_mode):
+        """ Returns the cache of the parse-trees of the parser.
+
+        Args:
+            type (str): the type of the code ("ts" | "js")
+            parser_mode (str): the parser to use ("earley" | "lalr")
+
+        Returns:
+            TreeCache | None: The cache or None, if disabled or the parser doesn't build a tree ("lalr").
+        """
+        if not self._use_tree_cache or parser_mode == "lalr":
+            return None
+
+        key = (type, parser_mode)
+
+        if key not in self._tree_caches:
+            self._tree_caches[key] = TreeCache(LANGUAGES[type].get_grammar_hash(parser_mode))
+
+        return self._tree_caches[key]
+
+    def transpile(self, source, type="ts", options=None, name="<source>") -> dict:
+        """ Converts the source-code. Errors of the conversion are part of the
+            result, invalid options raise a ValueError (see 'get_options').
+
+        Args:
+            source (str): The source-code
+            type (str, optional): the type of the code ("ts" | "js"). Defaults to "ts".
+            options (dict, optional): The options (see 'DEFAULT_OPTIONS'). Defaults to None.
+            name (str, optional): The name of the source, used in the location of an error. Defaults to "<source>".
+
+        Returns:
+            dict: The result ("code", "error", "location", "duration")
+        """
+        options = get_options(type, options)
+        start = time.perf_counter()
+
+        try:
+            parser, transformer = self.get_parser(type, options["parser"], options["convert_snake_case"])
+        except Exception as err:
+            return {
+                "code": None,
+                "error": str(err).split("\n")[0],
+                "location": name,
+                "duration": time.perf_counter() - start
+            }
+
+        result = convert_source(
+            parser,
+            source,
+            ConvertOptions(type, self.debug, options["convert_snake_case"], options["unparser"]),
+            transformer,
+            self.get_tree_cache(type, options["parser"]),
+            name
+        )
+
+        return {
+            "code": result.code,
+            "error": str(result.error).split("\n")[0] if result.error is not None else None,
+            "location": result.location,
+            "duration": time.perf_counter() - start
+        }
+
+
+# The engine of 'transpile_source' and of the workers of 'transpile_many'.
+_engine = None
+
+
+def get_engine() -> Engine:
+    """ Returns the shared engine of the process.
+    """
+    global _engine
+
+    if _engine is None:
+        _engine = Engine()
+
+    return _engine
+
+
+def transpile_source(source, type="ts", options=None) -> dict:
+    """ Converts the source-code using the shared engine (see 'get_engine').
+
+    Args:
+        source (str): The source-code
+        type (str, optional): the type of the code ("ts" | "js"). Defaults to "ts".
+        options (dict, optional): The options (see 'DEFAULT_OPTIONS'). Defaults to None.
+
+    Returns:
+        dict: The result (see 'Engine.transpile')
+    """
+    return get_engine().transpile(source, type, options)
+
+
+def _transpile_task(task):
+    """ Converts a source of 'transpile_many' in a worker-process.
+    """
+    name, source, type, options = task
+    return name, get_engine().transpile(source, type, options, name)
+
+
+def transpile_many(sources, type="ts", options=None, engine=None, processes=None):
+    """ Converts the sources and yields the results, as soon as they are finished.
+
+    Args:
+        sources (iterable): The sources as pairs (name, source-code). The name identifies the result.
+        type (str, optional): the type of the code ("ts" | "js"). Defaults to "ts".
+        options (dict, optional): The options (see 'DEFAULT_OPTIONS'). Defaults to None.
+        engine (Engine, optional): The engine to use in-process. Defaults to the shared engine.
+        processes (int, optional): Converts the sources in a pool of processes (the
+            results are yielded in the order of completion). Defaults to None (in-process).
+
+    Yields:
+        (str, dict): The name and the result (see 'Engine.transpile')
+    """
+    # Fail early, not in the workers.
+    options = get_options(type, options)
+
+    if processes is None or processes <= 1:
+        engine = engine or get_engine()
+
+        for name, source in sources:
+            yield name, engine.transpile(source, type, options, name)
+
+        return
+
+    # Compile the grammar only once (if not cached yet).
+    LANGUAGES[type].prepare_parser(options["parser"])
+
+    with mp.Pool(processes) as pool:
+        tasks = ((name, source, type, options) for name, source in sources)
+        yield from pool.imap_unordered(_transpile_task, tasks)
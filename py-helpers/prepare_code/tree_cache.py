@@ -0,0 +1,288 @@
+""" Persistent cache of the parse-trees. An entry is keyed only by the source and
+    the grammar (see 'cache.hash_grammar'), not by the options of the
+    transformer or the unparser. Thereby changing e.g. '--convert_snake_case'
+    only costs transforming and generating the code, not parsing.
+
+    The trees are stored in a compact binary format, which is read using mmap:
+
+        header      magic, amount of strings, size of the strings, amount of words
+        lengths     uint32 per string (the length in bytes)
+        words       uint32, the nodes in pre-order:
+                        Tree:   0, data, amount of children
+                        Token:  1, type, value, start_pos, line, column, end_line, end_column, end_pos
+                        None:   2 (a placeholder, see 'maybe_placeholders')
+        strings     utf-8, every name and value is stored once
+
+    All numbers are little-endian. Missing positions are stored as 0xFFFFFFFF.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from lark import Token, Tree
+
+from .cache import get_cache_dir, write_atomic
+
+_MAGIC = b"NPT1"
+_HEADER = struct.Struct("<4sIII")
+
+# The tags of the nodes.
+_TREE = 0
+_TOKEN = 1
+_NULL = 2
+
+# A position, which isn't set.
+_UNSET = 0xFFFFFFFF
+
+_TOKEN_POSITIONS = ("start_pos", "line", "column", "end_line", "end_column", "end_pos")
+
+# Maximum size of the cache. The least recently used entries are evicted (see 'prune_tree_cache').
+MAX_CACHE_SIZE = 256 * 2 ** 20
+
+
+def _to_words(values) -> array:
+    words = array("I", values)
+    if sys.byteorder != "little":
+        words.byteswap()
+    return words
+
+
+def dump_tree(tree) -> bytes:
+    """ Serializes the parse-tree (see the module).
+
+    Args:
+        tree (lark.Tree): The parse-tree
+
+    Returns:
+        bytes: The serialized tree
+    """
+    strings = {}
+    words = []
+
+    def intern(value):
+        idx = strings.get(value, None)
+        if idx is None:
+            idx = strings[value] = len(strings)
+        return idx
+
+    stack = [tree]
+
+    while stack:
+        node = stack.pop()
+
+        if node is None:
+            words.append(_NULL)
+
+        elif isinstance(node, Token):
+            words.extend((_TOKEN, intern(str(node.type)), intern(str(node.value))))
+            for field in _TOKEN_POSITIONS:
+                value = getattr(node, field, None)
+                words.append(_UNSET if value is None else value)
+
+        elif isinstance(node, Tree):
+            words.extend((_TREE, intern(str(node.data)), len(node.children)))
+            stack.extend(reversed(node.children))
+
+        else:
+            raise TypeError(f"Unsupported node in the parse-tree: {type(node)}")
+
+    encoded = [value.encode("utf-8") for value in strings]
+
+    return b"".join((
+        _HEADER.pack(_MAGIC, len(encoded), sum(len(value) for value in encoded), len(words)),
+        _to_words(len(value) for value in encoded).tobytes(),
+        _to_words(words).tobytes(),
+        *encoded
+    ))
+
+
+def load_tree(buffer) -> Tree:
+    """ Deserializes the parse-tree (see 'dump_tree').
+
+    Args:
+        buffer (bytes | mmap.mmap): The serialized tree
+
+    Returns:
+        lark.Tree: The parse-tree
+    """
+    magic, amount_of_strings, size_of_strings, amount_of_words = _HEADER.unpack_from(buffer)
+
+    if magic != _MAGIC:
+        raise ValueError("Not a serialized parse-tree")
+
+    offset = _HEADER.size
+    lengths = array("I", buffer[offset:offset + 4 * amount_of_strings])
+    offset += 4 * amount_of_strings
+    words = array("I", buffer[offset:offset + 4 * amount_of_words])
+    offset += 4 * amount_of_words
+    blob = buffer[offset:offset + size_of_strings]
+
+    if len(lengths) != amount_of_strings or len(words) != amount_of_words or len(blob) != size_of_strings:
+        raise ValueError("The serialized parse-tree is truncated")
+
+    if sys.byteorder != "little":
+        lengths.byteswap()
+        words.byteswap()
+
+    strings = []
+    start = 0
+    for length in lengths:
+        strings.append(blob[start:start + length].decode("utf-8"))
+        start += length
+
+    root = None
+    # The trees, whose children are read: [children, amount of missing children]
+    parents = []
+    idx = 0
+
+    while idx < amount_of_words:
+        tag = words[idx]
+        count = 0
+
+        if tag == _TREE:
+            node = Tree(strings[words[idx + 1]], [])
+            count = words[idx + 2]
+            idx += 3
+        elif tag == _TOKEN:
+            node = Token(strings[words[idx + 1]], strings[words[idx + 2]], *(
+                None if value == _UNSET else value for value in words[idx + 3:idx + 9]
+            ))
+            idx += 9
+        elif tag == _NULL:
+            node = None
+            idx += 1
+        else:
+            raise ValueError(f"Unknown tag {tag} in the serialized parse-tree")
+
+        if parents:
+            parents[-1][0].append(node)
+            parents[-1][1] -= 1
+        else:
+            root = node
+
+        if count:
+            parents.append([node.children, count])
+        else:
+            while parents and not parents[-1][1]:
+                parents.pop()
+
+    return root
+
+
+class TreeCache:
+    """ The parse-trees of a grammar (see the module). The entries are shared
+        by all projects and options.
+    """
+
+    def __init__(self, grammar_hash):
+        """ Creates the cache.
+
+        Args:
+            grammar_hash (str): The hash of the grammar (see 'get_grammar_hash' of 'js' / 'ts').
+        """
+        self._dir = get_cache_dir("trees")
+        self._grammar_hash = grammar_hash
+
+    def get_key(self, content: str) -> str:
+        """ Determines the key of the source-code.
+
+        Args:
+            content (str): The source-code
+
+        Returns:
+            str: The key
+        """
+        key = hashlib.sha256(self._grammar_hash.encode("utf-8"))
+        key.update(content.encode("utf-8"))
+        return key.hexdigest()
+
+    def _get_entry(self, key):
+        return self._dir.joinpath(key[:2], f"{key}.tree")
+
+    def get(self, content: str):
+        """ Returns the cached parse-tree of the source-code.
+
+        Args:
+            content (str): The source-code
+
+        Returns:
+            lark.Tree | None: The parse-tree or None, if not cached.
+        """
+        path = self._get_entry(self.get_key(content))
+
+        try:
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                tree = load_tree(buffer)
+        except (OSError, ValueError, IndexError, struct.error):
+            # Either not cached or the entry is corrupted.
+            return None
+
+        try:
+            # Marks the entry as recently used (see 'prune_tree_cache').
+            os.utime(path)
+        except OSError:
+            pass
+
+        return tree
+
+    def put(self, content: str, tree):
+        """ Stores the parse-tree of the source-code.
+
+        Args:
+            content (str): The source-code
+            tree (lark.Tree): The parse-tree
+        """
+        try:
+            data = dump_tree(tree)
+        except TypeError:
+            # Contains unsupported nodes -> isn't cached.
+            return
+
+        path = self._get_entry(self.get_key(content))
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, data)
+        except OSError:
+            pass
+
+
+def prune_tree_cache(max_size=MAX_CACHE_SIZE):
+    """ Evicts the least recently used parse-trees, until the cache
+        is smaller than the given size.
+
+    Args:
+        max_size (int, optional): The maximum size of the cache in bytes. Defaults to 'MAX_CACHE_SIZE'.
+
+    Returns:
+        int: The amount of evicted entries.
+    """
+    entries = []
+
+    for path in get_cache_dir("trees").glob("*/*.tree"):
+        try:
+            info = path.stat()
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+
+    size = sum(entry[1] for entry in entries)
+    evicted = 0
+
+    for _, entry_size, path in sorted(entries):
+        if size <= max_size:
+            break
+
+        try:
+            path.unlink()
+        except OSError:
+            continue
+
+        size -= entry_size
+        evicted += 1
+
+    return evicted
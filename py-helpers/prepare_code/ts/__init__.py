@@ -1,2 +1,2 @@
-from .parser import get_parser
-from .transformer import transform
\ No newline at end of file
+from .parser import get_parser, prepare_parser, get_grammar_hash, PARSER_MODES
+from .transformer import transform, get_transformer, to_source
\ No newline at end of file
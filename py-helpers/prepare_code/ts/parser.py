@@ -1,14 +1,64 @@
-from lark import Lark
 from pathlib import Path
 
+from ..cache import open_parser, ensure_cached, hash_grammar
+
 # Define the Grammar File.
 grammar_file_path = Path(__file__).parent.joinpath('grammar.ts.lark')
 
+# The Options used for lark.
+parser_options = {
+    "debug": True,
+    "maybe_placeholders": True
+}
+
+# The supported parser-modes. The ts-grammar is ambiguous -> only earley.
+PARSER_MODES = ("earley",)
+
+
+def _check_mode(parser_mode):
+    if parser_mode not in PARSER_MODES:
+        raise ValueError(f"Unknown parser-mode '{parser_mode}'. Use one of {PARSER_MODES}")
+
 
-def get_parser():
-    """ Helper, to generate a parser.
+def get_parser(parser_mode="earley", transformer=None):
+    """ Helper, to generate a parser. The compiled grammar is
+        loaded from the persistent cache (see 'prepare_code.cache').
+
+    Args:
+        parser_mode (str, optional): The parser to use. Only "earley" is supported. Defaults to "earley".
+        transformer (lark.Transformer, optional): Not supported (requires "lalr"). Defaults to None.
 
     Returns:
         A lark parser
     """
-    return Lark.open(grammar_file_path, debug = True, maybe_placeholders=True)
\ No newline at end of file
+    _check_mode(parser_mode)
+
+    if transformer is not None:
+        raise ValueError("An inline transformer is only supported by the 'lalr'-parser")
+
+    return open_parser(grammar_file_path, **parser_options)
+
+
+def prepare_parser(parser_mode="earley"):
+    """ Compiles the grammar once and stores it in the cache.
+        Should be called, before starting multiple processes.
+
+    Args:
+        parser_mode (str, optional): The parser to use. Only "earley" is supported. Defaults to "earley".
+    """
+    _check_mode(parser_mode)
+    ensure_cached(grammar_file_path, **parser_options)
+
+
+def get_grammar_hash(parser_mode="earley") -> str:
+    """ Determines the hash of the grammar of the parser (see 'prepare_code.cache').
+        Identifies the parse-trees created by the parser (see 'prepare_code.tree_cache').
+
+    Args:
+        parser_mode (str, optional): The parser to use. Only "earley" is supported. Defaults to "earley".
+
+    Returns:
+        str: The hex-digest.
+    """
+    _check_mode(parser_mode)
+    return hash_grammar(grammar_file_path, **parser_options)
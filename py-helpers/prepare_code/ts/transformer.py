@@ -1,8 +1,10 @@
 import _ast
 import ast
-import astor
 import logging
 
+from ..hoisting import hoist_functions
+from ..imports import STAR
+from .. import unparse
 from ..logger import get_logger
 from lark import Transformer
 
@@ -11,14 +13,19 @@ class CodeTransformeTs(Transformer):
     def __init__(self, visit_tokens: bool = True, level=logging.INFO) -> None:
         super().__init__(visit_tokens)
         self.logger = get_logger("DebugWrapper", level)
+
+        # Flag, which enables the tracing. If disabled, no message is created.
+        self._trace = self.logger.isEnabledFor(logging.DEBUG)
+
         self._callback_counter = 0
 
+        # Maps the functions to their placeholders (ast.Name) and vice versa.
+        # The placeholders are replaced by 'hoist_functions'.
         self._anonymous_func_to_ids = dict()
         self._ids_to_anonymous_func = dict()
 
-        # The Key is allways a ast.Node (the Parent Node.)
-        # The Value is a Set, containing sub-nodes,
-        self._anonymous_func_tree = dict()
+        # The specifiers of the imports (e.g. "./x") and the imported names (see 'imports.get_module_symbols').
+        self.imports = dict()
 
     def _get_func_name(self):
         name = f"callback_{self._callback_counter}"
@@ -44,44 +51,10 @@ class CodeTransformeTs(Transformer):
         else:
             return items
 
-    def _add_to_tree(self, parent, items):
-        """ Create the required Tree.
-            Parent = Node
-            Childs = 
-        """
-        if parent not in self._anonymous_func_tree:
-            self._anonymous_func_tree[parent] = set()
-
-        if type(items) is list:
-
-            for item in items:
-                self._add_to_tree_single(parent, item)
-        else:
-            self._add_to_tree_single(parent, items)
-
-    def _add_to_tree_single(self, parent, item):
-        if item in self._ids_to_anonymous_func:
-            self._anonymous_func_tree[parent].add(
-                self._ids_to_anonymous_func[item]
-            )
-        elif item in self._anonymous_func_tree:
-            s = self._anonymous_func_tree[parent]
-            # Store the contained Ids.
-            self._anonymous_func_tree[parent] = s.union(
-                self._anonymous_func_tree[item])
-
-    def _adapt_body(self, body):
-        defintions_to_add = set()
-
-        for item in body:
-            if item in self._anonymous_func_tree:
-                defintions_to_add = defintions_to_add.union(
-                    self._anonymous_func_tree[item])
-                self._anonymous_func_tree.pop(item)
-
-        return list(defintions_to_add) + body
-
     def log(self, name, items):
+        if not self._trace:
+            return
+
         try:
             self.logger.debug(
                 f"calling -> '{name}' -> type(items) = {type(items)}; len(items) = {len(items)}")
@@ -90,6 +63,9 @@ class CodeTransformeTs(Transformer):
                 f"calling -> '{name}' -> type(items) = {type(items)}")
 
     def log_extracted(self, name, **args):
+        if not self._trace:
+            return
+
         try:
             self.logger.debug(f"calling -> '{name}' -> args = {dict(**args)}")
         except:
@@ -98,12 +74,7 @@ class CodeTransformeTs(Transformer):
     def start(self, items):
         self.log("start", items)
 
-        body = self._adapt_body(items)
-        ret = _ast.Module(body=body)
-
-        self._add_to_tree(ret, body)
-
-        return ret
+        return hoist_functions(_ast.Module(body=items), self._ids_to_anonymous_func)
 
     def ret_expr(self, items):
         self.log("ret_expr", items)
@@ -156,6 +127,8 @@ class CodeTransformeTs(Transformer):
             names = [_ast.alias(name=module.value, asname=None)]
         else:
             names = [_ast.alias(name=module.value, asname=identifier)]
+        # The namespace might be used as a whole.
+        self.imports.setdefault(module.value, []).append(STAR)
         self.log_extracted("import_stmt_all",
                            identifier=identifier, module=module)
         return _ast.Import(names=names)
@@ -166,6 +139,9 @@ class CodeTransformeTs(Transformer):
         (import_names, _, __) = items
         self.log_extracted("import_stmt_from", import_names=import_names)
 
+        # The module-path below loses the specifier (e.g. "../x" -> "...x").
+        self.imports.setdefault(_.value, []).extend(alias.name for alias in import_names)
+
         # TODO: determine the level properly
         return _ast.ImportFrom(module=_.value.replace('/', '.'), names=import_names, level=0)
 
@@ -368,8 +344,6 @@ class CodeTransformeTs(Transformer):
                 ctx=ast.Load()
             )
 
-            self._add_to_tree(ret, _items)
-
             return ret
 
         return _ast.List(
@@ -427,8 +401,6 @@ class CodeTransformeTs(Transformer):
             ctx=ast.Load()
         )
 
-        self._add_to_tree(ret, values)
-
         return ret
 
     def dict_items(self, items):
@@ -472,11 +444,12 @@ class CodeTransformeTs(Transformer):
         (_, __, id, value) = items
 
         self.log("declare_var", items)
-        try:
-            self.logger.debug(
-                f"declare_var: id={ast.dump(id)}; value={ast.dump(value)}")
-        except:
-            pass
+        if self._trace:
+            try:
+                self.logger.debug(
+                    f"declare_var: id={ast.dump(id)}; value={ast.dump(value)}")
+            except:
+                pass
 
         _value = self._adapt_items(value)
 
@@ -485,14 +458,12 @@ class CodeTransformeTs(Transformer):
             value=_value
         )
 
-        self._add_to_tree(ret, _value)
-
         return ret
 
     def declare_var_not_initialized(self, items):
         return _ast.Assign(
-            targets=[items[0]],
-            value=_ast.Assign(value=None)
+            targets=[items[2]],
+            value=_ast.Constant(value=None)
         )
 
     def declare_var_descructed(self, items):
@@ -554,7 +525,7 @@ class CodeTransformeTs(Transformer):
 
         kwargs = {
             "name": name.id,
-            "body": self._adapt_body(body),
+            "body": body,
             "args": func_args,
             "decorator_list": []
         }
@@ -564,7 +535,6 @@ class CodeTransformeTs(Transformer):
         # Register the Function.
         self._anonymous_func_to_ids[ret] = name
         self._ids_to_anonymous_func[name] = ret
-        # self._anonymous_func_tree[ret] = name
 
         return ret
 
@@ -730,9 +700,7 @@ class CodeTransformeTs(Transformer):
         self.logger.debug(items[1])
         return _ast.While(
             test=items[0],
-            body=self._adapt_body(
-                items[1] if type(items) == list else [items[1]]
-            ),
+            body=items[1] if type(items) == list else [items[1]],
             orelse=[]
         )
 
@@ -771,7 +739,7 @@ class CodeTransformeTs(Transformer):
                 if idx < len(elifs) - 1:
                     return _ast.If(
                         test=_test,
-                        body=self._adapt_body(_body),
+                        body=_body,
                         orelse=[
                             _rec(idx+1)
                         ]
@@ -781,13 +749,13 @@ class CodeTransformeTs(Transformer):
                 # the last item
                 return _ast.If(
                     test=_test,
-                    body=self._adapt_body(_body),
+                    body=_body,
                     orelse=else_body
                 )
 
             return _ast.If(
                 test=test,
-                body=self._adapt_body(body),
+                body=body,
                 orelse=[
                     _rec(0)
                 ]
@@ -795,7 +763,7 @@ class CodeTransformeTs(Transformer):
 
         return _ast.If(
             test=test,
-            body=self._adapt_body(body),
+            body=body,
             orelse=else_body
         )
 
@@ -824,8 +792,6 @@ class CodeTransformeTs(Transformer):
             orelse=_items[2]
         )
 
-        self._add_to_tree(ret, _items)
-
         return ret
 
     def new_class(self, items):
@@ -875,41 +841,56 @@ class DebuggedCodeTransformeTs(Transformer):
 
         self.logger = get_logger("DebugWrapper")
 
-    def __getattribute__(self, __name: str):
-        logger = object.__getattribute__(self, "logger")
+    def _call_userfunc(self, tree, new_children=None):
+        # Lark resolves the rule once per node. Only the calls of the rules
+        # are logged (and not every access of an attribute).
+        children = new_children if new_children is not None else tree.children
 
-        try:
-            func = object.__getattribute__(self, __name)
+        self.logger.info(f"Calling function '{tree.data}'")
+        self.logger.info(f"received parameters => {len(children)}")
 
-            if callable(func):
+        if not hasattr(self, tree.data):
+            self.logger.warning(f"'{tree.data}' has not been found!")
 
-                def cb(items):
-                    logger.info(f"Calling function '{__name}'")
-                    try:
-                        logger.info(f"received parameters => {len(items)}")
-                    except:
-                        pass
-                    return func(items)
+        return super()._call_userfunc(tree, new_children)
 
-                return cb
 
-            return func
-        except:
-            pass
-
-        logger.warn(f"'{__name}' has not been found!")
-        raise KeyError(f"'{__name}' has not been found!")
+def get_transformer(debug, to_snake_case):
+    """ Creates the transformer.
 
+    Args:
+        debug (boolean): Flag to enable debugging
+        to_snake_case (boolean): Flag to enable converting methods and names to ids (not supported for "ts").
 
-def transform(tree, debug, to_snake_case):
-    transformer = CodeTransformeTs(
+    Returns:
+        CodeTransformeTs: The transformer.
+    """
+    return CodeTransformeTs(
         True, logging.DEBUG if debug else logging.INFO)
+
+
+def transform(tree, debug, to_snake_case, unparser=None):
+    transformer = get_transformer(debug, to_snake_case)
     program = transformer.transform(tree)
 
+    return to_source(program, debug, unparser)
+
+
+def to_source(program, debug, unparser=None):
+    """ Converts the transformed program (python-ast) to code.
+
+    Args:
+        program (ast.Module): The transformed program
+        debug (boolean): Flag to enable debugging
+        unparser (str, optional): The backend to generate the code (see 'unparse.BACKENDS'). Defaults to the fastest available.
+
+    Returns:
+        str: The python-code
+    """
     if debug:
         print(ast.dump(program, indent=2))
 
-    code = astor.to_source(program)
+    code = unparse.to_source(program, unparser)
 
     if debug:
         print(code)
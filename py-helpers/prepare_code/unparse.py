@@ -0,0 +1,305 @@
+""" Backends to convert the transformed program (python-ast) to source-code.
+
+    - "ast":   'ast.unparse' of the standard library (python >= 3.9). The fastest backend.
+    - "astor": 'astor.to_source' (requires the package 'astor').
+
+    The transformers create a loose AST (e.g. expressions as statements, nested
+    names or members, 'and' / 'or' as compare operators). Before the code is
+    generated, the program is normalized to a valid python-ast. Thereby both
+    backends generate semantically identical code.
+"""
+
+import ast
+import logging
+
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+# Fields, which are lists. Used to fill missing fields.
+_LIST_FIELDS = {
+    "body", "orelse", "finalbody", "handlers", "targets", "elts", "keys",
+    "values", "args", "keywords", "decorator_list", "bases", "posonlyargs",
+    "kwonlyargs", "kw_defaults", "defaults", "type_ignores", "names", "ops",
+    "comparators", "generators", "ifs"
+}
+
+# Fields, which contain statements.
+_BODY_FIELDS = ("body", "orelse", "finalbody")
+
+
+def _graft(value, member):
+    """ Attaches the member (a chain like 'b(c).d') to the value ('a')
+        -> 'a.b(c).d'
+    """
+    if isinstance(member, ast.Name):
+        return ast.Attribute(value=value, attr=member.id, ctx=ast.Load())
+
+    if isinstance(member, ast.Attribute):
+        return ast.Attribute(value=_graft(value, member.value), attr=member.attr, ctx=ast.Load())
+
+    if isinstance(member, ast.Call):
+        return ast.Call(func=_graft(value, member.func), args=member.args, keywords=member.keywords)
+
+    if isinstance(member, ast.Subscript):
+        return ast.Subscript(value=_graft(value, member.value), slice=member.slice, ctx=ast.Load())
+
+    raise ValueError(f"Can not access '{type(member).__name__}' as member")
+
+
+# The precedence of the binary operators (python). Higher binds stronger.
+_BINOP_PRECEDENCE = {
+    ast.BitOr: 5,
+    ast.BitXor: 6,
+    ast.BitAnd: 7,
+    ast.LShift: 8,
+    ast.RShift: 8,
+    ast.Add: 9,
+    ast.Sub: 9,
+    ast.Mult: 10,
+    ast.Div: 10,
+    ast.FloorDiv: 10,
+    ast.Mod: 10,
+    ast.MatMult: 10,
+    ast.Pow: 12
+}
+
+
+def _get_precedence(node):
+    """ Returns the precedence of the operation or None, if the node isn't an operation.
+    """
+    if isinstance(node, ast.BinOp):
+        return _BINOP_PRECEDENCE.get(type(node.op), 0)
+    if isinstance(node, ast.Compare):
+        return 4
+    if isinstance(node, ast.BoolOp):
+        return 2 if isinstance(node.op, ast.And) else 1
+    if isinstance(node, ast.IfExp):
+        return 0
+    return None
+
+
+def _get_left(node):
+    if isinstance(node, (ast.BinOp, ast.Compare)):
+        return node.left
+    if isinstance(node, ast.BoolOp):
+        return node.values[0] if node.values else None
+    if isinstance(node, ast.IfExp):
+        return node.test
+    return None
+
+
+def _set_left(node, value):
+    if isinstance(node, (ast.BinOp, ast.Compare)):
+        node.left = value
+    elif isinstance(node, ast.BoolOp):
+        node.values[0] = value
+    else:
+        node.test = value
+
+
+def _get_right(node):
+    if isinstance(node, ast.BinOp):
+        return node.right
+    if isinstance(node, ast.Compare):
+        return node.comparators[-1]
+    if isinstance(node, ast.BoolOp):
+        return node.values[-1]
+    return node.orelse
+
+
+def _set_right(node, value):
+    if isinstance(node, ast.BinOp):
+        node.right = value
+    elif isinstance(node, ast.Compare):
+        node.comparators[-1] = value
+    elif isinstance(node, ast.BoolOp):
+        node.values[-1] = value
+    else:
+        node.orelse = value
+
+
+def _attach(value, node):
+    """ Uses the value as the leftmost operand of the operation, like the
+        source ('value' followed by the rest of 'node'). An operation with a
+        lower precedence (e.g. 'a - b' followed by '* 2') keeps its left
+        operands -> 'a - (b * 2)'.
+    """
+    precedence = _get_precedence(value)
+
+    if precedence is not None and precedence < _get_precedence(node):
+        _set_right(value, _attach(_get_right(value), node))
+        return value
+
+    _set_left(node, value)
+    return node
+
+
+def _hoist_return(expression):
+    """ The earley-parser might parse 'return a + b' as '(return a) + b' (the
+        grammar is ambiguous) -> 'return a + b'. Returns None, if the leftmost
+        operand of the expression isn't a return.
+    """
+    # The operations from the expression to the return.
+    spine = []
+    node = expression
+
+    while not isinstance(node, ast.Return):
+        if _get_precedence(node) is None or _get_left(node) is None:
+            return None
+        spine.append(node)
+        node = _get_left(node)
+
+    if not spine or node.value is None:
+        return None
+
+    value = node.value
+
+    for operation in reversed(spine):
+        value = _attach(value, operation)
+
+    return ast.Return(value=value)
+
+
+class _Normalizer(ast.NodeTransformer):
+    """ Converts the loose AST of the transformers to a valid python-ast.
+    """
+
+    def _body(self, statements):
+        ret = []
+
+        for statement in statements:
+            if isinstance(statement, list):
+                ret += self._body(statement)
+            elif isinstance(statement, ast.expr):
+                # An expression used as statement.
+                ret.append(_hoist_return(statement) or ast.Expr(value=statement))
+            elif isinstance(statement, ast.Expr):
+                ret.append(_hoist_return(statement.value) or statement)
+            elif isinstance(statement, ast.AST):
+                ret.append(statement)
+
+        return ret
+
+    def generic_visit(self, node):
+
+        for field in node._fields:
+            if not hasattr(node, field):
+                if field in _LIST_FIELDS and not (field == "args" and isinstance(node, _FUNCTIONS)):
+                    setattr(node, field, [])
+                elif field == "args":
+                    setattr(node, field, ast.arguments())
+                elif field == "ctx":
+                    setattr(node, field, ast.Load())
+                else:
+                    setattr(node, field, None)
+
+        node = super().generic_visit(node)
+
+        if isinstance(node, (ast.stmt, ast.ExceptHandler, ast.Module)):
+            for field in _BODY_FIELDS:
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    setattr(node, field, self._body(value))
+
+            if isinstance(node, (ast.stmt, ast.ExceptHandler)) and getattr(node, "body", None) == []:
+                node.body = [ast.Pass()]
+
+        return node
+
+    def visit_Name(self, node):
+        node = self.generic_visit(node)
+
+        if isinstance(node.id, ast.Name):
+            node.id = node.id.id
+        elif isinstance(node.id, ast.AST):
+            # e.g. 'new Foo.Bar()'
+            return node.id
+
+        return node
+
+    def visit_Attribute(self, node):
+        node = self.generic_visit(node)
+
+        if isinstance(node.attr, ast.AST):
+            return _graft(node.value, node.attr)
+
+        return node
+
+    def visit_alias(self, node):
+        node = self.generic_visit(node)
+
+        for field in ("name", "asname"):
+            value = getattr(node, field)
+            if isinstance(value, ast.Name):
+                setattr(node, field, value.id)
+
+        return node
+
+    def visit_Compare(self, node):
+        node = self.generic_visit(node)
+
+        if len(node.ops) == 1 and isinstance(node.ops[0], (ast.And, ast.Or)):
+            return ast.BoolOp(op=node.ops[0], values=[node.left, node.comparators[0]])
+
+        return node
+
+
+def normalize(program):
+    """ Converts the loose AST created by the transformers to a valid python-ast.
+
+    Args:
+        program (ast.Module): The transformed program
+
+    Returns:
+        ast.Module: The normalized program
+    """
+    program = _Normalizer().visit(program)
+    return ast.fix_missing_locations(program)
+
+
+def _to_source_ast(program):
+    code = ast.unparse(program)
+    # An empty module (e.g. only interfaces) has no code -> no PY-File (as 'astor').
+    return code + "\n" if code else ""
+
+
+def _to_source_astor(program):
+    # Imported on demand, the package is optional.
+    import astor
+    return astor.to_source(program)
+
+
+BACKENDS = {
+    "ast": _to_source_ast,
+    "astor": _to_source_astor
+}
+
+# The fastest backend, which is available.
+DEFAULT_BACKEND = "ast" if hasattr(ast, "unparse") else "astor"
+
+
+def to_source(program, backend=None):
+    """ Converts the transformed program to code.
+
+    Args:
+        program (ast.Module): The transformed program
+        backend (str, optional): The backend to use ("ast" | "astor"). Defaults to the fastest available.
+
+    Returns:
+        str: The python-code
+    """
+    backend = backend or DEFAULT_BACKEND
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown unparser '{backend}'. Use one of {tuple(BACKENDS)}")
+
+    program = normalize(program)
+
+    try:
+        return BACKENDS[backend](program)
+    except Exception as err:
+        if backend == "astor":
+            raise
+
+        # Fallback for constructs, which are not supported by 'ast.unparse'.
+        logging.getLogger("nope-py-prepare").debug(f"'ast.unparse' failed ({err}). Using 'astor'")
+        return _to_source_astor(program)
@@ -0,0 +1,17 @@
+import logging
+
+from prepare_code.discovery import create_filter, iter_files_from
+
+
+def test_files_listed_twice_are_yielded_once(tmp_path):
+    input_path = tmp_path / "input"
+    input_path.joinpath("sub").mkdir(parents=True)
+    input_path.joinpath("a.ts").write_text("let a = 1;\n")
+    input_path.joinpath("sub", "b.ts").write_text("let b = 1;\n")
+
+    manifest = tmp_path / "files.txt"
+    manifest.write_text("a.ts\nsub/b.ts\na.ts\n./a.ts\n" + str(input_path / "sub" / "b.ts") + "\n")
+
+    files = list(iter_files_from(str(manifest), str(input_path), create_filter("ts"), logging.getLogger("test-discovery")))
+
+    assert [file_name for file_name, path_to_file, dir_path in files] == ["a.ts", "b.ts"]
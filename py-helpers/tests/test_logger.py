@@ -0,0 +1,36 @@
+import logging
+import multiprocessing as mp
+
+from prepare_code.logger import get_logger, use_log_queue
+from prepare_code.logger.get_logger import LogListener
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _log(message):
+    get_logger("test_logger").info(message)
+    return message
+
+
+def test_flush_writes_the_records_of_finished_tasks():
+    log_queue = mp.SimpleQueue()
+    handler = _ListHandler()
+    listener = LogListener(log_queue, handler)
+    listener.start()
+
+    try:
+        with mp.Pool(1, initializer=use_log_queue, initargs=(log_queue,)) as pool:
+            for i in range(20):
+                message = pool.apply(_log, (f"processed-file {i}",))
+                listener.flush()
+
+                assert handler.messages[-1] == message
+    finally:
+        listener.stop()
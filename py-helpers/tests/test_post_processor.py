@@ -0,0 +1,29 @@
+import pytest
+
+from prepare_code.post_processor import post_process
+
+
+@pytest.mark.parametrize("code, expected", [
+    # Names and methods
+    ("console.log(this.a)", "print(self.a)"),
+    ("a.this.b = 1", "a.this.b = 1"),
+    ("x.push(1)", "x.append(1)"),
+    ("thisValue = true_x", "thisValue = true_x"),
+    # Strings and comments are kept.
+    ("s = 'this is true'", "s = 'this is true'"),
+    ("# this is true", "# this is true"),
+    # Literals
+    ("a = 'null'", "a = None"),
+    ("a = rb'null'", "a = rb'null'"),
+    # Template-strings
+    ("a = 'val ${this.b}'", "a = 'val {self.b}'"),
+    ("a = 'val ${null} and this'", "a = 'val {None} and this'"),
+    # Definitions
+    ("__definition_of__callback_0(x)", "callback_0(x)"),
+])
+def test_post_process(code, expected):
+    assert post_process(code) == expected
+
+
+def test_assign_self_is_removed():
+    assert post_process("this = this\nx = 1\n    this = this\n") == "\nx = 1\n    \n"
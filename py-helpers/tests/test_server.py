@@ -0,0 +1,50 @@
+import io
+import json
+import logging
+
+from prepare_code.server import INTERNAL_ERROR, INVALID_PARAMS, Server
+from prepare_code.transpiler import get_options
+
+
+class _BrokenPool:
+
+    def apply_async(self, *args, **kwargs):
+        raise RuntimeError("pool is closed")
+
+
+def _create_server(pool=None):
+    output = io.StringIO()
+    defaults = {"type": "ts", "options": get_options("ts")}
+    return Server(pool, defaults, output, logging.getLogger("test-server")), output
+
+
+def _get_responses(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_invalid_types_are_invalid_params():
+    server, output = _create_server()
+
+    for id, params in enumerate((
+        {"source": "let a = 1;", "type": ["ts"]},
+        {"source": "let a = 1;", "options": {"parser": ["earley"]}},
+        {"source": "let a = 1;", "options": {"unparser": {"ast": 1}}}
+    )):
+        assert server.handle(json.dumps({"jsonrpc": "2.0", "id": id, "method": "transpile", "params": params}))
+
+    responses = _get_responses(output)
+
+    assert [response["id"] for response in responses] == [0, 1, 2]
+    assert all(response["error"]["code"] == INVALID_PARAMS for response in responses)
+
+
+def test_unexpected_errors_are_internal_errors():
+    server, output = _create_server(_BrokenPool())
+
+    assert server.handle(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "transpile", "params": {"source": "let a = 1;"}}))
+    assert server.handle(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "ping"}))
+
+    first, second = _get_responses(output)
+
+    assert first["error"]["code"] == INTERNAL_ERROR
+    assert second["result"] == "pong"
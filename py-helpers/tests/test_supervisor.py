@@ -0,0 +1,57 @@
+import multiprocessing as mp
+
+from prepare_code.main import init_worker, worker_chunk
+from prepare_code.supervisor import Supervisor
+
+
+def _raising_chunk(tasks):
+    raise RuntimeError("broken worker")
+
+
+def test_failing_chunk_doesnt_block():
+    supervisor = Supervisor(mp.Queue())
+    chunks = [[("a.js", "key-a", "lalr"), ("b.js", "key-b", "lalr")]]
+
+    with mp.Pool(1) as pool:
+        results = list(supervisor.run(pool, _raising_chunk, chunks))
+
+    assert sorted(result[0] for result in results) == ["a.js", "b.js"]
+
+    for path_to_file, key, python_path_to_file, (err, ptr_to_err), metrics in results:
+        # Not stored in the build-cache.
+        assert key is None
+        assert python_path_to_file is False
+        assert "broken worker" in err
+        assert ptr_to_err == path_to_file
+
+
+def test_raising_worker_reports_the_result(tmp_path, monkeypatch):
+    monkeypatch.setenv("NOPE_PY_PREPARE_CACHE_DIR", str(tmp_path / "cache"))
+
+    input_path = tmp_path / "input"
+    input_path.mkdir()
+    input_path.joinpath("a.js").write_text("let a = 1;\n")
+    input_path.joinpath("removed.js").write_text("let b = 2;\n")
+
+    # The output can't be created (a file instead of a directory).
+    output_path = tmp_path / "output"
+    output_path.write_text("")
+
+    events = mp.Queue()
+    supervisor = Supervisor(events)
+
+    with mp.Pool(1, initializer=init_worker, initargs=("js", "lalr", str(input_path), str(output_path), False, False, mp.Queue(), None, None, events)) as pool:
+        # Removed between the discovery and the conversion.
+        input_path.joinpath("removed.js").unlink()
+
+        results = list(supervisor.run(pool, worker_chunk, [
+            [(str(input_path / "a.js"), None, "lalr")],
+            [(str(input_path / "removed.js"), None, "lalr")]
+        ]))
+
+    assert len(results) == 2
+
+    for path_to_file, key, python_path_to_file, (err, ptr_to_err), metrics in results:
+        assert python_path_to_file is False
+        assert err
+        assert ptr_to_err == path_to_file
@@ -0,0 +1,26 @@
+from prepare_code.cache import CACHE_DIR_ENV
+from prepare_code.symbols import SymbolTable, load_names, save_names
+
+
+def test_seeded_table_converts_nothing():
+    table = SymbolTable({"fooBar": "foo_bar"})
+
+    assert table.get_name("fooBar") == "foo_bar"
+    assert table.misses == 0
+
+
+def test_names_are_keyed_by_the_toolchain(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+
+    save_names("old", {"fooBar": "foobar"})
+    assert load_names("old") == {"fooBar": "foobar"}
+
+    # A changed tool doesn't reuse the stale names.
+    assert load_names("new") == {}
+
+    save_names("new", {"fooBar": "foo_bar"})
+    save_names("new", {"bazQux": "baz_qux"})
+
+    assert load_names("new") == {"fooBar": "foo_bar", "bazQux": "baz_qux"}
+    # The names of the other tool have been removed.
+    assert load_names("old") == {}
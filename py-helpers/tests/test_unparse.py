@@ -0,0 +1,27 @@
+import pytest
+
+from prepare_code import transpile_source
+from prepare_code.unparse import BACKENDS
+
+# Only types -> no python-code.
+INTERFACE_ONLY = """
+export interface IFoo {
+    a: string;
+    b?: number;
+}
+"""
+
+
+@pytest.mark.parametrize("unparser", sorted(BACKENDS))
+def test_interface_only_has_no_code(unparser):
+    result = transpile_source(INTERFACE_ONLY, "ts", {"unparser": unparser})
+
+    assert result["error"] is None
+    assert result["code"] == ""
+
+
+@pytest.mark.parametrize("unparser", sorted(BACKENDS))
+def test_code_ends_with_a_newline(unparser):
+    result = transpile_source("let a = 1;", "ts", {"unparser": unparser})
+
+    assert result["code"] == "a = 1.0\n"